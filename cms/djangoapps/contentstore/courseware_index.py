@@ -1,6 +1,8 @@
 """ Code to allow module store to interface with courseware index """
 from __future__ import absolute_import
 
+import hashlib
+import json
 import logging
 import re
 from abc import ABCMeta, abstractmethod
@@ -28,6 +30,10 @@ from xmodule.modulestore import ModuleStoreEnum
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Maximum number of indexed items of a course or library fetched from the
+# index when comparing them with the published content
+MAX_INDEXED_ITEMS = 100000
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -102,18 +108,33 @@ class SearchIndexerBase(object):
         return usage_id
 
     @classmethod
-    def remove_deleted_items(cls, searcher, structure_key, exclude_items):
+    def fetch_indexed_fingerprints(cls, searcher, structure_key):
         """
-        remove any item that is present in the search index that is not present in updated list of indexed items
-        as we find items we can shorten the set of items to keep
+        Returns the fingerprints of the items of the structure present in the search index, keyed by item id.
+        Items indexed without a fingerprint have a fingerprint of None.
+
+        Only the id and fingerprint of the indexed documents are fetched, for at most MAX_INDEXED_ITEMS items.
         """
         response = searcher.search(
             doc_type=cls.DOCUMENT_TYPE,
             field_dictionary=cls._get_location_info(structure_key),
-            exclude_dictionary={"id": list(exclude_items)}
+            size=MAX_INDEXED_ITEMS,
+            _source_include=['id', 'fingerprint'],
         )
-        result_ids = [result["data"]["id"] for result in response["results"]]
-        searcher.remove(cls.DOCUMENT_TYPE, result_ids)
+        if response["total"] > len(response["results"]):
+            log.warning(
+                "Only %d of the %d indexed items of %s were compared with the published content; "
+                "items deleted since they were indexed may remain in the index",
+                len(response["results"]),
+                response["total"],
+                structure_key,
+            )
+        return {result["data"]["id"]: result["data"].get("fingerprint") for result in response["results"]}
+
+    @staticmethod
+    def fingerprint(item_index):
+        """ Returns a hash of the item index dictionary, used to tell whether it changed since it was indexed """
+        return hashlib.sha1(json.dumps(item_index, sort_keys=True, default=unicode)).hexdigest()
 
     @classmethod
     def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
@@ -132,6 +153,11 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        The published items are compared with the items in the index, so that
+        only the items that changed are sent to the index, and only the items
+        that are no longer published are removed from it. A full reindex sends
+        all the items.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -143,15 +169,10 @@ class SearchIndexerBase(object):
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
 
-        # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
-        indexed_count = {
-            "count": 0
-        }
-
         # indexed_items is a list of all the items that we wish to remain in the
         # index, whether or not we are planning to actually update their index.
-        # This is used in order to build a query to remove those items not in this
-        # list - those are ready to be destroyed
+        # This is used in order to remove the indexed items not in this list -
+        # those are ready to be destroyed
         indexed_items = set()
 
         # items_index is a list of all the items index dictionaries.
@@ -159,6 +180,9 @@ class SearchIndexerBase(object):
         # instead of per item index API call.
         items_index = []
 
+        # changed_items_index is the part of items_index that differs from the index
+        changed_items_index = []
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -241,7 +265,6 @@ class SearchIndexerBase(object):
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
                 item_index.update(cls.supplemental_fields(item))
                 items_index.append(item_index)
-                indexed_count["count"] += 1
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
@@ -256,11 +279,22 @@ class SearchIndexerBase(object):
                 # First perform any additional indexing from the structure object
                 cls.supplemental_index_information(modulestore, structure)
 
+                indexed_fingerprints = cls.fetch_indexed_fingerprints(searcher, structure_key)
+
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+
+                for item_index in items_index:
+                    item_index['fingerprint'] = cls.fingerprint(item_index)
+                    if triggered_at is None or indexed_fingerprints.get(item_index['id']) != item_index['fingerprint']:
+                        changed_items_index.append(item_index)
+
+                if changed_items_index:
+                    searcher.index(cls.DOCUMENT_TYPE, changed_items_index)
+                deleted_items = set(indexed_fingerprints) - indexed_items
+                if deleted_items:
+                    searcher.remove(cls.DOCUMENT_TYPE, list(deleted_items))
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -273,7 +307,7 @@ class SearchIndexerBase(object):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
-        return indexed_count["count"]
+        return len(changed_items_index)
 
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
@@ -27,7 +27,7 @@ from path import Path as path
 from common.test.utils import XssTestMixin
 from contentstore.tests.utils import AjaxEnabledTestClient, CourseTestCase, get_url, parse_json
 from contentstore.utils import delete_course, reverse_course_url, reverse_url
-from contentstore.views.component import ADVANCED_COMPONENT_TYPES
+from contentstore.views.component import get_advanced_component_types
 from course_action_state.managers import CourseActionStateItemNotFoundError
 from course_action_state.models import CourseRerunState, CourseRerunUIStateManager
 from django_comment_common.utils import are_permissions_roles_seeded
@@ -685,7 +685,7 @@ class MiscCourseTests(ContentStoreTestCase):
         # This could be made better, but for now let's just assert that we see the advanced modules mentioned in the page
         # response HTML
         self.check_components_on_page(
-            ADVANCED_COMPONENT_TYPES,
+            get_advanced_component_types(),
             ['Word cloud', 'Annotation', 'Text Annotation', 'Video Annotation', 'Image Annotation',
              'split_test'],
         )
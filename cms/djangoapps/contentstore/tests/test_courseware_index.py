@@ -429,16 +429,45 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
 
         before_time = datetime.now(UTC)
         self.publish_item(store, vertical2.location)
-        # index based on time, will include an index of the origin sequential
-        # because it is in a common subtree but not of the original vertical
-        # because the original sequential's subtree is too old
+        # index based on time, will only send the new sequential, vertical and
+        # html to the index: the other items of the common subtree are
+        # unchanged, and the original sequential's subtree is too old
         new_indexed_count = self.index_recent_changes(store, before_time)
-        self.assertEqual(new_indexed_count, 5)
+        self.assertEqual(new_indexed_count, 3)
 
         # full index again
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_unchanged_items_not_reindexed(self, store):
+        """ Make sure that only the items which changed since they were indexed are sent to the index """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 4)
+
+        since_time = datetime(2015, 1, 1, tzinfo=UTC)
+        self.assertEqual(self.index_recent_changes(store, since_time), 0)
+
+        self.html_unit.display_name = "Some changed content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_recent_changes(store, since_time), 1)
+
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_recent_changes(store, since_time), 0)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+
+    def _test_indexed_items_over_limit(self, store):
+        """ Make sure that a warning is logged when not all the indexed items can be compared """
+        self.publish_item(store, self.vertical.location)
+        self.reindex_course(store)
+        with patch('contentstore.courseware_index.MAX_INDEXED_ITEMS', 1):
+            with patch('contentstore.courseware_index.log') as mock_log:
+                self.index_recent_changes(store, datetime(2015, 1, 1, tzinfo=UTC))
+        self.assertTrue(mock_log.warning.called)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -570,6 +599,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_unchanged_items_not_reindexed(self, store_type):
+        self._perform_test_using_store(store_type, self._test_unchanged_items_not_reindexed)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_indexed_items_over_limit(self, store_type):
+        self._perform_test_using_store(store_type, self._test_indexed_items_over_limit)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
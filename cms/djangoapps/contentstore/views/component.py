@@ -34,10 +34,10 @@ __all__ = [
 
 log = logging.getLogger(__name__)
 
-# NOTE: This list is disjoint from ADVANCED_COMPONENT_TYPES
+# NOTE: This list is disjoint from get_advanced_component_types()
 COMPONENT_TYPES = ['discussion', 'html', 'problem', 'video']
 
-ADVANCED_COMPONENT_TYPES = sorted(set(name for name, class_ in XBlock.load_classes()) - set(COMPONENT_TYPES))
+_ADVANCED_COMPONENT_TYPES = None
 
 ADVANCED_PROBLEM_TYPES = settings.ADVANCED_PROBLEM_TYPES
 
@@ -51,6 +51,19 @@ CONTAINER_TEMPLATES = [
 ]
 
 
+def get_advanced_component_types():
+    """
+    Returns the sorted list of the installed XBlock types that are not in COMPONENT_TYPES.
+
+    It is computed on the first call, so that importing the Studio views does not
+    load every installed XBlock.
+    """
+    global _ADVANCED_COMPONENT_TYPES  # pylint: disable=global-statement
+    if _ADVANCED_COMPONENT_TYPES is None:
+        _ADVANCED_COMPONENT_TYPES = sorted(set(name for name, class_ in XBlock.load_classes()) - set(COMPONENT_TYPES))
+    return _ADVANCED_COMPONENT_TYPES
+
+
 def _advanced_component_types(show_unsupported):
     """
     Return advanced component types which can be created.
@@ -67,7 +80,7 @@ def _advanced_component_types(show_unsupported):
         Note that the support level will be "True" for all XBlocks if XBlockStudioConfigurationFlag
         is not enabled.
     """
-    enabled_block_types = _filter_disabled_blocks(ADVANCED_COMPONENT_TYPES)
+    enabled_block_types = _filter_disabled_blocks(get_advanced_component_types())
     if XBlockStudioConfigurationFlag.is_enabled():
         authorable_blocks = authorable_xblocks(allow_unsupported=show_unsupported)
         filtered_blocks = {}
@@ -348,7 +361,7 @@ def get_component_templates(courselike, library=False):
 
     # Check if there are any advanced modules specified in the course policy.
     # These modules should be specified as a list of strings, where the strings
-    # are the names of the modules in ADVANCED_COMPONENT_TYPES that should be
+    # are the names of the modules in get_advanced_component_types() that should be
     # enabled for the course.
     course_advanced_keys = courselike.advanced_modules
     advanced_component_templates = {
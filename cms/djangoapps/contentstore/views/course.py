@@ -88,7 +88,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
 from xmodule.tabs import CourseTab, CourseTabList, InvalidTabsException
 
-from .component import ADVANCED_COMPONENT_TYPES
+from .component import get_advanced_component_types
 from .item import create_xblock_info
 from .library import LIBRARIES_ENABLED, get_library_creator_status
 
@@ -1678,7 +1678,7 @@ def are_content_experiments_enabled(course):
     Returns True if content experiments have been enabled for the course.
     """
     return (
-        'split_test' in ADVANCED_COMPONENT_TYPES and
+        'split_test' in get_advanced_component_types() and
         'split_test' in course.advanced_modules
     )
 
@@ -1349,6 +1349,20 @@ ENTERPRISE_ENROLLMENT_API_URL = LMS_ROOT_URL + "/api/enrollment/v1/"
 ENTERPRISE_SERVICE_WORKER_USERNAME = 'enterprise_worker'
 ENTERPRISE_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+############################# Waffle utils ####################################
+
+# Number of seconds for which waffle switches, flags and course overrides are
+# cached in each process before being read again. 0 disables the cache.
+WAFFLE_UTILS_CACHE_TIMEOUT = 30
+
+############################# Startup #######################################
+
+# Defer the work that can be done on first use, rather than when a process
+# starts, to shorten the startup of web and celery workers.  The Mako template
+# lookups are then set up, theme directories indexed and optional runtime
+# services created on first use.
+LAZY_STARTUP = False
+
 ############## Settings for the Discovery App ######################
 
 COURSE_CATALOG_API_URL = None
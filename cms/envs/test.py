@@ -148,6 +148,9 @@ LMS_ROOT_URL = "http://{}".format(LMS_BASE)
 FEATURES['PREVIEW_LMS_BASE'] = "preview.localhost"
 
 
+# Waffle values changed in a test would otherwise stay cached after its transaction is rolled back
+WAFFLE_UTILS_CACHE_TIMEOUT = 0
+
 CACHES = {
     # This is the cache used for most things. Askbot will not work without a
     # functioning cache -- it relies on caching to load its settings in places.
@@ -5,6 +5,7 @@ Set up lookup paths for mako templates.
 import contextlib
 import hashlib
 import os
+import threading
 
 import pkg_resources
 from django.conf import settings
@@ -16,6 +17,9 @@ from openedx.core.djangoapps.theming.helpers import get_template_path_with_theme
 
 from . import LOOKUP
 
+_deferred_setup_lock = threading.Lock()
+_deferred_setup = {'pending': False}
+
 
 class DynamicTemplateLookup(TemplateLookup):
     """
@@ -107,11 +111,51 @@ def add_lookup(namespace, directory, package=None, prepend=False):
     templates.add_directory(directory, prepend=prepend)
 
 
+def setup_lookups():
+    """
+    Set up the lookups of the namespaces and directories of the MAKO_TEMPLATES setting.
+    """
+    for namespace, directories in settings.MAKO_TEMPLATES.items():
+        clear_lookups(namespace)
+        for directory in directories:
+            add_lookup(namespace, directory)
+
+
+def defer_lookup_setup():
+    """
+    Set up the lookups of the MAKO_TEMPLATES setting when a lookup is first used, rather than now.
+
+    Directories added to these namespaces with add_lookup in the meantime are dropped.
+    """
+    _deferred_setup['pending'] = True
+
+
+def get_lookup(namespace):
+    """
+    Returns the Mako template lookup of the given namespace.
+    """
+    _run_deferred_setup()
+    return LOOKUP[namespace]
+
+
 def lookup_template(namespace, name):
     """
     Look up a Mako template by namespace and name.
     """
-    return LOOKUP[namespace].get_template(name)
+    return get_lookup(namespace).get_template(name)
+
+
+def _run_deferred_setup():
+    """
+    Set up the lookups if their setup was deferred, once per process.
+    """
+    if not _deferred_setup['pending']:
+        return
+    with _deferred_setup_lock:
+        if _deferred_setup['pending']:
+            setup_lookups()
+            # Other threads only use the lookups once they are complete.
+            _deferred_setup['pending'] = False
 
 
 @contextlib.contextmanager
@@ -122,6 +166,7 @@ def save_lookups():
     Useful for testing.
 
     """
+    _run_deferred_setup()
     # Make a copy of the list of directories for each namespace.
     namespace_dirs = {namespace: list(look.directories) for namespace, look in LOOKUP.items()}
 
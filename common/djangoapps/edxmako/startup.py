@@ -3,18 +3,17 @@ Initialize the mako template lookup
 """
 from django.conf import settings
 
-from . import add_lookup, clear_lookups
+from .paths import defer_lookup_setup, setup_lookups
 
 
 def run():
     """
-    Setup mako lookup directories.
+    Setup mako lookup directories, or defer it to their first use with LAZY_STARTUP.
 
     IMPORTANT: This method can be called multiple times during application startup. Any changes to this method
     must be safe for multiple callers during startup phase.
     """
-    template_locations = settings.MAKO_TEMPLATES
-    for namespace, directories in template_locations.items():
-        clear_lookups(namespace)
-        for directory in directories:
-            add_lookup(namespace, directory)
+    if getattr(settings, 'LAZY_STARTUP', False):
+        defer_lookup_setup()
+    else:
+        setup_lookups()
@@ -33,7 +33,7 @@ class Template(MakoTemplate):
     def __init__(self, *args, **kwargs):
         """Overrides base __init__ to provide django variable overrides"""
         if not kwargs.get('no_django', False):
-            kwargs['lookup'] = edxmako.LOOKUP['main']
+            kwargs['lookup'] = edxmako.get_lookup('main')
         super(Template, self).__init__(*args, **kwargs)
 
     def render(self, context_instance):
@@ -9,7 +9,8 @@ from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from mock import Mock, patch
 
-from edxmako import LOOKUP, add_lookup
+from edxmako import LOOKUP, add_lookup, get_lookup, save_lookups
+from edxmako.paths import defer_lookup_setup
 from edxmako.request_context import get_template_request_context
 from edxmako.shortcuts import is_any_marketing_link_set, is_marketing_link_set, marketing_link, render_to_string
 from request_cache.middleware import RequestCache
@@ -76,6 +77,18 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class DeferredLookupSetupTests(TestCase):
+    """
+    Test setting up the lookups on their first use.
+    """
+    def test_setup_on_first_use(self):
+        with save_lookups():
+            with patch.dict(settings.MAKO_TEMPLATES, {'deferred': ['/deferred/templates']}):
+                defer_lookup_setup()
+                self.assertNotIn('deferred', LOOKUP)
+                self.assertEqual(get_lookup('deferred').directories, ['/deferred/templates'])
+
+
 class MakoRequestContextTest(TestCase):
     """
     Test MakoMiddleware.
@@ -0,0 +1,196 @@
+"""
+Event tracker backend that buffers events in memory and sends them in
+batches to another backend from a background thread.
+
+The wrapped backend is configured in the same way as the tracking
+backends themselves::
+
+  TRACKING_BACKENDS = {
+      'mongo': {
+          'ENGINE': 'track.backends.buffered.BufferedBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.mongodb.MongoBackend',
+                  'OPTIONS': {...}
+              },
+              'batch_size': 100,
+              'max_buffer_size': 10000,
+              'flush_interval': 1.0,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# Serializes the creation of the buffer and thread of each process.
+_thread_start_lock = threading.Lock()
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that enqueues events and sends them in batches.
+
+    Events are appended to a bounded in-memory buffer and sent to the
+    wrapped backend by a background thread, using its `send_batch` method
+    when it has one.  When the buffer is full, the thread sending an event
+    sends a batch itself before enqueueing it, so that events are not lost
+    when the wrapped backend falls behind.  The buffer is flushed when the
+    process exits, or when the thread is stopped.
+    """
+
+    def __init__(self, backend, batch_size=100, max_buffer_size=10000, flush_interval=1.0, **kwargs):
+        """
+        Configure the buffer and the wrapped backend.
+
+        :Parameters:
+
+          - `backend`: dict with the `ENGINE` and `OPTIONS` of the backend
+            the events are sent to
+          - `batch_size`: maximum number of events sent in a single batch
+          - `max_buffer_size`: maximum number of events waiting to be sent
+          - `flush_interval`: maximum number of seconds an event waits in
+            the buffer before being sent
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        self.backend = import_string(backend['ENGINE'])(**backend.get('OPTIONS', {}))
+        self.batch_size = batch_size
+        self.max_buffer_size = max_buffer_size
+        self.flush_interval = flush_interval
+
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        # Serializes the batches sent to the wrapped backend.
+        self._send_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._pid = None
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Enqueue the event, to be sent in a batch by the background thread."""
+        self._ensure_thread()
+        with self._condition:
+            is_full = len(self._buffer) >= self.max_buffer_size
+        if is_full:
+            dog_stats_api.increment('track.buffered.overflow')
+            self._send_next_batch()
+
+        with self._condition:
+            self._buffer.append(event)
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify()
+
+    def flush(self):
+        """Send all the buffered events."""
+        if self._pid is not None and self._pid != os.getpid():
+            # The buffer holds the events of the process this one was forked from.
+            return
+        while self._send_next_batch():
+            pass
+
+    def stop(self, timeout=None):
+        """
+        Stop the background thread once it has sent the buffered events, and
+        wait for it for at most `timeout` seconds.  Events sent afterwards are
+        only sent by flush() or when the buffer is full.
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def _send_next_batch(self):
+        """
+        Send the oldest buffered events to the wrapped backend, and return
+        the number of events sent.
+        """
+        with self._send_lock:
+            with self._condition:
+                batch = [self._buffer.popleft() for __ in xrange(min(self.batch_size, len(self._buffer)))]
+            if batch:
+                self._send_batch(batch)
+            return len(batch)
+
+    def _send_batch(self, events):
+        """Send the events to the wrapped backend, one by one if it has no send_batch."""
+        # Django only closes the database connections of the threads serving
+        # requests, so the background thread closes its own when they are too
+        # old or broken, as for the DjangoBackend.
+        in_background = threading.current_thread() is self._thread
+        if in_background:
+            close_old_connections()
+        try:
+            with dog_stats_api.timer('track.buffered.send_batch'):
+                if hasattr(self.backend, 'send_batch'):
+                    self.backend.send_batch(events)
+                else:
+                    for event in events:
+                        self.backend.send(event)
+        except Exception:  # pylint: disable=broad-except
+            # As with the unbuffered backends, a failure to send must not
+            # propagate to the code that emitted the events.
+            log.exception(u'Error sending %d buffered tracking events', len(events))
+        finally:
+            if in_background:
+                close_old_connections()
+
+    def _ensure_thread(self):
+        """
+        Start the background thread, again in each process forked after the
+        backend was created, since threads do not survive a fork.
+
+        A forked process gets a new buffer and new locks before using them:
+        the buffer holds the events of the parent process, and its locks may
+        have been held by threads of the parent at the time of the fork, which
+        would never release them.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with _thread_start_lock:
+            if self._pid == pid:
+                return
+            self._buffer = deque()
+            self._condition = threading.Condition()
+            self._send_lock = threading.Lock()
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='track-buffered-backend')
+            self._thread.daemon = True
+            # Other threads only use the buffer and locks once they see the new pid.
+            self._pid = pid
+            self._thread.start()
+
+    def _run(self):
+        """
+        Send the buffered events whenever a batch is full or the flush interval
+        has elapsed, until the thread is stopped.
+        """
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._buffer) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
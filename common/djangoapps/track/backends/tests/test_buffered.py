@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+import os
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class BatchRecordingBackend(BaseBackend):
+    """Backend that records the batches of events it is sent."""
+    def __init__(self, **options):
+        super(BatchRecordingBackend, self).__init__(**options)
+        self.batches = []
+
+    def send(self, event):
+        self.batches.append([event])
+
+    def send_batch(self, events):
+        self.batches.append(list(events))
+
+
+class EventRecordingBackend(object):
+    """Backend without send_batch, that records the events it is sent."""
+    def __init__(self):
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event)
+
+
+class TestBufferedBackend(TestCase):
+    def setUp(self):
+        super(TestBufferedBackend, self).setUp()
+        # Send the batches from the test thread only.
+        patcher = patch.object(BufferedBackend, '_ensure_thread')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_backend(self, engine='track.backends.tests.test_buffered.BatchRecordingBackend', **options):
+        return BufferedBackend(backend={'ENGINE': engine}, **options)
+
+    def test_flush_in_batches(self):
+        backend = self._create_backend(batch_size=2)
+        for index in range(5):
+            backend.send({'test': index})
+        self.assertEqual(backend.backend.batches, [])
+
+        backend.flush()
+        self.assertEqual(
+            backend.backend.batches,
+            [[{'test': 0}, {'test': 1}], [{'test': 2}, {'test': 3}], [{'test': 4}]]
+        )
+
+    def test_full_buffer(self):
+        backend = self._create_backend(batch_size=2, max_buffer_size=3)
+        for index in range(4):
+            backend.send({'test': index})
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}]])
+
+        backend.flush()
+        self.assertEqual(backend.backend.batches[1:], [[{'test': 2}, {'test': 3}]])
+
+    def test_backend_without_send_batch(self):
+        backend = self._create_backend(engine='track.backends.tests.test_buffered.EventRecordingBackend')
+        backend.send({'test': 1})
+        backend.send({'test': 2})
+        backend.flush()
+        self.assertEqual(backend.backend.events, [{'test': 1}, {'test': 2}])
+
+    def test_send_error(self):
+        backend = self._create_backend()
+        backend.send({'test': 1})
+        with patch.object(backend.backend, 'send_batch', side_effect=Exception):
+            backend.flush()
+        backend.send({'test': 2})
+        backend.flush()
+        self.assertEqual(backend.backend.batches, [[{'test': 2}]])
+
+
+class TestBufferedBackendThread(TestCase):
+    def _create_backend(self):
+        return BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.BatchRecordingBackend'},
+            batch_size=2,
+            flush_interval=60,
+        )
+
+    def test_background_thread(self):
+        backend = self._create_backend()
+        backend.send({'test': 1})
+        backend.send({'test': 2})
+        backend.send({'test': 3})
+        backend.stop(timeout=5)
+        self.assertFalse(backend._thread.is_alive())  # pylint: disable=protected-access
+        self.assertEqual(backend.backend.batches, [[{'test': 1}, {'test': 2}], [{'test': 3}]])
+
+    @patch('track.backends.buffered.close_old_connections')
+    def test_connections_closed_by_thread(self, mock_close_old_connections):
+        backend = self._create_backend()
+        backend.send({'test': 1})
+        backend.stop(timeout=5)
+        self.assertEqual(mock_close_old_connections.call_count, 2)
+
+    def test_after_fork(self):
+        # pylint: disable=protected-access
+        backend = self._create_backend()
+        # Pretend the backend was used by a parent process, with a thread holding its lock.
+        backend._pid = os.getpid() + 1
+        backend._buffer.append({'parent': 1})
+        parent_condition = backend._condition
+        parent_condition.acquire()
+        try:
+            backend.send({'test': 1})
+            backend.stop(timeout=5)
+        finally:
+            parent_condition.release()
+        self.assertEqual(backend.backend.batches, [[{'test': 1}]])
@@ -13,9 +13,11 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+import hashlib
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -29,7 +31,7 @@ import capa.inputtypes as inputtypes
 import capa.responsetypes as responsetypes
 import capa.xqueue_interface as xqueue_interface
 from capa.correctmap import CorrectMap
-from capa.safe_exec import safe_exec
+from capa.safe_exec import safe_exec, safe_exec_batch
 from capa.util import contextualize_text, convert_files_to_filenames
 from openedx.core.djangolib.markup import HTML
 from xmodule.stringify import stringify_children
@@ -71,6 +73,31 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# number of preprocessed problem trees kept in memory by each process
+PREPROCESSED_PROBLEM_CACHE_SIZE = 500
+
+_preprocessed_problems = OrderedDict()
+_preprocessed_problems_lock = threading.Lock()
+
+
+def clear_preprocessed_problem_cache():
+    """
+    Remove all preprocessed problem trees from this process' cache.
+    """
+    with _preprocessed_problems_lock:
+        _preprocessed_problems.clear()
+
+
+def _preprocessed_problem_key(problem_id, problem_text):
+    """
+    Return the key under which the preprocessed tree of the given problem is cached.
+    """
+    key = hashlib.sha1()
+    for value in (problem_id, problem_text):
+        key.update(value.encode('utf-8') if isinstance(value, unicode) else str(value))
+        key.update('\0')
+    return key.hexdigest()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -171,18 +198,9 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, with includes processed and
+        # IDs assigned to responses and their inputs
+        self.problem_text, self.tree, self.problem_data = self._load_preprocessed_problem(problem_text)
 
         # construct script processor context (eg for customresponse problems)
         if minimal_init:
@@ -190,11 +208,9 @@ class LoncapaProblem(object):
         else:
             self.context = self._extract_context(self.tree)
 
-        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
-        # transformations.  This also creates the dict (self.responders) of Response
-        # instances for each question in the problem. The dict has keys = xml subtree of
-        # Response, values = Response instance
-        self.problem_data = self._preprocess_problem(self.tree, minimal_init)
+        # Create the dict (self.responders) of Response instances for each question in
+        # the problem. The dict has keys = xml subtree of Response, values = Response instance
+        self._preprocess_problem(self.tree, minimal_init)
 
         if not minimal_init:
             if not self.student_answers:  # True when student_answers is an empty dict
@@ -418,6 +434,31 @@ class LoncapaProblem(object):
         """
         return all('filesubmission' not in responder.allowed_inputfields for responder in self.responders.values())
 
+    def warm_script_cache(self, learners):
+        """
+        Runs the problem's scripts for other learners, in a single sandbox, and
+        caches their results.
+
+        `learners` is a list of (seed, anonymous_student_id) pairs.  Problems
+        later created for those learners with the same capa_system cache find
+        their script context in the cache, instead of each starting a sandbox.
+        Errors are not raised here: they are cached, and raised when the
+        learner's problem is created.
+        """
+        code = self.context.get('script_code')
+        if not code or not learners:
+            return
+
+        safe_exec_batch(
+            code,
+            [(self._initial_context(seed, anonymous_student_id), seed) for seed, anonymous_student_id in learners],
+            python_path=self.context['python_path'],
+            extra_files=self.context['extra_files'] or [],
+            cache=self.capa_system.cache,
+            slug=self.problem_id,
+            unsafely=self.capa_system.can_execute_unsafe_code(),
+        )
+
     def get_grade_from_current_answers(self, student_answers):
         """
         Gets the grade for the currently-saved problem state, but does not save it
@@ -604,6 +645,55 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
+    def _load_preprocessed_problem(self, problem_text):
+        """
+        Parse and preprocess the given problem text, in a way that does not depend on
+        the seed nor on the state of the problem: convert startouttext and endouttext,
+        parse the XML, make it compatible, handle includes and assign IDs to responses
+        and their inputs.
+
+        The result only depends on the problem text and id, so it is cached per
+        process, keyed by a hash of both, and each problem gets its own deep copy of
+        the cached tree. Problems with <include> tags are not cached, since the
+        included files may change independently of the problem text.
+
+        Returns a (problem_text, tree, problem_data) tuple, where problem_data holds
+        the a11y data of the responses (see response_a11y_data).
+        """
+        cache_key = _preprocessed_problem_key(self.problem_id, problem_text)
+        with _preprocessed_problems_lock:
+            cached = _preprocessed_problems.pop(cache_key, None)
+            if cached is not None:
+                _preprocessed_problems[cache_key] = cached
+        if cached is not None:
+            problem_text, tree, problem_data = cached
+            return problem_text, deepcopy(tree), deepcopy(problem_data)
+
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+
+        # parse problem XML file into an element tree
+        self.tree = etree.XML(problem_text)
+
+        self.make_xml_compatible(self.tree)
+
+        # handle any <include file="foo"> tags
+        has_includes = self.tree.find('.//include') is not None
+        self._process_includes()
+
+        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
+        # transformations.
+        problem_data = self._assign_ids(self.tree)
+
+        if not has_includes:
+            with _preprocessed_problems_lock:
+                _preprocessed_problems[cache_key] = (problem_text, deepcopy(self.tree), deepcopy(problem_data))
+                while len(_preprocessed_problems) > PREPROCESSED_PROBLEM_CACHE_SIZE:
+                    _preprocessed_problems.popitem(last=False)
+
+        return problem_text, self.tree, problem_data
+
     def _process_includes(self):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
@@ -696,9 +786,7 @@ class LoncapaProblem(object):
 
         Problem XML goes to Python execution context. Runs everything in script tags.
         """
-        context = {}
-        context['seed'] = self.seed
-        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+        context = self._initial_context(self.seed, self.capa_system.anonymous_student_id)
         all_code = ''
 
         python_path = []
@@ -751,6 +839,15 @@ class LoncapaProblem(object):
         context['extra_files'] = extra_files or None
         return context
 
+    def _initial_context(self, seed, anonymous_student_id):
+        """
+        Returns the globals the problem's scripts are executed with.
+        """
+        return {
+            'seed': seed,
+            'anonymous_student_id': anonymous_student_id,
+        }
+
     def _extract_html(self, problemtree):  # private
         """
         Main (private) function which converts Problem XML tree to HTML.
@@ -867,20 +964,16 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree, minimal_init):  # private
+    def _assign_ids(self, tree):  # private
         """
         Assign IDs to all the responses
         Assign sub-IDs to all entries (textline, schematic, etc.)
-        Annoted correctness and value
         In-place transformation
 
-        Also create capa Response instances for each responsetype and save as self.responders
-
-        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Returns the a11y data of the responses, see response_a11y_data.
         """
         response_id = 1
         problem_data = {}
-        self.responders = {}
         for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
@@ -888,11 +981,7 @@ class LoncapaProblem(object):
             response_id += 1
 
             answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
-            inputfields = tree.xpath(
-                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
-                id=responsetype_id
-            )
+            inputfields = self._get_inputfields(tree, response)
 
             # assign one answer_id for each input type
             for entry in inputfields:
@@ -903,6 +992,33 @@ class LoncapaProblem(object):
 
             self.response_a11y_data(response, inputfields, responsetype_id, problem_data)
 
+        return problem_data
+
+    def _get_inputfields(self, tree, response):  # private
+        """
+        Return the input entries of the given response.
+        """
+        input_tags = inputtypes.registry.registered_tags()
+        return tree.xpath(
+            "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
+            id=response.get('id')
+        )
+
+    def _preprocess_problem(self, tree, minimal_init):  # private
+        """
+        Annoted correctness and value
+        In-place transformation
+
+        Create capa Response instances for each responsetype and save as self.responders
+
+        Obtain all responder answers and save as self.responder_answers dict (key = response)
+
+        Expects IDs to be assigned already, see _assign_ids.
+        """
+        self.responders = {}
+        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+            inputfields = self._get_inputfields(tree, response)
+
             # instantiate capa Response
             responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
             responder = responsetype_cls(
@@ -931,8 +1047,6 @@ class LoncapaProblem(object):
                 solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
                 solution_id += 1
 
-        return problem_data
-
     def response_a11y_data(self, response, inputfields, responsetype_id, problem_data):
         """
         Construct data to be used for a11y.
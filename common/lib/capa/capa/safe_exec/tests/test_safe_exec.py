@@ -9,7 +9,7 @@ import unittest
 
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, safe_exec_batch, update_hash
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -177,6 +177,43 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestSafeExecBatch(unittest.TestCase):
+    """Test safe_exec_batch."""
+
+    CODE = "rnum = random.randint(0, 999)\nhalf = seed/2\n"
+
+    def test_matches_safe_exec(self):
+        executions = [({'seed': seed}, seed) for seed in range(5)]
+        errors = safe_exec_batch(self.CODE, executions)
+        self.assertEqual(errors, [None] * 5)
+
+        for globals_dict, seed in executions:
+            expected = {'seed': seed}
+            safe_exec(self.CODE, expected, random_seed=seed)
+            self.assertEqual(globals_dict, expected)
+            self.assertEqual(globals_dict['rnum'], random.Random(seed).randint(0, 999))
+
+    def test_raising_exceptions(self):
+        executions = [({'seed': seed}, seed) for seed in range(3)]
+        errors = safe_exec_batch("if seed == 1: 1/0\na = 17", executions)
+        self.assertIsNone(errors[0])
+        self.assertIn("ZeroDivisionError", errors[1].message)
+        self.assertEqual([globals_dict.get('a') for globals_dict, __ in executions], [17, None, 17])
+
+    def test_shares_cache_with_safe_exec(self):
+        cache = {}
+        executions = [({'seed': seed}, seed) for seed in range(3)]
+        safe_exec_batch(self.CODE, executions, cache=DictCache(cache))
+        self.assertEqual(len(cache), 3)
+
+        # Fiddle with the cache; safe_exec now reads the result of the batch.
+        for key in cache:
+            cache[key] = (None, {'rnum': 17})
+        g = {'seed': 1}
+        safe_exec(self.CODE, g, random_seed=1, cache=DictCache(cache))
+        self.assertEqual(g['rnum'], 17)
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -2,11 +2,15 @@
 Test capa problem.
 """
 import ddt
+import random
 import textwrap
 from lxml import etree
+from mock import patch
 import unittest
 
-from capa.tests.helpers import new_loncapa_problem
+from capa.capa_problem import LoncapaProblem, clear_preprocessed_problem_cache
+from capa.safe_exec.tests.test_safe_exec import DictCache
+from capa.tests.helpers import new_loncapa_problem, test_capa_system
 
 
 @ddt.ddt
@@ -590,3 +594,77 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
             description_element = multi_inputs_group.xpath('//p[@id="{}"]'.format(description_id))
             self.assertEqual(len(description_element), 1)
             self.assertEqual(description_element[0].text, descriptions[index])
+
+
+class CAPAProblemCacheTest(unittest.TestCase):
+    """ TestCase for the cache of preprocessed problem trees """
+
+    xml = textwrap.dedent("""
+        <problem>
+            <optionresponse>
+                <label>Which color is the sky?</label>
+                <optioninput options="('yellow','blue','green')" correct="blue"/>
+            </optionresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(CAPAProblemCacheTest, self).setUp()
+        clear_preprocessed_problem_cache()
+        patcher = patch.object(
+            LoncapaProblem, '_assign_ids', autospec=True, side_effect=LoncapaProblem._assign_ids
+        )
+        self.mock_assign_ids = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_preprocessed_problem_is_cached(self):
+        first = new_loncapa_problem(self.xml, seed=1)
+        second = new_loncapa_problem(self.xml, seed=2)
+        self.assertEqual(self.mock_assign_ids.call_count, 1)
+
+        # each problem gets its own copy of the tree
+        self.assertIsNot(first.tree, second.tree)
+        self.assertEqual(etree.tostring(first.tree), etree.tostring(second.tree))
+        self.assertEqual(first.problem_data, second.problem_data)
+        self.assertEqual(first.problem_data['1_2_1']['label'], 'Which color is the sky?')
+
+        first.tree.find('.//optioninput').set('correct', 'green')
+        third = new_loncapa_problem(self.xml)
+        self.assertEqual(third.tree.find('.//optioninput').get('correct'), 'blue')
+
+    def test_cache_is_keyed_by_problem_id(self):
+        new_loncapa_problem(self.xml, problem_id='1')
+        problem = new_loncapa_problem(self.xml, problem_id='2')
+        self.assertEqual(self.mock_assign_ids.call_count, 2)
+        self.assertEqual(problem.tree.find('.//optioninput').get('id'), '2_2_1')
+
+
+class CAPAProblemWarmScriptCacheTest(unittest.TestCase):
+    """ TestCase for running the scripts of a problem for other learners """
+
+    xml = textwrap.dedent("""
+        <problem>
+            <script type="loncapa/python">
+rnum = random.randint(0, 999)
+            </script>
+            <p>$rnum</p>
+        </problem>
+    """)
+
+    def test_warmed_results_are_used(self):
+        capa_system = test_capa_system()
+        capa_system.cache = DictCache({})
+        problem = new_loncapa_problem(self.xml, capa_system=capa_system, seed=1)
+        problem.warm_script_cache([(2, 'student'), (3, 'student')])
+
+        with patch('capa.safe_exec.safe_exec.codejail_safe_exec') as mock_exec:
+            for seed in (2, 3):
+                problem = new_loncapa_problem(self.xml, capa_system=capa_system, seed=seed)
+                self.assertEqual(problem.context['rnum'], random.Random(seed).randint(0, 999))
+        self.assertFalse(mock_exec.called)
+
+    def test_problem_without_scripts(self):
+        problem = new_loncapa_problem('<problem><p>No scripts</p></problem>')
+        with patch('capa.capa_problem.safe_exec_batch') as mock_batch:
+            problem.warm_script_cache([(2, 'student')])
+        self.assertFalse(mock_batch.called)
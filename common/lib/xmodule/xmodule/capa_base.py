@@ -1573,6 +1573,16 @@ class CapaMixin(ScorableXBlockMixin, CapaFields):
             'html': self.get_problem_html(encapsulate=False),
         }
 
+    def warm_script_cache(self, learners):
+        """
+        Caches the results of the problem's scripts for other learners, given as
+        (seed, anonymous_student_id) pairs, running them in a single sandbox.
+
+        Used before rescoring many learners, so that their problems do not each
+        start a sandbox.
+        """
+        self.lcp.warm_script_cache(learners)
+
     # ScorableXBlockMixin methods
 
     def rescore(self, only_if_higher=False):
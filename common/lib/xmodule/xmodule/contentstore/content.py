@@ -373,6 +373,14 @@ class ContentStore(object):
         '''
         raise NotImplementedError
 
+    def get_asset_names_for_course(self, course_key):
+        """
+        Returns a frozenset of the names of all the static assets of a course (the
+        names of their asset keys), so that the existence of assets can be checked
+        without querying the store for each of them.
+        """
+        raise NotImplementedError
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all of the assets which use this course_key as an identifier
@@ -4,13 +4,16 @@ MongoDB/GridFS-level code for the contentstore.
 import os
 import json
 import pymongo
+from uuid import uuid4
 import gridfs
 from gridfs.errors import NoFile
 from fs.osfs import OSFS
 from bson.son import SON
+from django.core.cache import cache
 
 from mongodb_proxy import autoretry_read
 from opaque_keys.edx.keys import AssetKey
+from opaque_keys.edx.locator import CourseLocator
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
@@ -18,6 +21,10 @@ from xmodule.util.misc import escape_invalid_characters
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from .content import StaticContent, ContentStore, StaticContentStream
 
+# The names of the assets of each course are cached, and the cached names are
+# cleared whenever an asset of the course is saved or deleted.
+ASSET_NAMES_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 class MongoContentStore(ContentStore):
     """
@@ -100,6 +107,7 @@ class MongoContentStore(ContentStore):
             else:
                 fp.write(content.data)
 
+        self._clear_asset_names(content.location.course_key)
         return content
 
     def delete(self, location_or_id):
@@ -111,6 +119,16 @@ class MongoContentStore(ContentStore):
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
 
+        if isinstance(location_or_id, basestring):
+            self._clear_asset_names(AssetKey.from_string(location_or_id).course_key)
+        elif 'run' in location_or_id:
+            self._clear_asset_names(
+                CourseLocator(location_or_id['org'], location_or_id['course'], location_or_id['run'])
+            )
+        else:
+            # The ids of deprecated assets have no run.
+            self._clear_deprecated_asset_names(location_or_id['org'], location_or_id['course'])
+
     @autoretry_read()
     def find(self, location, throw_on_not_found=True, as_stream=False):
         content_id, __ = self.asset_db_key(location)
@@ -209,6 +227,60 @@ class MongoContentStore(ContentStore):
             course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
         )
 
+    @autoretry_read()
+    def get_asset_names_for_course(self, course_key):
+        """
+        See :meth:`.ContentStore.get_asset_names_for_course`
+        """
+        cache_key = self._asset_names_cache_key(course_key)
+        asset_names = cache.get(cache_key)
+        if asset_names is None:
+            query = query_for_course(course_key, 'asset')
+            asset_names = frozenset(
+                asset.get('content_son', asset['_id'])['name']
+                for asset in self.fs_files.find(query, {'_id': True, 'content_son': True})
+            )
+            cache.set(cache_key, asset_names, ASSET_NAMES_CACHE_TIMEOUT)
+        return asset_names
+
+    def _asset_names_cache_key(self, course_key):
+        """
+        Returns the cache key of the asset names of the given course run.
+
+        The assets of deprecated courses are stored without their run, and are
+        shared by all the runs of the org and course (see query_for_course).  The
+        keys of deprecated courses also contain a version, changed whenever those
+        assets change, which clears the names of every run at once.
+        """
+        course_key = course_key.for_branch(None)
+        cache_key = u'contentstore.asset_names.{}.{}'.format(self.fs_files.full_name, unicode(course_key))
+        if getattr(course_key, 'deprecated', False):
+            version_key = self._deprecated_asset_names_version_key(course_key.org, course_key.course)
+            cache.add(version_key, uuid4().hex, None)
+            cache_key = u'{}.{}'.format(cache_key, cache.get(version_key))
+        return cache_key
+
+    def _deprecated_asset_names_version_key(self, org, course):
+        """
+        Returns the cache key of the version of the asset names of the deprecated courses with the given org and course.
+        """
+        return u'contentstore.asset_names_version.{}.{}.{}'.format(self.fs_files.full_name, org, course)
+
+    def _clear_asset_names(self, course_key):
+        """
+        Clears the cached asset names of the given course run.
+        """
+        if getattr(course_key, 'deprecated', False):
+            self._clear_deprecated_asset_names(course_key.org, course_key.course)
+        else:
+            cache.delete(self._asset_names_cache_key(course_key))
+
+    def _clear_deprecated_asset_names(self, org, course):
+        """
+        Clears the cached asset names of all the runs of the deprecated courses with the given org and course.
+        """
+        cache.set(self._deprecated_asset_names_version_key(org, course), uuid4().hex, None)
+
     def remove_redundant_content_for_courses(self):
         """
         Finds and removes all redundant files (Mac OS metadata files with filename ".DS_Store"
@@ -367,6 +439,7 @@ class MongoContentStore(ContentStore):
                 # getattr b/c caching may mean some pickled instances don't have attr
                 locked=asset.get('locked', False)
             )
+        self._clear_asset_names(dest_course_key)
 
     def delete_all_course_assets(self, course_key):
         """
@@ -379,6 +452,7 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+        self._clear_asset_names(course_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
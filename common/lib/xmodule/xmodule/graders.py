@@ -12,6 +12,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy
 from contracts import contract
 from pytz import UTC
 
@@ -242,6 +243,22 @@ class CourseGrader(object):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_batch(self, score_matrices, learner_count):
+        '''
+        Given the scores of many learners, return a dict containing grading information
+        for all of them, as numpy arrays with one row (or value) per learner.
+
+        score_matrices is keyed by section format. Each value is a tuple of two
+        arrays (earned, possible) of shape (learner_count, number of sections), with
+        one column per graded section of that format, in course order. Sections
+        a learner has no score for should have a possible of 0 (or NaN), like sections
+        that are missing from a grade_sheet.
+
+        The results are the same as calling grade() for each learner, except that
+        the string labels and details of the breakdowns are not computed.
+        '''
+        raise NotImplementedError
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -287,6 +304,32 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_batch(self, score_matrices, learner_count):
+        """
+        Returns a dict with the following keys:
+        - percent: array of the final percentage of each learner.
+        - grade_breakdown: OrderedDict of the weighted percentage arrays, keyed by category.
+        - section_breakdown: OrderedDict of the results of each subgrader's grade_batch(), keyed by category.
+        """
+        total_percent = numpy.zeros(learner_count)
+        section_breakdown = OrderedDict()
+        grade_breakdown = OrderedDict()
+
+        for subgrader, assignment_type, weight in self.subgraders:
+            subgrade_result = subgrader.grade_batch(score_matrices, learner_count)
+
+            # Accumulate in the same order as grade(), so that the totals are identical.
+            weighted_percent = subgrade_result['percent'] * weight
+            total_percent = total_percent + weighted_percent
+            section_breakdown[assignment_type] = subgrade_result
+            grade_breakdown[assignment_type] = weighted_percent
+
+        return {
+            'percent': total_percent,
+            'section_breakdown': section_breakdown,
+            'grade_breakdown': grade_breakdown,
+        }
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -445,6 +488,115 @@ class AssignmentFormatGrader(CourseGrader):
             # No grade_breakdown here
         }
 
+    def grade_batch(self, score_matrices, learner_count):
+        """
+        Returns a dict with the following keys:
+        - percent: array of the percentage of each learner for this format.
+        - section_percents: (learner_count, section_count) array of the percentage of each
+          entry of the section breakdown of each learner, including placeholder entries.
+        - section_counts: array of the number of entries in the section breakdown of each learner.
+        - dropped: boolean array, of the same shape as section_percents, of the dropped entries.
+        """
+        earned, possible = _get_score_matrix(score_matrices, self.type, learner_count)
+
+        # Like in a grade_sheet, sections without any possible score are left out,
+        # so move the remaining sections of each learner to the left, keeping their order.
+        rows = numpy.arange(learner_count)[:, numpy.newaxis]
+        present = possible > 0
+        order = numpy.argsort((~present).astype(numpy.int8), axis=1, kind='mergesort')
+        earned, possible, present = earned[rows, order], possible[rows, order], present[rows, order]
+        present_counts = present.sum(axis=1)
+
+        # Every learner has at least min_count entries, the missing ones being placeholders of 0.
+        section_count = max(self.min_count, earned.shape[1])
+        section_counts = numpy.maximum(self.min_count, present_counts)
+        columns = numpy.arange(section_count)[numpy.newaxis, :]
+        valid = columns < section_counts[:, numpy.newaxis]
+        section_percents = numpy.zeros((learner_count, section_count))
+        section_percents[:, :earned.shape[1]] = numpy.where(
+            present, earned / numpy.where(present, possible, 1.0), 0.0
+        )
+
+        # Drop the lowest entries, breaking ties by position like the stable sort of grade().
+        dropped = numpy.zeros((learner_count, section_count), dtype=bool)
+        if self.drop_count > 0 and section_count > 0:
+            sort_keys = numpy.where(valid, -section_percents, numpy.inf)
+            sorted_order = numpy.argsort(sort_keys, axis=1, kind='mergesort')
+            positions = numpy.argsort(sorted_order, axis=1)
+            dropped = valid & (positions >= (section_counts - self.drop_count)[:, numpy.newaxis])
+
+        # Sum column by column, so that the floating point additions happen in the same order as in grade().
+        kept = valid & ~dropped
+        total_percent = numpy.zeros(learner_count)
+        for column in range(section_count):
+            total_percent = total_percent + numpy.where(kept[:, column], section_percents[:, column], 0.0)
+        kept_counts = section_counts - self.drop_count
+        total_percent = numpy.where(
+            kept_counts > 0, total_percent / numpy.maximum(kept_counts, 1), total_percent
+        )
+
+        return {
+            'percent': total_percent,
+            'section_percents': section_percents,
+            'section_counts': section_counts,
+            'dropped': dropped,
+        }
+
+
+def grade_batch(grader, score_matrices, learner_count, grade_cutoffs):
+    """
+    Grades many learners at once with the given course grader.
+
+    See CourseGrader.grade_batch for the format of score_matrices. Returns a dict with
+    the following keys, each with one value per learner:
+    - percent: array of the course percentages, rounded like those of a CourseGrade.
+    - letter_grade: object array of the letter grades, or None where not passed.
+    - passed: boolean array of whether each learner passed the course.
+    - grader_result: the result of the grader's grade_batch().
+    """
+    grader_result = grader.grade_batch(score_matrices, learner_count)
+    percent = _round_half_away_from_zero(grader_result['percent'] * 100 + 0.05) / 100
+
+    letter_grade = numpy.empty(learner_count, dtype=object)
+    graded = numpy.zeros(learner_count, dtype=bool)
+    for possible_grade in sorted(grade_cutoffs, key=lambda x: grade_cutoffs[x], reverse=True):
+        reached = ~graded & (percent >= grade_cutoffs[possible_grade])
+        letter_grade[reached] = possible_grade
+        graded |= reached
+
+    nonzero_cutoffs = [cutoff for cutoff in grade_cutoffs.values() if cutoff > 0]
+    if nonzero_cutoffs:
+        passed = percent >= min(nonzero_cutoffs)
+    else:
+        passed = numpy.zeros(learner_count, dtype=bool)
+
+    return {
+        'percent': percent,
+        'letter_grade': letter_grade,
+        'passed': passed,
+        'grader_result': grader_result,
+    }
+
+
+def _get_score_matrix(score_matrices, section_format, learner_count):
+    """
+    Returns the (earned, possible) float arrays of the given format, which are empty if it has no sections.
+    """
+    if section_format not in score_matrices:
+        return numpy.zeros((learner_count, 0)), numpy.zeros((learner_count, 0))
+    earned, possible = score_matrices[section_format]
+    return numpy.asarray(earned, dtype=float), numpy.asarray(possible, dtype=float)
+
+
+def _round_half_away_from_zero(values):
+    """
+    Rounds the values to whole numbers like python 2's round(), rather than to even like numpy.round().
+    """
+    magnitudes = numpy.abs(values)
+    rounded = numpy.floor(magnitudes)
+    rounded += magnitudes - rounded >= 0.5
+    return numpy.where(values < 0, -rounded, rounded)
+
 
 def _iter_graded(scores):
     """
@@ -67,9 +67,23 @@ SORT_REVISION_FAVOR_DRAFT = ('_id.revision', pymongo.DESCENDING)
 # sort order that returns PUBLISHED items first
 SORT_REVISION_FAVOR_PUBLISHED = ('_id.revision', pymongo.ASCENDING)
 
-BLOCK_TYPES_WITH_CHILDREN = list(set(
-    name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
-))
+_BLOCK_TYPES_WITH_CHILDREN = None
+
+
+def get_block_types_with_children():
+    """
+    Returns the list of the block types that can have children.
+
+    The XBlock classes are loaded on first use rather than when this module is
+    imported, since loading them imports every installed XBlock.
+    """
+    global _BLOCK_TYPES_WITH_CHILDREN  # pylint: disable=global-statement
+    if _BLOCK_TYPES_WITH_CHILDREN is None:
+        # Threads computing it at the same time each assign a complete list.
+        _BLOCK_TYPES_WITH_CHILDREN = list(set(
+            name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
+        ))
+    return _BLOCK_TYPES_WITH_CHILDREN
 
 # Allow us to call _from_deprecated_(son|string) throughout the file
 # pylint: disable=protected-access
@@ -692,7 +706,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             ('_id.tag', 'i4x'),
             ('_id.org', course_id.org),
             ('_id.course', course_id.course),
-            ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
+            ('_id.category', {'$in': get_block_types_with_children()})
         ])
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
@@ -165,6 +165,38 @@ class TestContentstore(unittest.TestCase):
         self.assertEqual(count, 0)
         self.assertEqual(course_assets, [])
 
+    @ddt.data(True, False)
+    def test_get_asset_names(self, deprecated):
+        """
+        Test get_asset_names_for_course, as assets are saved and deleted
+        """
+        self.set_up_assets(deprecated)
+        self.assertEqual(self.contentstore.get_asset_names_for_course(self.course1_key), set(self.course1_files))
+        self.assertEqual(self.contentstore.get_asset_names_for_course(self.course2_key), set(self.course2_files))
+
+        # The assets of deprecated courses are stored without their run, and shared by all runs.
+        other_run_key = CourseLocator('test', 'asset_test', '2015_01')
+        other_run_files = set(self.course1_files) if deprecated else set()
+        self.assertEqual(self.contentstore.get_asset_names_for_course(other_run_key), other_run_files)
+
+        asset_key = self.course1_key.make_asset_key('asset', 'door_2.ogg')
+        self.save_asset('door_2.ogg', asset_key, 'door_2.ogg', False)
+        self.assertIn('door_2.ogg', self.contentstore.get_asset_names_for_course(self.course1_key))
+        self.assertEqual('door_2.ogg' in self.contentstore.get_asset_names_for_course(other_run_key), deprecated)
+
+        other_run_asset_key = other_run_key.make_asset_key('asset', 'picture3.jpg')
+        self.save_asset('picture3.jpg', other_run_asset_key, 'picture3.jpg', False)
+        self.assertIn('picture3.jpg', self.contentstore.get_asset_names_for_course(other_run_key))
+        self.assertEqual('picture3.jpg' in self.contentstore.get_asset_names_for_course(self.course1_key), deprecated)
+
+        self.contentstore.delete(asset_key)
+        self.contentstore.delete(other_run_asset_key)
+        self.assertEqual(self.contentstore.get_asset_names_for_course(self.course1_key), set(self.course1_files))
+        self.assertEqual(self.contentstore.get_asset_names_for_course(other_run_key), other_run_files)
+
+        self.contentstore.delete_all_course_assets(self.course2_key)
+        self.assertEqual(self.contentstore.get_asset_names_for_course(self.course2_key), set())
+
     @ddt.data(True, False)
     def test_attrs(self, deprecated):
         """
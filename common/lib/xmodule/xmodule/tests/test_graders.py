@@ -3,9 +3,11 @@ Grading tests
 """
 
 import unittest
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 import ddt
+import numpy
 from pytz import UTC
 from xmodule import graders
 from xmodule.graders import (
@@ -319,6 +321,112 @@ class GraderTest(unittest.TestCase):
         self.assertIn(expected_error_message, error.exception.message)
 
 
+class GraderBatchTest(unittest.TestCase):
+    """
+    Tests that grading learners in batch gives the same results as grading each learner
+    """
+    common_fields = dict(graded=True, first_attempted=datetime.now())
+
+    # Scores of three learners, with a possible of 0 for sections they have no score for.
+    score_matrices = {
+        'Homework': (
+            numpy.array([[2, 16, 0, 3], [0, 0, 0, 0], [5, 1, 1, 0]], dtype=float),
+            numpy.array([[20, 16, 0, 4], [0, 0, 0, 0], [5, 2, 1, 0]], dtype=float),
+        ),
+        'Lab': (
+            numpy.array([[1, 1, 1, 5, 3, 6, 5], [0, 1, 0, 0, 0, 0, 0], [1, 1, 0, 0, 1, 1, 1]], dtype=float),
+            numpy.array([[2, 1, 1, 25, 4, 7, 6], [1, 1, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1, 1]], dtype=float),
+        ),
+        'Midterm': (
+            numpy.array([[50.5], [0], [100]], dtype=float),
+            numpy.array([[100], [0], [100]], dtype=float),
+        ),
+    }
+    grade_cutoffs = {'A': 0.9, 'B': 0.6, 'C': 0.3}
+
+    def setUp(self):
+        super(GraderBatchTest, self).setUp()
+        self.homework_grader = graders.AssignmentFormatGrader("Homework", 6, 2)
+        self.lab_grader = graders.AssignmentFormatGrader("Lab", 3, 3)
+        self.midterm_grader = graders.AssignmentFormatGrader("Midterm", 1, 0)
+        self.weighted_grader = graders.WeightedSubsectionsGrader([
+            (self.homework_grader, self.homework_grader.category, 0.25),
+            (self.lab_grader, self.lab_grader.category, 0.25),
+            (self.midterm_grader, self.midterm_grader.category, 0.5),
+        ])
+
+    def _grade_sheet(self, learner):
+        """
+        Returns the grade sheet of the given learner in score_matrices, as grade() expects it.
+        """
+        grade_sheet = {}
+        for section_format, (earned, possible) in self.score_matrices.iteritems():
+            grade_sheet[section_format] = OrderedDict(
+                (
+                    index,
+                    GraderTest.MockGrade(
+                        AggregatedScore(tw_earned=earned[learner, index], tw_possible=possible[learner, index],
+                                        **self.common_fields),
+                        display_name=str(index),
+                    )
+                )
+                for index in range(possible.shape[1]) if possible[learner, index] > 0
+            )
+        return grade_sheet
+
+    def test_assignment_format_grader(self):
+        for grader in (self.homework_grader, self.lab_grader, self.midterm_grader):
+            batch_result = grader.grade_batch(self.score_matrices, 3)
+            for learner in range(3):
+                result = grader.grade(self._grade_sheet(learner))
+                self.assertEqual(batch_result['percent'][learner], result['percent'])
+
+                section_count = batch_result['section_counts'][learner]
+                dropped = batch_result['dropped'][learner]
+                if section_count > 1:
+                    breakdown = result['section_breakdown'][:-1]
+                    self.assertEqual(len(breakdown), section_count)
+                    self.assertEqual(
+                        list(batch_result['section_percents'][learner, :section_count]),
+                        [section['percent'] for section in breakdown],
+                    )
+                    self.assertEqual(
+                        list(dropped[:section_count]),
+                        ['mark' in section for section in breakdown],
+                    )
+                self.assertFalse(dropped[section_count:].any())
+
+    def test_assignment_format_grader_without_sections(self):
+        batch_result = self.homework_grader.grade_batch({}, 2)
+        self.assertEqual(list(batch_result['percent']), [0.0, 0.0])
+        self.assertEqual(list(batch_result['section_counts']), [6, 6])
+
+    def test_weighted_subsections_grader(self):
+        batch_result = self.weighted_grader.grade_batch(self.score_matrices, 3)
+        for learner in range(3):
+            result = self.weighted_grader.grade(self._grade_sheet(learner))
+            self.assertEqual(batch_result['percent'][learner], result['percent'])
+            for category, breakdown in result['grade_breakdown'].iteritems():
+                self.assertEqual(batch_result['grade_breakdown'][category][learner], breakdown['percent'])
+
+    def test_grade_batch(self):
+        batch_result = graders.grade_batch(self.weighted_grader, self.score_matrices, 3, self.grade_cutoffs)
+        self.assertEqual(list(batch_result['letter_grade']), ['B', None, 'A'])
+        self.assertEqual(list(batch_result['passed']), [True, False, True])
+        for learner in range(3):
+            result = self.weighted_grader.grade(self._grade_sheet(learner))
+            self.assertEqual(batch_result['percent'][learner], round(result['percent'] * 100 + 0.05) / 100)
+
+    def test_grade_batch_rounds_half_up(self):
+        grader = graders.WeightedSubsectionsGrader([(self.midterm_grader, self.midterm_grader.category, 1.0)])
+        # These percentages are exactly halfway between two rounded values, once 0.05 is added.
+        score_matrices = {'Midterm': (numpy.array([[1.45], [2.45], [4.45]]), numpy.array([[100.0]] * 3))}
+        batch_result = graders.grade_batch(grader, score_matrices, 3, {})
+        self.assertEqual(list(batch_result['percent']), [0.02, 0.03, 0.05])
+        self.assertEqual(list(batch_result['letter_grade']), [None, None, None])
+        self.assertEqual(list(batch_result['passed']), [False, False, False])
+
+
 @ddt.ddt
 class ShowCorrectnessTest(unittest.TestCase):
     """
@@ -584,26 +584,26 @@ class VideoTranscriptsMixin(object):
             return translations
 
         # If we've gotten this far, we're going to verify that the transcripts
-        # being referenced are actually in the contentstore.
-        if sub:  # check if sjson exists for 'en'.
+        # being referenced are actually in the contentstore. The names of the
+        # course's assets are fetched at once, rather than one asset at a time.
+        asset_names = contentstore().get_asset_names_for_course(self.location.course_key)
+
+        def transcript_exists(filename):
+            """
+            Returns whether a transcript with the given filename is in the contentstore.
+            """
             try:
-                Transcript.asset(self.location, sub, 'en')
-            except NotFoundError:
-                try:
-                    Transcript.asset(self.location, None, None, sub)
-                except NotFoundError:
-                    pass
-                else:
-                    translations += ['en']
-            else:
+                return Transcript.asset_location(self.location, filename).name in asset_names
+            except TranscriptException:
+                return False
+
+        if sub:  # check if sjson exists for 'en'.
+            if transcript_exists(subs_filename(sub, 'en')) or transcript_exists(sub):
                 translations += ['en']
 
         for lang in other_langs:
-            try:
-                Transcript.asset(self.location, None, None, other_langs[lang])
-            except NotFoundError:
-                continue
-            translations += [lang]
+            if transcript_exists(other_langs[lang]):
+                translations += [lang]
 
         return translations
 
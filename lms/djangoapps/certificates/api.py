@@ -25,6 +25,7 @@ from certificates.models import (
 )
 from certificates.queue import XQueueCertInterface
 from eventtracking import tracker
+from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
 from util.organizations_helpers import get_course_organizations
@@ -158,6 +159,58 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
         generate_pdf=generate_pdf,
         forced_grade=forced_grade
     )
+    return _certificate_created(student, course_key, course, cert, generation_mode)
+
+
+def generate_certificates_for_users(students, course_key, course=None, insecure=False, generation_mode='batch'):
+    """
+    Add the add-cert requests of several students into the xqueue, and
+    yield a (student, status) tuple for each of them.
+
+    This is equivalent to calling `generate_user_certificates` for each
+    student, but the course grades of the students are computed against
+    a single collected course structure, the whitelist and restrictions
+    of the students are looked up in bulk, and the requests share a single
+    connection to the xqueue.
+
+    Args:
+        students (list of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        course (Course): Optionally provide the course object; if not provided
+            it will be loaded.
+        insecure - (Boolean)
+        generation_mode - who has requested certificate generation.
+    """
+    students = list(students)
+    if course is None:
+        course = modulestore().get_course(course_key, depth=0)
+
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    xqueue.prefetch_users(course_key, students)
+    generate_pdf = not has_html_certificates_enabled(course_key, course)
+
+    for student, course_grade, __ in CourseGradeFactory().iter(students, course=course):
+        # Students that could not be graded here are graded again, and
+        # reported, by add_cert.
+        cert = xqueue.add_cert(
+            student,
+            course_key,
+            course=course,
+            generate_pdf=generate_pdf,
+            course_grade=course_grade,
+        )
+        yield student, _certificate_created(student, course_key, course, cert, generation_mode)
+
+
+def _certificate_created(student, course_key, course, cert, generation_mode):
+    """
+    Emit the `edx.certificate.created` event for the certificate returned
+    by add_cert if it is passing, and return the status of the certificate.
+    """
     # If cert_status is not present in certificate valid_statuses (for example unverified) then
     # add_cert returns None and raises AttributeError while accesing cert attributes.
     if cert is None:
@@ -103,6 +103,44 @@ class XQueueCertInterface(object):
         self.whitelist = CertificateWhitelist.objects.all()
         self.restricted = UserProfile.objects.filter(allow_certificate=False)
         self.use_https = True
+        self._prefetched_course_id = None
+        self._prefetched_user_ids = set()
+        self._whitelisted_user_ids = set()
+        self._restricted_user_ids = set()
+
+    def prefetch_users(self, course_id, students):
+        """
+        Look up whether the given students are whitelisted in the course
+        or restricted with one query each, for later certificate requests
+        for these students in the course.
+        """
+        user_ids = set(student.id for student in students)
+        self._prefetched_course_id = course_id
+        self._prefetched_user_ids = user_ids
+        self._whitelisted_user_ids = set(
+            self.whitelist.filter(user_id__in=user_ids, course_id=course_id, whitelist=True).values_list(
+                'user_id', flat=True
+            )
+        )
+        self._restricted_user_ids = set(
+            self.restricted.filter(user_id__in=user_ids).values_list('user_id', flat=True)
+        )
+
+    def _is_whitelisted(self, student, course_id):
+        """
+        Return whether the student is whitelisted for a certificate in the course.
+        """
+        if course_id == self._prefetched_course_id and student.id in self._prefetched_user_ids:
+            return student.id in self._whitelisted_user_ids
+        return self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
+
+    def _is_restricted(self, student, course_id):
+        """
+        Return whether the student is restricted from receiving certificates.
+        """
+        if course_id == self._prefetched_course_id and student.id in self._prefetched_user_ids:
+            return student.id in self._restricted_user_ids
+        return self.restricted.filter(user=student).exists()
 
     def regen_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
         """(Re-)Make certificate for a particular student in a particular course
@@ -181,7 +219,8 @@ class XQueueCertInterface(object):
         raise NotImplementedError
 
     # pylint: disable=too-many-statements
-    def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
+    def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True,
+                 course_grade=None):
         """
         Request a new certificate for a student.
 
@@ -192,6 +231,8 @@ class XQueueCertInterface(object):
                          the certificate request. If this is given, grading
                          will be skipped.
           generate_pdf - Boolean should a message be sent in queue to generate certificate PDF
+          course_grade - the CourseGrade of the student, if it was already
+                         computed.
 
         Will change the certificate status to 'generating' or
         `downloadable` in case of web view certificates.
@@ -267,8 +308,9 @@ class XQueueCertInterface(object):
         self.request.user = student
         self.request.session = {}
 
-        is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
-        course_grade = CourseGradeFactory().create(student, course)
+        is_whitelisted = self._is_whitelisted(student, course_id)
+        if course_grade is None:
+            course_grade = CourseGradeFactory().create(student, course)
         enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
         mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
@@ -383,7 +425,7 @@ class XQueueCertInterface(object):
         # Check to see whether the student is on the the embargoed
         # country restricted list. If so, they should not receive a
         # certificate -- set their status to restricted and log it.
-        if self.restricted.filter(user=student).exists():
+        if self._is_restricted(student, course_id):
             cert.status = status.restricted
             cert.save()
 
@@ -533,6 +533,32 @@ class GenerateUserCertificatesTest(EventTestMixin, WebCertificateTestMixin, Modu
                 status = certs_api.generate_user_certificates(self.student, self.course.id)
                 self.assertEqual(status, None)
 
+    def test_generate_certificates_for_users(self):
+        other_student = UserFactory.create()
+        CourseEnrollment.enroll(other_student, self.course.id, mode='honor')
+        students = [self.student, other_student]
+
+        with mock_passing_grade():
+            with self._mock_queue():
+                statuses = dict(certs_api.generate_certificates_for_users(students, self.course.id))
+
+        self.assertEqual(
+            statuses,
+            {student: CertificateStatuses.generating for student in students}
+        )
+        for student in students:
+            cert = GeneratedCertificate.eligible_certificates.get(user=student, course_id=self.course.id)
+            self.assertEqual(cert.status, CertificateStatuses.generating)
+            self.assert_event_emitted(
+                'edx.certificate.created',
+                user_id=student.id,
+                course_id=unicode(self.course.id),
+                certificate_url=certs_api.get_certificate_url(student.id, self.course.id),
+                certificate_id=cert.verify_uuid,
+                enrollment_mode=cert.mode,
+                generation_mode='batch'
+            )
+
     @patch.dict(settings.FEATURES, {'CERTIFICATES_HTML_VIEW': True})
     def test_new_cert_requests_returns_generating_for_html_certificate(self):
         """
@@ -74,7 +74,7 @@ def collect_merged_boolean_field(
     hierarchy chain.
     """
 
-    for block_key in block_structure.topological_traversal():
+    for block_key in block_structure.collect_traversal():
         # compute merged value of the boolean field from all parents
         parents = block_structure.get_parents(block_key)
         all_parents_merged_value = all(  # pylint: disable=invalid-name
@@ -116,7 +116,7 @@ def collect_merged_date_field(
     block_structure.
     """
 
-    for block_key in block_structure.topological_traversal():
+    for block_key in block_structure.collect_traversal():
 
         parents = block_structure.get_parents(block_key)
         block_date = get_field_on_block(block_structure.get_xblock(block_key), xblock_field_name)
@@ -27,11 +27,12 @@ from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
 
 from contracts import contract, new_contract
+from django.conf import settings
 from django.db import DatabaseError
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import CourseKey, UsageKey
-from xblock.core import XBlockAside
+from xblock.core import XBlock, XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
 from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
@@ -51,37 +52,52 @@ class InvalidWriteError(Exception):
     """
 
 
-def _all_usage_keys(descriptors, aside_types):
+def _all_usage_keys(usage_keys, aside_types):
     """
-    Return a set of all usage_ids for the `descriptors` and for
-    as all asides in `aside_types` for those descriptors.
+    Return a set of all usage_ids for the `usage_keys` and for
+    as all asides in `aside_types` for those blocks.
     """
     usage_ids = set()
-    for descriptor in descriptors:
-        usage_ids.add(descriptor.scope_ids.usage_id)
+    for usage_key in usage_keys:
+        usage_ids.add(usage_key)
 
         for aside_type in aside_types:
-            usage_ids.add(AsideUsageKeyV1(descriptor.scope_ids.usage_id, aside_type))
-            usage_ids.add(AsideUsageKeyV2(descriptor.scope_ids.usage_id, aside_type))
+            usage_ids.add(AsideUsageKeyV1(usage_key, aside_type))
+            usage_ids.add(AsideUsageKeyV2(usage_key, aside_type))
 
     return usage_ids
 
 
-def _all_block_types(descriptors, aside_types):
+def _all_block_types(block_types, aside_types):
     """
-    Return a set of all block_types for the supplied `descriptors` and for
-    the asides types in `aside_types` associated with those descriptors.
+    Return a set of all block_types for the supplied `block_types` and for
+    the asides types in `aside_types` associated with those blocks.
     """
-    block_types = set()
-    for descriptor in descriptors:
-        block_types.add(BlockTypeKeyV1(descriptor.entry_point, descriptor.scope_ids.block_type))
-
+    block_types = set(block_types)
     for aside_type in aside_types:
         block_types.add(BlockTypeKeyV1(XBlockAside.entry_point, aside_type))
 
     return block_types
 
 
+def _xblock_class(block_type, course_key):
+    """
+    Return the XBlock class used by the LMS for blocks of type `block_type`
+    in the course `course_key`, with the same mixins as the blocks loaded
+    from the modulestore.  Like the runtime of the modulestore, fall back to
+    its default class for block types that are not installed.
+    """
+    store = modulestore()
+    default_class = getattr(
+        store._get_modulestore_for_courselike(course_key),  # pylint: disable=protected-access
+        'default_class',
+        None,
+    )
+    return store.mixologist.mix(
+        XBlock.load_class(block_type, default_class, select=settings.XBLOCK_SELECT_FUNCTION)
+    )
+
+
 class DjangoKeyValueStore(KeyValueStore):
     """
     This KeyValueStore will read and write data in the following scopes to django models
@@ -162,17 +178,18 @@ class DjangoOrmFieldCache(object):
     def __init__(self):
         self._cache = {}
 
-    def cache_fields(self, fields, xblocks, aside_types):
+    def cache_fields(self, fields, usage_keys, block_types, aside_types):
         """
-        Load all fields specified by ``fields`` for the supplied ``xblocks``
-        and ``aside_types`` into this cache.
+        Load all fields specified by ``fields`` for the blocks identified by
+        ``usage_keys`` and ``block_types``, and ``aside_types``, into this cache.
 
         Arguments:
             fields (list of str): Field names to cache.
-            xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
+            usage_keys (set of :class:`UsageKey`): Blocks to cache fields for.
+            block_types (set of :class:`BlockTypeKeyV1`): Types of those blocks.
             aside_types (list of str): Aside types to cache fields for.
         """
-        for field_object in self._read_objects(fields, xblocks, aside_types):
+        for field_object in self._read_objects(fields, usage_keys, block_types, aside_types):
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
@@ -306,17 +323,18 @@ class DjangoOrmFieldCache(object):
         raise NotImplementedError()
 
     @abstractmethod
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, usage_keys, block_types, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
+        for the ``fields`` on the blocks and the ``aside_types`` associated
         with them.
 
         Arguments:
             fields (list of str): Field names to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            usage_keys (set of :class:`UsageKey`): Blocks to load fields for
+            block_types (set of :class:`BlockTypeKeyV1`): Types of those blocks
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         raise NotImplementedError()
 
@@ -351,19 +369,20 @@ class UserStateCache(object):
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
 
-    def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
+    def cache_fields(self, fields, usage_keys, block_types, aside_types):  # pylint: disable=unused-argument
         """
-        Load all fields specified by ``fields`` for the supplied ``xblocks``
-        and ``aside_types`` into this cache.
+        Load all fields specified by ``fields`` for the blocks identified by
+        ``usage_keys`` and ``block_types``, and ``aside_types``, into this cache.
 
         Arguments:
             fields (list of str): Field names to cache.
-            xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
+            usage_keys (set of :class:`UsageKey`): Blocks to cache fields for.
+            block_types (set of :class:`BlockTypeKeyV1`): Types of those blocks.
             aside_types (list of str): Aside types to cache fields for.
         """
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            _all_usage_keys(usage_keys, aside_types),
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
@@ -517,21 +536,22 @@ class UserStateSummaryCache(DjangoOrmFieldCache):
             value=value,
         )
 
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, usage_keys, block_types, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
+        for the ``fields`` on the blocks and the ``aside_types`` associated
         with them.
 
         Arguments:
             fields (list of :class:`~Field`): Fields to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            usage_keys (set of :class:`UsageKey`): Blocks to load fields for
+            block_types (set of :class:`BlockTypeKeyV1`): Types of those blocks
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         return XModuleUserStateSummaryField.objects.chunked_filter(
             'usage_id__in',
-            _all_usage_keys(xblocks, aside_types),
+            _all_usage_keys(usage_keys, aside_types),
             field_name__in=set(field.name for field in fields),
         )
 
@@ -579,21 +599,22 @@ class PreferencesCache(DjangoOrmFieldCache):
             value=value,
         )
 
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, usage_keys, block_types, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
+        for the ``fields`` on the blocks and the ``aside_types`` associated
         with them.
 
         Arguments:
             fields (list of str): Field names to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            usage_keys (set of :class:`UsageKey`): Blocks to load fields for
+            block_types (set of :class:`BlockTypeKeyV1`): Types of those blocks
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         return XModuleStudentPrefsField.objects.chunked_filter(
             'module_type__in',
-            _all_block_types(xblocks, aside_types),
+            _all_block_types(block_types, aside_types),
             student=self.user.pk,
             field_name__in=set(field.name for field in fields),
         )
@@ -641,17 +662,18 @@ class UserInfoCache(DjangoOrmFieldCache):
             value=value,
         )
 
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, usage_keys, block_types, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
+        for the ``fields`` on the blocks and the ``aside_types`` associated
         with them.
 
         Arguments:
             fields (list of str): Field names to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            usage_keys (set of :class:`UsageKey`): Blocks to load fields for
+            block_types (set of :class:`BlockTypeKeyV1`): Types of those blocks
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         return XModuleStudentInfoField.objects.filter(
             student=self.user.pk,
@@ -730,11 +752,60 @@ class FieldDataCache(object):
         """
         if self.user.is_authenticated():
             self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
-            for scope, fields in self._fields_to_cache(descriptors).items():
-                if scope not in self.cache:
-                    continue
+            self._cache_fields(
+                self._fields_to_cache(descriptors),
+                set(descriptor.scope_ids.usage_id for descriptor in descriptors),
+                set(
+                    BlockTypeKeyV1(descriptor.entry_point, descriptor.scope_ids.block_type)
+                    for descriptor in descriptors
+                ),
+            )
+
+    def add_blocks_to_cache(self, usage_keys, block_structure=None):
+        """
+        Add the blocks identified by `usage_keys` to this FieldDataCache,
+        without loading their descriptors from the modulestore.
+
+        The fields to cache are found on the XBlock classes of the blocks,
+        so the data of all the blocks is loaded with one query per scope.
+
+        Arguments:
+            usage_keys: The usage keys of the blocks to cache field data for
+            block_structure: An optional BlockStructureBlockData containing the
+                blocks, from which the collected `has_score` values of the
+                blocks are read
+        """
+        if not self.user.is_authenticated():
+            return
+
+        usage_keys = set(usage_keys)
+        xblock_classes = {block_type: _xblock_class(block_type, self.course_id) for block_type in set(
+            usage_key.block_type for usage_key in usage_keys
+        )}
+        if block_structure is not None:
+            self.scorable_locations.update(
+                usage_key for usage_key in usage_keys
+                if block_structure.get_xblock_field(usage_key, 'has_score', False)
+            )
+        self._cache_fields(
+            self._fields_to_cache(xblock_classes.values()),
+            usage_keys,
+            set(
+                BlockTypeKeyV1(xblock_class.entry_point, block_type)
+                for block_type, xblock_class in xblock_classes.iteritems()
+            ),
+        )
 
-                self.cache[scope].cache_fields(fields, descriptors, self.asides)
+    def _cache_fields(self, fields_by_scope, usage_keys, block_types):
+        """
+        Load the fields in `fields_by_scope` of the blocks identified by
+        `usage_keys` and `block_types` into the caches of their scopes.
+        """
+        for scope, fields in fields_by_scope.items():
+            if scope not in self.cache:
+                continue
+
+            self.cache[scope].cache_fields(fields, usage_keys, block_types, self.asides)
 
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
@@ -793,9 +864,33 @@ class FieldDataCache(object):
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
+    @classmethod
+    def cache_for_block_structure(cls, course_id, user, block_structure, root_usage_key=None,
+                                  asides=None, read_only=False):
+        """
+        course_id: the course in the context of which we want StudentModules.
+        user: the django user for whom to load modules.
+        block_structure: A BlockStructureBlockData of the course, such as the
+            one returned by course_blocks.api.get_course_blocks
+        root_usage_key: The usage key of the block, such as a chapter or a
+            sequence, whose descendants should be cached. If None, the whole
+            block structure is cached.
+
+        Unlike cache_for_descriptor_descendents, no descriptors are loaded, and
+        the modules required by the cached blocks are not cached.
+        """
+        cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
+        cache.add_blocks_to_cache(
+            block_structure.topological_traversal(start_node=root_usage_key),
+            block_structure,
+        )
+        return cache
+
     def _fields_to_cache(self, descriptors):
         """
         Returns a map of scopes to fields in that scope that should be cached
+
+        `descriptors` may be XBlocks or XBlock classes.
         """
         scope_map = defaultdict(set)
         for descriptor in descriptors:
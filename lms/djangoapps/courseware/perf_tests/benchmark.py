@@ -0,0 +1,92 @@
+"""
+Records the duration, database queries and memory use of benchmarked operations.
+"""
+import json
+import platform
+import resource
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pymongo
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from mock import Mock, patch
+
+
+class BenchmarkRecorder(object):
+    """
+    Measures operations and writes their measurements to a JSON report.
+
+    Example:
+        recorder = BenchmarkRecorder()
+        with recorder.measure('get_course_blocks', course_size='large'):
+            get_course_blocks(user, course.location)
+        recorder.write_report('benchmarks.json')
+    """
+
+    def __init__(self):
+        self.results = []
+
+    @contextmanager
+    def measure(self, operation, **parameters):
+        """
+        Measures the operation run within the context, and records it with the given parameters.
+        """
+        mongo_calls = {
+            method: Mock(wraps=getattr(pymongo.message, method))
+            for method in ('query', 'get_more')
+        }
+        with patch.multiple(pymongo.message, **mongo_calls):
+            with _capture_sql_queries() as sql_query_contexts:
+                start_max_rss = _max_rss_kb()
+                start_time = time.time()
+                yield
+                duration = time.time() - start_time
+                end_max_rss = _max_rss_kb()
+
+        result = {
+            'operation': operation,
+            'seconds': round(duration, 6),
+            'sql_queries': sum(len(context) for context in sql_query_contexts),
+            'mongo_queries': sum(mock_call.call_count for mock_call in mongo_calls.values()),
+            'max_rss_kb': end_max_rss,
+            'max_rss_increase_kb': end_max_rss - start_max_rss,
+        }
+        result.update(parameters)
+        self.results.append(result)
+
+    def write_report(self, path):
+        """
+        Writes the recorded measurements to the JSON file at the given path.
+        """
+        report = {
+            'created': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'results': self.results,
+        }
+        with open(path, 'w') as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+
+
+@contextmanager
+def _capture_sql_queries():
+    """
+    Captures the SQL queries run on all the database connections, and yields
+    the CaptureQueriesContext of each connection.
+    """
+    contexts = [CaptureQueriesContext(connections[alias]) for alias in connections]
+    for context in contexts:
+        context.__enter__()
+    try:
+        yield contexts
+    finally:
+        for context in reversed(contexts):
+            context.__exit__(None, None, None)
+
+
+def _max_rss_kb():
+    """
+    Returns the peak resident memory of the process, in kilobytes on Linux.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
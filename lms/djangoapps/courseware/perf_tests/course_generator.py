@@ -0,0 +1,164 @@
+"""
+Generates synthetic courses of a configurable size, for benchmarks.
+"""
+from collections import namedtuple
+
+from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.partitions.partitions import Group, UserPartition
+
+# Number of children of each type created under each parent:
+#   chapters per course, sequentials per chapter, verticals per sequential,
+#   problems per vertical, and split_test and library_content blocks per sequential.
+CourseSize = namedtuple(
+    'CourseSize',
+    ['chapters', 'sequentials', 'verticals', 'problems', 'split_tests', 'library_contents']
+)
+
+COURSE_SIZES = {
+    'small': CourseSize(chapters=2, sequentials=2, verticals=2, problems=2, split_tests=1, library_contents=1),
+    'medium': CourseSize(chapters=5, sequentials=4, verticals=4, problems=3, split_tests=1, library_contents=1),
+    'large': CourseSize(chapters=10, sequentials=8, verticals=5, problems=4, split_tests=2, library_contents=2),
+}
+
+# Number of blocks picked for each learner by library_content blocks.
+LIBRARY_CONTENT_MAX_COUNT = 2
+
+SPLIT_TEST_PARTITION = UserPartition(
+    0,
+    'benchmark_partition',
+    'Partition used by the split_test blocks of benchmark courses',
+    [
+        Group(0, 'alpha'),
+        Group(1, 'beta'),
+    ],
+    scheme_id='random',
+)
+
+
+def parse_course_size(value):
+    """
+    Returns the CourseSize for the given name, or for a comma-separated list
+    of the number of chapters, sequentials, verticals, problems, split_tests
+    and library_contents, e.g. "10,8,5,4,2,2".
+    """
+    if value in COURSE_SIZES:
+        return COURSE_SIZES[value]
+    return CourseSize(*[int(count) for count in value.split(',')])
+
+
+def generate_course(store, size, user_id, org='benchmark', number='course', run='run'):
+    """
+    Creates a published course of the given size in the given modulestore,
+    and returns it.
+
+    Every sequential is graded. Every vertical contains problems, and the
+    first verticals of each sequential contain a split_test or a
+    library_content block, each of which contains problems.
+
+    Arguments:
+        store (ModuleStore): the modulestore in which to create the course
+        size (CourseSize): the number of blocks to create
+        user_id (int): id of the user creating the course
+    """
+    course = CourseFactory.create(
+        modulestore=store,
+        org=org,
+        number=number,
+        run=run,
+        user_partitions=[SPLIT_TEST_PARTITION],
+    )
+    with store.bulk_operations(course.id):
+        for chapter_index in range(size.chapters):
+            chapter = _create_item(store, user_id, course, 'chapter', 'Chapter {}'.format(chapter_index))
+            for sequential_index in range(size.sequentials):
+                sequential = _create_item(
+                    store, user_id, chapter, 'sequential', 'Sequential {}'.format(sequential_index),
+                    graded=True, format='Homework',
+                )
+                for vertical_index in range(size.verticals):
+                    vertical = _create_item(
+                        store, user_id, sequential, 'vertical', 'Vertical {}'.format(vertical_index)
+                    )
+                    _create_problems(store, user_id, vertical, size.problems)
+                    if vertical_index < size.split_tests:
+                        _create_split_test(store, user_id, vertical, size.problems)
+                    if vertical_index < size.library_contents:
+                        _create_library_content(store, user_id, vertical, size.problems)
+        store.publish(course.location, user_id)
+    return store.get_course(course.id, depth=None)
+
+
+def count_blocks(size):
+    """
+    Returns the number of blocks of a course of the given size, excluding the course itself.
+    """
+    verticals = size.chapters * size.sequentials * size.verticals
+    split_tests = size.chapters * size.sequentials * min(size.split_tests, size.verticals)
+    library_contents = size.chapters * size.sequentials * min(size.library_contents, size.verticals)
+    group_verticals = split_tests * len(SPLIT_TEST_PARTITION.groups)
+    return (
+        size.chapters +
+        size.chapters * size.sequentials +
+        verticals + split_tests + library_contents + group_verticals +
+        (verticals + group_verticals + library_contents) * size.problems
+    )
+
+
+def _create_item(store, user_id, parent, category, display_name, **kwargs):
+    """
+    Creates a block of the given category under the given parent.
+    """
+    return ItemFactory.create(
+        modulestore=store,
+        user_id=user_id,
+        parent_location=parent.location,
+        category=category,
+        display_name=display_name,
+        publish_item=False,
+        **kwargs
+    )
+
+
+def _create_problems(store, user_id, parent, count):
+    """
+    Creates the given number of multiple choice problems under the given parent.
+    """
+    for problem_index in range(count):
+        _create_item(
+            store, user_id, parent, 'problem', 'Problem {}'.format(problem_index),
+            data=MultipleChoiceResponseXMLFactory().build_xml(
+                question_text='The correct answer is Choice 2',
+                choices=[False, False, True, False],
+                choice_names=['choice_0', 'choice_1', 'choice_2', 'choice_3'],
+            ),
+        )
+
+
+def _create_split_test(store, user_id, parent, problem_count):
+    """
+    Creates a split_test block with a vertical of problems for each group of SPLIT_TEST_PARTITION.
+    """
+    split_test = _create_item(
+        store, user_id, parent, 'split_test', 'Split test', user_partition_id=SPLIT_TEST_PARTITION.id,
+    )
+    group_id_to_child = {}
+    for group in SPLIT_TEST_PARTITION.groups:
+        group_vertical = _create_item(store, user_id, split_test, 'vertical', 'Group {}'.format(group.name))
+        _create_problems(store, user_id, group_vertical, problem_count)
+        group_id_to_child[unicode(group.id)] = group_vertical.location
+    split_test.group_id_to_child = group_id_to_child
+    store.update_item(split_test, user_id)
+
+
+def _create_library_content(store, user_id, parent, problem_count):
+    """
+    Creates a library_content block picking LIBRARY_CONTENT_MAX_COUNT of its problems.
+
+    The problems are created as children of the block, as they would be once
+    copied from a library, so that no content library needs to be created.
+    """
+    library_content = _create_item(
+        store, user_id, parent, 'library_content', 'Library content', max_count=LIBRARY_CONTENT_MAX_COUNT,
+    )
+    _create_problems(store, user_id, library_content, problem_count)
@@ -0,0 +1,113 @@
+"""
+Benchmarks of courseware, grading and block transformers on synthetic courses.
+
+The benchmarks are skipped unless the COURSEWARE_BENCHMARK_REPORT environment
+variable is set to the path of the JSON report to write, e.g.:
+
+    COURSEWARE_BENCHMARK_REPORT=reports/courseware_benchmarks.json \
+    COURSEWARE_BENCHMARK_SIZES="medium;10,8,5,4,2,2" \
+    paver test_system -s lms -t lms/djangoapps/courseware/perf_tests
+
+COURSEWARE_BENCHMARK_SIZES is a semicolon-separated list of course sizes,
+either names from COURSE_SIZES or the comma-separated number of chapters,
+sequentials, verticals, problems, split_tests and library_contents.
+
+Each measurement of the report records the operation, the modulestore and
+course size, its duration in seconds, the number of SQL and mongo queries
+it ran, and the peak memory of the process.
+"""
+import os
+from unittest import skipUnless
+
+import ddt
+from django.test.client import RequestFactory
+
+from course_api.blocks.api import get_blocks
+from courseware.model_data import FieldDataCache
+from courseware.module_render import toc_for_course
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
+from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+
+from .benchmark import BenchmarkRecorder
+from .course_generator import count_blocks, generate_course, parse_course_size
+
+REPORT_PATH = os.environ.get('COURSEWARE_BENCHMARK_REPORT')
+COURSE_SIZE_NAMES = os.environ.get('COURSEWARE_BENCHMARK_SIZES', 'small;medium').split(';')
+
+# Number of learners whose grades are computed by CourseGradeFactory.iter.
+STUDENT_COUNT = 10
+
+
+@skipUnless(REPORT_PATH, 'Set COURSEWARE_BENCHMARK_REPORT to run the courseware benchmarks.')
+@ddt.ddt
+class CoursewareBenchmarks(ModuleStoreTestCase):
+    """
+    Measures the main courseware operations on courses of increasing size.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    recorder = BenchmarkRecorder()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(CoursewareBenchmarks, cls).tearDownClass()
+        if cls.recorder.results:
+            cls.recorder.write_report(REPORT_PATH)
+
+    def setUp(self):
+        super(CoursewareBenchmarks, self).setUp()
+        self.students = [UserFactory.create() for __ in range(STUDENT_COUNT)]
+        self.student = self.students[0]
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_courseware_benchmarks(self, store_type):
+        for index, size_name in enumerate(COURSE_SIZE_NAMES):
+            size = parse_course_size(size_name)
+            with self.store.default_store(store_type):
+                course = generate_course(self.store, size, self.user.id, run='run{}'.format(index))
+            for student in self.students:
+                CourseEnrollmentFactory.create(user=student, course_id=course.id)
+            self._run_benchmarks(course, store=store_type, course_size=size_name, blocks=count_blocks(size))
+
+    def _run_benchmarks(self, course, **parameters):
+        """
+        Measures each operation on the given course, recording the given parameters with the measurements.
+        """
+        measure = self.recorder.measure
+
+        clear_course_from_cache(course.id)
+        with measure('get_course_blocks.collect', **parameters):
+            get_course_blocks(self.student, course.location)
+        with measure('get_course_blocks', **parameters):
+            get_course_blocks(self.student, course.location)
+
+        with measure('CourseGradeFactory.create', **parameters):
+            CourseGradeFactory().create(self.student, course)
+        with measure('CourseGradeFactory.iter', students=len(self.students), **parameters):
+            for __ in CourseGradeFactory().iter(self.students, course):
+                pass
+
+        toc_course = self.store.get_course(course.id, depth=2)
+        with measure('FieldDataCache.cache_for_descriptor_descendents', **parameters):
+            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                course.id, self.student, toc_course, depth=2,
+            )
+        with measure('toc_for_course', **parameters):
+            toc_for_course(self.student, self.request, toc_course, None, None, field_data_cache)
+
+        with measure('course_blocks_api', **parameters):
+            get_blocks(
+                self.request,
+                course.location,
+                self.student,
+                depth=None,
+                requested_fields=['children', 'display_name', 'type', 'graded', 'format', 'student_view_url'],
+                block_counts=['problem'],
+            )
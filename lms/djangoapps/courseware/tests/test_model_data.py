@@ -4,8 +4,9 @@ Test for lms courseware app, module data (runtime data storage for XBlocks)
 import json
 from functools import partial
 
-from django.db import DatabaseError
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from xblock.core import XBlock
@@ -13,6 +14,7 @@ from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.course_blocks.api import get_course_blocks
 from courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -28,6 +30,8 @@ from courseware.tests.factories import (
     location
 )
 from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 
 def mock_field(scope, name):
@@ -434,3 +438,61 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+@attr(shard=1)
+class TestFieldDataCacheForBlockStructure(SharedModuleStoreTestCase):
+    """Tests for FieldDataCache.cache_for_block_structure"""
+    @classmethod
+    def setUpClass(cls):
+        super(TestFieldDataCacheForBlockStructure, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        cls.chapter = ItemFactory.create(parent=cls.course, category='chapter')
+        cls.sequences = [ItemFactory.create(parent=cls.chapter, category='sequential') for __ in range(2)]
+        cls.problems = [
+            ItemFactory.create(parent=sequence, category='problem')
+            for sequence in cls.sequences
+            for __ in range(3)
+        ]
+
+    def setUp(self):
+        super(TestFieldDataCacheForBlockStructure, self).setUp()
+        self.user = UserFactory.create()
+        for problem in self.problems:
+            cmfStudentModuleFactory.create(
+                student=self.user,
+                course_id=self.course.id,
+                module_state_key=problem.location,
+                state=json.dumps({'attempts': 1}),
+            )
+        self.block_structure = get_course_blocks(self.user, self.course.location)
+
+    def _has_state(self, field_data_cache, problem):
+        """Return whether the user state of the problem is cached"""
+        return field_data_cache.has(
+            DjangoKeyValueStore.Key(Scope.user_state, self.user.id, problem.location, 'attempts')
+        )
+
+    def test_cache_sequence(self):
+        with CaptureQueriesContext(connection) as queries:
+            field_data_cache = FieldDataCache.cache_for_block_structure(
+                self.course.id, self.user, self.block_structure, self.sequences[0].location,
+            )
+        # At most one query per scope.
+        self.assertLessEqual(len(queries), 4)
+        self.assertEqual(
+            [self._has_state(field_data_cache, problem) for problem in self.problems],
+            [True, True, True, False, False, False],
+        )
+
+    def test_cache_course(self):
+        field_data_cache = FieldDataCache.cache_for_block_structure(self.course.id, self.user, self.block_structure)
+        self.assertTrue(all(self._has_state(field_data_cache, problem) for problem in self.problems))
+
+    def test_block_type_not_installed(self):
+        field_data_cache = FieldDataCache([], self.course.id, self.user)
+        field_data_cache.add_blocks_to_cache([
+            self.problems[0].location,
+            self.course.id.make_usage_key('not_installed', 'block'),
+        ])
+        self.assertTrue(self._has_state(field_data_cache, self.problems[0]))
@@ -37,7 +37,7 @@ from django.test.utils import override_settings
 from freezegun import freeze_time
 from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=import-error
 from lms.djangoapps.grades.config.waffle import waffle as grades_waffle
-from lms.djangoapps.grades.config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT
+from lms.djangoapps.grades.config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, PROGRESS_PAGE_FROM_PERSISTED_GRADES
 from milestones.tests.utils import MilestonesTestCaseMixin
 from mock import MagicMock, PropertyMock, create_autospec, patch
 from nose.plugins.attrib import attr
@@ -1448,6 +1448,17 @@ class ProgressPageTests(ProgressPageBaseTests):
         with self.assertNumQueries(42, table_blacklist=QUERY_COUNT_TABLE_BLACKLIST), check_mongo_calls(1):
             self._get_progress_page()
 
+    @patch('lms.djangoapps.grades.tasks.recalculate_course_grade.apply_async')
+    def test_progress_from_persisted_grades(self, mock_recalculate):
+        self.setup_course()
+        with grades_waffle().override(PROGRESS_PAGE_FROM_PERSISTED_GRADES, active=True):
+            with patch(
+                'lms.djangoapps.grades.new.course_grade_factory.CourseGradeFactory.create'
+            ) as mock_create:
+                self._get_progress_page()
+        self.assertFalse(mock_create.called)
+        self.assertTrue(mock_recalculate.called)
+
     @ddt.data(
         (False, 42, 28),
         (True, 35, 24)
@@ -62,6 +62,8 @@ from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.utils import prep_course_for_grading
 from lms.djangoapps.courseware.exceptions import CourseAccessRedirect, Redirect
 from lms.djangoapps.experiments.utils import get_experiment_user_metadata_context
+from lms.djangoapps.grades.config.waffle import PROGRESS_PAGE_FROM_PERSISTED_GRADES
+from lms.djangoapps.grades.config.waffle import waffle as grades_waffle
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.instructor.enrollment import uses_shib
 from lms.djangoapps.instructor.views.api import require_global_staff
@@ -862,7 +864,11 @@ def _progress(request, course_key, student_id):
     # NOTE: To make sure impersonation by instructor works, use
     # student instead of request.user in the rest of the function.
 
-    course_grade = CourseGradeFactory().create(student, course)
+    if grades_waffle().is_enabled(PROGRESS_PAGE_FROM_PERSISTED_GRADES):
+        # Missing or stale grades are recomputed asynchronously rather than on this request.
+        course_grade = CourseGradeFactory().read_persisted(student, course)
+    else:
+        course_grade = CourseGradeFactory().create(student, course)
     courseware_summary = course_grade.chapter_grades.values()
     grade_summary = course_grade.summary
 
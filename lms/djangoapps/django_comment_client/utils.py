@@ -837,7 +837,7 @@ def get_group_id_for_user(user, course_discussion_settings):
     """
     division_scheme = _get_course_division_scheme(course_discussion_settings)
     if division_scheme == CourseDiscussionSettings.COHORT:
-        return get_cohort_id(user, course_discussion_settings.course_id)
+        return get_cohort_id(user, course_discussion_settings.course_id, use_cached=True)
     elif division_scheme == CourseDiscussionSettings.ENROLLMENT_TRACK:
         partition_service = PartitionService(course_discussion_settings.course_id)
         group_id = partition_service.get_user_group_id_for_partition(user, ENROLLMENT_TRACK_PARTITION_ID)
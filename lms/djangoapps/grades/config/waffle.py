@@ -12,6 +12,7 @@ WRITE_ONLY_IF_ENGAGED = u'write_only_if_engaged'
 ASSUME_ZERO_GRADE_IF_ABSENT = u'assume_zero_grade_if_absent'
 ESTIMATE_FIRST_ATTEMPTED = u'estimate_first_attempted'
 DISABLE_REGRADE_ON_POLICY_CHANGE = u'disable_regrade_on_policy_change'
+PROGRESS_PAGE_FROM_PERSISTED_GRADES = u'progress_page_from_persisted_grades'
 
 
 def waffle():
@@ -10,11 +10,12 @@ persisted, course grades are also immune to changes in course content.
 
 import json
 import logging
+import threading
 from base64 import b64encode
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from hashlib import sha1
 
-from django.db import models
+from django.db import models, transaction
 from django.utils.timezone import now
 from lazy import lazy
 from model_utils.models import TimeStampedModel
@@ -38,6 +39,35 @@ BLOCK_RECORD_LIST_VERSION = 1
 # grade calculation.
 BlockRecord = namedtuple('BlockRecord', ['locator', 'weight', 'raw_possible', 'graded'])
 
+# Maximum number of block records whose serialization is kept in memory.
+BLOCK_RECORD_ENCODING_CACHE_SIZE = 100000
+
+_block_record_encodings = {}
+
+
+def _encode_block_record(block):
+    """
+    Returns the JSON serialization of the given block record, as it appears
+    in the json_value of a BlockRecordList, i.e. with sorted keys and no spaces.
+
+    The serializations are kept in memory, since the same block records are
+    part of the visible blocks of many learners.
+    """
+    # The types are part of the key since, for example, 1 == 1.0 but they are serialized differently.
+    cache_key = (block, tuple(type(field) for field in block))
+    encoded = _block_record_encodings.get(cache_key)
+    if encoded is None:
+        encoded = u'{{"graded":{},"locator":{},"raw_possible":{},"weight":{}}}'.format(
+            json.dumps(block.graded),
+            json.dumps(unicode(block.locator)),  # BlockUsageLocator is not json-serializable
+            json.dumps(block.raw_possible),
+            json.dumps(block.weight),
+        )
+        if len(_block_record_encodings) >= BLOCK_RECORD_ENCODING_CACHE_SIZE:
+            _block_record_encodings.clear()
+        _block_record_encodings[cache_key] = encoded
+    return encoded
+
 
 class DeleteGradesMixin(object):
     """
@@ -105,7 +135,10 @@ class BlockRecordList(tuple):
         supported by adding a label indicated which algorithm was used, e.g.,
         "sha256$j0NDRmSPa5bfid2pAcUXaxCm2Dlh3TwayItZstwyeqQ=".
         """
-        return b64encode(sha1(self.json_value).digest())
+        hasher = sha1()
+        for chunk in self._json_chunks:
+            hasher.update(chunk)
+        return b64encode(hasher.digest())
 
     @lazy
     def json_value(self):
@@ -113,19 +146,28 @@ class BlockRecordList(tuple):
         Return a JSON-serialized version of the list of block records, using a
         stable ordering.
         """
-        list_of_block_dicts = [block._asdict() for block in self]
-        for block_dict in list_of_block_dicts:
-            block_dict['locator'] = unicode(block_dict['locator'])  # BlockUsageLocator is not json-serializable
-        data = {
-            u'blocks': list_of_block_dicts,
-            u'course_key': unicode(self.course_key),
-            u'version': self.version,
-        }
-        return json.dumps(
-            data,
-            separators=(',', ':'),  # Remove spaces from separators for more compact representation
-            sort_keys=True,
-        )
+        return ''.join(self._json_chunks)
+
+    @lazy
+    def _json_chunks(self):
+        """
+        Returns the successive parts of json_value, so that it can be hashed
+        without being built.
+
+        json_value is the same as json.dumps of the list of blocks and its
+        course_key and version, with sorted keys and without spaces, so that
+        hashes remain the same as those of the VisibleBlocks already stored.
+        """
+        chunks = ['{"blocks":[']
+        for index, block in enumerate(self):
+            if index:
+                chunks.append(',')
+            chunks.append(_encode_block_record(block).encode('utf-8'))
+        chunks.append('],"course_key":{},"version":{}}}'.format(
+            json.dumps(unicode(self.course_key)),
+            json.dumps(self.version),
+        ))
+        return chunks
 
     @classmethod
     def from_json(cls, blockrecord_json):
@@ -241,15 +283,54 @@ class VisibleBlocks(models.Model):
         return created
 
     @classmethod
-    def bulk_get_or_create(cls, block_record_lists, course_key):
+    def bulk_get_or_create(cls, block_record_lists, course_key, course_version=None):
         """
         Bulk creates VisibleBlocks for the given iterator of
         BlockRecordList objects for the given course_key, but
         only for those that aren't already created.
+
+        Rather than reading all the VisibleBlocks of the course, only the
+        hashes of the given block record lists are looked up, and those known
+        to exist are remembered for the rest of the request, and by the process
+        for the given course_version.
+        """
+        block_record_lists_by_hash = {brl.hash_value: brl for brl in block_record_lists}
+        unknown_hashes = _known_visible_blocks_hashes.unknown(
+            course_key,
+            course_version,
+            set(block_record_lists_by_hash) - cls._get_request_known_hashes(course_key),
+        )
+        if unknown_hashes:
+            existent_hashes = cls._read_existent_hashes(course_key, unknown_hashes)
+            cls.bulk_create(
+                course_key,
+                [block_record_lists_by_hash[hashed] for hashed in unknown_hashes - existent_hashes],
+            )
+
+        cls._get_request_known_hashes(course_key).update(block_record_lists_by_hash)
+        # Rows written in a transaction may still be rolled back, so they are only shared once committed.
+        if not _in_atomic_block():
+            _known_visible_blocks_hashes.add(course_key, course_version, block_record_lists_by_hash)
+
+    @classmethod
+    def _read_existent_hashes(cls, course_key, hashes):
+        """
+        Returns the subset of the given hashes for which VisibleBlocks exist.
+        """
+        prefetched = get_cache(cls.CACHE_NAMESPACE).get(cls._cache_key(course_key))
+        if prefetched is not None:
+            return {hashed for hashed in hashes if hashed in prefetched}
+        return set(
+            cls.objects.filter(course_id=course_key, hashed__in=hashes).values_list('hashed', flat=True)
+        )
+
+    @classmethod
+    def _get_request_known_hashes(cls, course_key):
+        """
+        Returns the set of the hashes of VisibleBlocks known to exist in the
+        given course, for the current request.
         """
-        existent_records = cls.bulk_read(course_key)
-        non_existent_brls = {brl for brl in block_record_lists if brl.hash_value not in existent_records}
-        cls.bulk_create(course_key, non_existent_brls)
+        return get_cache(cls.CACHE_NAMESPACE).setdefault(cls._hashes_cache_key(course_key), set())
 
     @classmethod
     def _initialize_cache(cls, course_key):
@@ -265,12 +346,12 @@ class VisibleBlocks(models.Model):
     @classmethod
     def _update_cache(cls, course_key, visible_blocks):
         """
-        Adds a specific set of visible blocks to the request cache.
-        This assumes that prefetch has already been called.
+        Adds a specific set of visible blocks to the request cache,
+        if the visible blocks of the course were prefetched.
         """
-        get_cache(cls.CACHE_NAMESPACE)[cls._cache_key(course_key)].update(
-            {visible_block.hashed: visible_block for visible_block in visible_blocks}
-        )
+        prefetched = get_cache(cls.CACHE_NAMESPACE).get(cls._cache_key(course_key))
+        if prefetched is not None:
+            prefetched.update({visible_block.hashed: visible_block for visible_block in visible_blocks})
 
     @classmethod
     def clear_cache(cls, course_key):
@@ -279,11 +360,76 @@ class VisibleBlocks(models.Model):
         """
         cache = get_cache(cls.CACHE_NAMESPACE)
         cache.pop(cls._cache_key(course_key), None)
+        cache.pop(cls._hashes_cache_key(course_key), None)
 
     @classmethod
     def _cache_key(cls, course_key):
         return u"visible_blocks_cache.{}".format(course_key)
 
+    @classmethod
+    def _hashes_cache_key(cls, course_key):
+        return u"visible_blocks_hashes.{}".format(course_key)
+
+
+class KnownVisibleBlocksHashes(object):
+    """
+    Bounded, process-wide record of the hashes of VisibleBlocks known to exist,
+    per course and course version, so that grades written by later requests do
+    not need to look them up again.
+
+    Only the most recently used course versions are kept, and the hashes of a
+    course version are forgotten when there are too many of them.
+    """
+    MAX_COURSE_VERSIONS = 50
+    MAX_HASHES_PER_COURSE_VERSION = 20000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes = OrderedDict()
+
+    def unknown(self, course_key, course_version, hashes):
+        """
+        Returns the subset of the given hashes that are not known for the given course version.
+        """
+        with self._lock:
+            key = (unicode(course_key), course_version)
+            known_hashes = self._hashes.pop(key, None)
+            if known_hashes is None:
+                return set(hashes)
+            self._hashes[key] = known_hashes
+            return set(hashes) - known_hashes
+
+    def add(self, course_key, course_version, hashes):
+        """
+        Records that VisibleBlocks exist for the given hashes of the given course version.
+        """
+        with self._lock:
+            key = (unicode(course_key), course_version)
+            known_hashes = self._hashes.pop(key, set())
+            if len(known_hashes) >= self.MAX_HASHES_PER_COURSE_VERSION:
+                known_hashes = set()
+            known_hashes.update(hashes)
+            self._hashes[key] = known_hashes
+            while len(self._hashes) > self.MAX_COURSE_VERSIONS:
+                self._hashes.popitem(last=False)
+
+    def clear(self):
+        """
+        Forgets all known hashes.
+        """
+        with self._lock:
+            self._hashes.clear()
+
+
+_known_visible_blocks_hashes = KnownVisibleBlocksHashes()
+
+
+def _in_atomic_block():
+    """
+    Returns whether the database changes made now may still be rolled back.
+    """
+    return transaction.get_connection().in_atomic_block
+
 
 class PersistentSubsectionGrade(DeleteGradesMixin, TimeStampedModel):
     """
@@ -457,7 +603,11 @@ class PersistentSubsectionGrade(DeleteGradesMixin, TimeStampedModel):
             return
 
         map(cls._prepare_params, grade_params_iter)
-        VisibleBlocks.bulk_get_or_create([params['visible_blocks'] for params in grade_params_iter], course_key)
+        VisibleBlocks.bulk_get_or_create(
+            [params['visible_blocks'] for params in grade_params_iter],
+            course_key,
+            grade_params_iter[0]['course_version'],
+        )
         map(cls._prepare_params_visible_blocks_id, grade_params_iter)
         map(cls._prepare_first_attempted_for_create, grade_params_iter)
         grades = [PersistentSubsectionGrade(**params) for params in grade_params_iter]
@@ -199,6 +199,8 @@ class CourseGrade(CourseGradeBase):
     Course Grade class when grades are updated or read from storage.
     """
     def __init__(self, user, course_data, *args, **kwargs):
+        # When set, subsection grades are only read from storage, never computed.
+        self.persisted_subsections_only = kwargs.pop('persisted_subsections_only', False)
         super(CourseGrade, self).__init__(user, course_data, *args, **kwargs)
         self._subsection_grade_factory = SubsectionGradeFactory(user, course_data=course_data)
 
@@ -229,6 +231,8 @@ class CourseGrade(CourseGradeBase):
         # Pass read_only here so the subsection grades can be persisted in bulk at the end.
         if self.force_update_subsections:
             return self._subsection_grade_factory.update(subsection)
+        elif self.persisted_subsections_only:
+            return self._subsection_grade_factory.read(subsection)
         else:
             return self._subsection_grade_factory.create(subsection, read_only=True)
 
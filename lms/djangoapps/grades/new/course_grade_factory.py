@@ -3,6 +3,7 @@ from contextlib import contextmanager
 from logging import getLogger
 
 import dogstats_wrapper as dog_stats_api
+from django.core.cache import cache
 
 from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED, COURSE_GRADE_NOW_PASSED
 
@@ -14,6 +15,9 @@ from .course_grade import CourseGrade, ZeroCourseGrade
 
 log = getLogger(__name__)
 
+# Prevents scheduling more than one update of the same stale grade, while the update is pending.
+SCHEDULED_UPDATE_LOCK_TIMEOUT = 5 * 60  # in seconds
+
 
 class CourseGradeFactory(object):
     """
@@ -33,17 +37,40 @@ class CourseGradeFactory(object):
         or course_key should be provided.
         """
         course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        return self._create(user, course_data)
+
+    def read_persisted(self, user, course=None, collected_block_structure=None, course_structure=None, course_key=None):
+        """
+        Returns the CourseGrade for the given user in the course, built
+        from the persisted course and subsection grades and the cached
+        course structure only, without recomputing any scores.
+
+        If the course grade is not in storage or its grading policy has
+        changed, it is derived from the persisted subsection grades and
+        an asynchronous update of the persisted grades is scheduled.
+        Subsections without a persisted grade are given a zero grade.
+
+        Falls back to create if grades are not persisted for the course.
+
+        At least one of course, collected_block_structure, course_structure,
+        or course_key should be provided.
+        """
+        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        if not should_persist_grades(course_data.course_key):
+            return self._create(user, course_data)
+
         try:
-            course_grade, read_policy_hash = self._read(user, course_data)
+            course_grade, read_policy_hash = self._read(user, course_data, persisted_subsections_only=True)
             if read_policy_hash == course_data.grading_policy_hash:
                 return course_grade
-            read_only = False  # update the persisted grade since the policy changed; TODO(TNL-6786) remove soon
         except PersistentCourseGrade.DoesNotExist:
             if assume_zero_if_absent(course_data.course_key):
                 return self._create_zero(user, course_data)
-            read_only = True  # keep the grade un-persisted; TODO(TNL-6786) remove once all grades are backfilled
 
-        return self._update(user, course_data, read_only)
+        self._schedule_update(user, course_data)
+        course_grade = CourseGrade(user, course_data, persisted_subsections_only=True)
+        course_grade.update()
+        return course_grade
 
     def read(self, user, course=None, collected_block_structure=None, course_structure=None, course_key=None):
         """
@@ -149,6 +176,39 @@ class CourseGradeFactory(object):
             )
             return self.GradeResult(user, None, exc)
 
+    def _create(self, user, course_data):
+        """
+        Returns the CourseGrade for the given user and course, as
+        documented in create.
+        """
+        try:
+            course_grade, read_policy_hash = self._read(user, course_data)
+            if read_policy_hash == course_data.grading_policy_hash:
+                return course_grade
+            read_only = False  # update the persisted grade since the policy changed; TODO(TNL-6786) remove soon
+        except PersistentCourseGrade.DoesNotExist:
+            if assume_zero_if_absent(course_data.course_key):
+                return self._create_zero(user, course_data)
+            read_only = True  # keep the grade un-persisted; TODO(TNL-6786) remove once all grades are backfilled
+
+        return self._update(user, course_data, read_only)
+
+    @staticmethod
+    def _schedule_update(user, course_data):
+        """
+        Schedules an asynchronous update of the persisted grades of
+        the given user in the course, unless one is already pending.
+        """
+        # Imported here since the grades tasks depend on this module.
+        from ..tasks import recalculate_course_grade
+
+        lock_key = u'grades.scheduled_update.{}.{}'.format(course_data.course_key, user.id)
+        if cache.add(lock_key, True, SCHEDULED_UPDATE_LOCK_TIMEOUT):
+            log.info(u'Grades: ScheduleUpdate, %s, User: %s', unicode(course_data), user.id)
+            recalculate_course_grade.apply_async(
+                kwargs=dict(user_id=user.id, course_key=unicode(course_data.course_key)),
+            )
+
     @staticmethod
     def _create_zero(user, course_data):
         """
@@ -158,7 +218,7 @@ class CourseGradeFactory(object):
         return ZeroCourseGrade(user, course_data)
 
     @staticmethod
-    def _read(user, course_data):
+    def _read(user, course_data, persisted_subsections_only=False):
         """
         Returns a CourseGrade object based on stored grade information
         for the given user and course.
@@ -173,6 +233,7 @@ class CourseGradeFactory(object):
             persistent_grade.percent_grade,
             persistent_grade.letter_grade,
             persistent_grade.passed_timestamp is not None,
+            persisted_subsections_only=persisted_subsections_only,
         )
 
         log.debug(u'Grades: Read, %s, User: %s, %s', unicode(course_data), user.id, persistent_grade)
@@ -125,6 +125,26 @@ def compute_grades_for_course(course_key, offset, batch_size, **kwargs):  # pyli
             raise result.error
 
 
+@task(bind=True, base=_BaseTask, default_retry_delay=30, routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY)
+def recalculate_course_grade(self, **kwargs):
+    """
+    Computes and saves the course grade of a user, along with any of
+    their subsection grades that were not yet persisted.  Scheduled
+    when a persisted grade is found missing or stale while reading it.
+
+    Keyword Arguments:
+        user_id (int): id of the student
+        course_key (str): identifier of the course
+    """
+    course_key = CourseKey.from_string(kwargs['course_key'])
+    set_custom_metrics_for_course_key(course_key)
+    student = User.objects.get(id=kwargs['user_id'])
+    try:
+        CourseGradeFactory().update(student, course_key=course_key)
+    except KNOWN_RETRY_ERRORS as exc:
+        raise self.retry(kwargs=kwargs, exc=exc)
+
+
 @task(bind=True, base=_BaseTask, default_retry_delay=30, routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY)
 def recalculate_subsection_grade_v3(self, **kwargs):
     """
@@ -23,8 +23,10 @@ from lms.djangoapps.grades.models import (
     BlockRecordList,
     PersistentCourseGrade,
     PersistentSubsectionGrade,
-    VisibleBlocks
+    VisibleBlocks,
+    _known_visible_blocks_hashes
 )
+from request_cache.middleware import RequestCache
 from track.event_transaction_utils import get_event_transaction_id, get_event_transaction_type
 
 
@@ -187,6 +189,69 @@ class VisibleBlocksTest(GradesModelTestCase):
         with self.assertRaises(AttributeError):
             visible_blocks.blocks = expected_blocks
 
+    def test_json_value_matches_json_dumps(self):
+        """
+        Ensures that the serialization, and therefore the hash, of block
+        records is that of json.dumps, even for values that are equal
+        but serialized differently.
+        """
+        for record in (self.record_a, self.record_a._replace(weight=1.0), self.record_a._replace(weight=True)):
+            block_records = BlockRecordList.from_list([record, self.record_b], self.course_key)
+            expected_json = json.dumps(
+                {
+                    'blocks': [
+                        dict(block._asdict(), locator=unicode(block.locator)) for block in (record, self.record_b)
+                    ],
+                    'course_key': unicode(self.course_key),
+                    'version': BLOCK_RECORD_LIST_VERSION,
+                },
+                separators=(',', ':'),
+                sort_keys=True,
+            )
+            self.assertEqual(block_records.json_value, expected_json)
+            self.assertEqual(block_records.hash_value, b64encode(sha1(expected_json).digest()))
+
+
+class VisibleBlocksBulkTest(GradesModelTestCase):
+    """
+    Test the bulk creation of VisibleBlocks.
+    """
+    def setUp(self):
+        super(VisibleBlocksBulkTest, self).setUp()
+        VisibleBlocks.clear_cache(self.course_key)
+        self.addCleanup(_known_visible_blocks_hashes.clear)
+        self.block_record_lists = [
+            BlockRecordList.from_list([self.record_a], self.course_key),
+            BlockRecordList.from_list([self.record_a, self.record_b], self.course_key),
+        ]
+
+    def test_only_missing_blocks_created(self):
+        VisibleBlocks.objects.create_from_blockrecords(self.block_record_lists[0])
+        with self.assertNumQueries(2):
+            VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key)
+        self.assertEqual(VisibleBlocks.objects.filter(course_id=self.course_key).count(), 2)
+
+        # The hashes are remembered for the rest of the request.
+        with self.assertNumQueries(0):
+            VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key)
+
+    def test_hashes_shared_across_requests_once_committed(self):
+        VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key, 'version1')
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key, 'version1')
+
+        # Outside of a transaction, the hashes are known to the other requests of the process.
+        with patch('lms.djangoapps.grades.models._in_atomic_block', return_value=False):
+            VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key, 'version1')
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key, 'version1')
+
+        # They are kept per course version.
+        with self.assertNumQueries(1):
+            VisibleBlocks.bulk_get_or_create(self.block_record_lists, self.course_key, 'version2')
+
 
 @ddt.ddt
 class PersistentSubsectionGradeTest(GradesModelTestCase):
@@ -9,6 +9,7 @@ import itertools
 import ddt
 import pytz
 from django.conf import settings
+from django.core.cache import cache
 from mock import patch
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
@@ -246,6 +247,44 @@ class TestCourseGradeFactory(GradeTestBase):
             else:
                 self.assertIsNone(course_grade)
 
+    @patch('lms.djangoapps.grades.tasks.recalculate_course_grade.apply_async')
+    def test_read_persisted(self, mock_recalculate):
+        grade_factory = CourseGradeFactory()
+        with mock_get_score(1, 2):
+            grade_factory.update(self.request.user, self.course)
+
+        with patch('lms.djangoapps.grades.new.subsection_grade.SubsectionGrade.init_from_structure') as mock_compute:
+            course_grade = grade_factory.read_persisted(self.request.user, self.course)
+            self.assertEqual(course_grade.letter_grade, u'Pass')
+            self.assertEqual(course_grade.percent, 0.5)
+            self.assertEqual(course_grade.score_for_chapter(self.chapter.location), (2.0, 4.0))
+        self.assertFalse(mock_compute.called)
+        self.assertFalse(mock_recalculate.called)
+
+    @patch('lms.djangoapps.grades.tasks.recalculate_course_grade.apply_async')
+    def test_read_persisted_stale_policy(self, mock_recalculate):
+        cache.clear()
+        grade_factory = CourseGradeFactory()
+        with mock_get_score(1, 2):
+            grade_factory.update(self.request.user, self.course)
+        self._update_grading_policy(passing=0.9)
+
+        for __ in range(2):
+            course_grade = grade_factory.read_persisted(self.request.user, self.course)
+            self.assertIsNone(course_grade.letter_grade)
+            self.assertEqual(course_grade.percent, 0.5)
+        mock_recalculate.assert_called_once_with(
+            kwargs=dict(user_id=self.request.user.id, course_key=unicode(self.course.id)),
+        )
+
+    @patch('lms.djangoapps.grades.tasks.recalculate_course_grade.apply_async')
+    def test_read_persisted_missing(self, mock_recalculate):
+        cache.clear()
+        course_grade = CourseGradeFactory().read_persisted(self.request.user, self.course)
+        self._assert_zero_grade(course_grade, CourseGrade)
+        self.assertIsInstance(course_grade.subsection_grades[self.sequence.location], ZeroSubsectionGrade)
+        self.assertTrue(mock_recalculate.called)
+
     @ddt.data(True, False)
     def test_iter_force_update(self, force_update):
         base_string = 'lms.djangoapps.grades.new.subsection_grade_factory.SubsectionGradeFactory.{}'
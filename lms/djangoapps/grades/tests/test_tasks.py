@@ -23,6 +23,7 @@ from lms.djangoapps.grades.tasks import (
     _course_task_args,
     compute_all_grades_for_course,
     compute_grades_for_course_v2,
+    recalculate_course_grade,
     recalculate_subsection_grade_v3
 )
 from openedx.core.djangoapps.content.block_structure.exceptions import BlockStructureNotFound
@@ -425,3 +426,33 @@ class ComputeGradesForCourseTest(HasCourseWithProblemsMixin, ModuleStoreTestCase
             self.assertEqual(batch_size, test_batch_size)
             self.assertEqual(offset, offset_expected)
             offset_expected += test_batch_size
+
+
+class RecalculateCourseGradeTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
+    """
+    Test recalculate_course_grade task.
+    """
+
+    ENABLED_SIGNALS = ['course_published', 'pre_publish']
+
+    def setUp(self):
+        super(RecalculateCourseGradeTest, self).setUp()
+        self.user = UserFactory.create()
+        self.set_up_course()
+        CourseEnrollment.enroll(self.user, self.course.id)
+
+    def test_persists_grades(self):
+        result = recalculate_course_grade.delay(user_id=self.user.id, course_key=six.text_type(self.course.id))
+        self.assertTrue(result.successful)
+        self.assertTrue(PersistentCourseGrade.objects.filter(user_id=self.user.id, course_id=self.course.id).exists())
+        self.assertEqual(
+            PersistentSubsectionGrade.objects.filter(user_id=self.user.id, course_id=self.course.id).count(),
+            1,
+        )
+
+    @patch('lms.djangoapps.grades.tasks.recalculate_course_grade.retry')
+    @patch('lms.djangoapps.grades.new.course_grade_factory.CourseGradeFactory.update')
+    def test_retry_on_integrity_error(self, mock_update, mock_retry):
+        mock_update.side_effect = IntegrityError("WHAMMY")
+        recalculate_course_grade.apply(kwargs=dict(user_id=self.user.id, course_key=six.text_type(self.course.id)))
+        self.assertTrue(mock_retry.called)
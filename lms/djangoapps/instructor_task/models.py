@@ -52,6 +52,8 @@ class InstructorTask(models.Model):
     `requester` stores id of user who submitted the task
     `created` stores date that entry was first created
     `updated` stores date that entry was last modified
+    `checkpoint` stores the progress of a running task, so that it can be resumed if it is restarted.
+        Format is a JSON-serialized dict of the task's cursor and progress counters.
     """
     class Meta(object):
         app_label = "instructor_task"
@@ -67,6 +69,7 @@ class InstructorTask(models.Model):
     created = models.DateTimeField(auto_now_add=True, null=True)
     updated = models.DateTimeField(auto_now=True)
     subtasks = models.TextField(blank=True)  # JSON dictionary
+    checkpoint = models.TextField(blank=True, default='')  # JSON dictionary
 
     def __repr__(self):
         return 'InstructorTask<%r>' % ({
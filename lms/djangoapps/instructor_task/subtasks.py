@@ -211,7 +211,7 @@ class SubtaskStatus(object):
         return unicode(repr(self))
 
 
-def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
+def initialize_subtask_info(entry, action_name, total_num, subtask_id_list, skipped_num=0):
     """
     Store initial subtask information to InstructorTask object.
 
@@ -220,7 +220,8 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
     as is the 'duration_ms' value.  A 'start_time' is stored for later duration calculations,
     and the total number of "things to do" is set, so the user can be told how much needs to be
     done overall.  The `action_name` is also stored, to help with constructing more readable
-    task_progress messages.
+    task_progress messages.  Items that the parent task skipped without passing them to any subtask
+    are given as `skipped_num`, and are counted in the total and as skipped.
 
     The InstructorTask's "subtasks" field is also initialized.  This is also a JSON-serialized dict.
     Keys include 'total', 'succeeded', 'retried', 'failed', which are counters for the number of
@@ -245,9 +246,9 @@ def initialize_subtask_info(entry, action_name, total_num, subtask_id_list):
         'action_name': action_name,
         'attempted': 0,
         'failed': 0,
-        'skipped': 0,
+        'skipped': skipped_num,
         'succeeded': 0,
-        'total': total_num,
+        'total': total_num + skipped_num,
         'duration_ms': int(0),
         'start_time': time()
     }
@@ -281,6 +282,7 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    skipped_num_items=0,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -296,6 +298,8 @@ def queue_subtasks_for_query(
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `total_num_items` : total amount of items that will be put into subtasks
+        `skipped_num_items` : number of items skipped by the task itself, which are only counted
+            in the task progress.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -316,7 +320,9 @@ def queue_subtasks_for_query(
     )
     # Make sure this is committed to database before handing off subtasks to celery.
     with outer_atomic():
-        progress = initialize_subtask_info(entry, action_name, total_num_items, subtask_id_list)
+        progress = initialize_subtask_info(
+            entry, action_name, total_num_items, subtask_id_list, skipped_num=skipped_num_items
+        )
 
     # Construct a generator that will return the recipients to use for each subtask.
     # Pass in the desired fields to fetch for each recipient.
@@ -18,6 +18,10 @@ object contains a 'task_input' row which is a JSON-encoded dict containing
 a problem URL and optionally a student.  These are used to set up the initial value
 of the query for traversing StudentModule objects.
 
+The traversal checkpoints the id of the last StudentModule it updated on the InstructorTask
+object.  These tasks are acknowledged late, so that a task whose worker is killed is
+redelivered, and the traversal then resumes from its last checkpoint.
+
 """
 import logging
 from functools import partial
@@ -25,10 +29,14 @@ from functools import partial
 from celery import task
 from django.conf import settings
 from django.utils.translation import ugettext_noop
+from opaque_keys.edx.keys import CourseKey
 
 from bulk_email.tasks import perform_delegate_email_batches
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
-from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
+from lms.djangoapps.instructor_task.tasks_helper.certs import (
+    generate_certificates_for_subtask,
+    generate_students_certificates
+)
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_enrollment_report,
     upload_exec_summary_report,
@@ -47,14 +55,15 @@ from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     perform_module_state_update,
     override_score_module_state,
     rescore_problem_module_state,
-    reset_attempts_module_state
+    reset_attempts_module_state,
+    warm_rescore_script_cache
 )
 from lms.djangoapps.instructor_task.tasks_helper.runner import run_main_task
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
 
-@task(base=BaseInstructorTask)  # pylint: disable=not-callable
+@task(base=BaseInstructorTask, acks_late=True)  # pylint: disable=not-callable
 def rescore_problem(entry_id, xmodule_instance_args):
     """Rescores a problem in a course, for all students or one specific student.
 
@@ -76,12 +85,13 @@ def rescore_problem(entry_id, xmodule_instance_args):
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
+    prepare_fcn = partial(warm_rescore_script_cache, xmodule_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, prepare_fcn=prepare_fcn)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
-@task(base=BaseInstructorTask)  # pylint: disable=not-callable
+@task(base=BaseInstructorTask, acks_late=True)  # pylint: disable=not-callable
 def override_problem_score(entry_id, xmodule_instance_args):
     """
     Overrides a specific learner's score on a problem.
@@ -94,7 +104,7 @@ def override_problem_score(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
-@task(base=BaseInstructorTask)  # pylint: disable=not-callable
+@task(base=BaseInstructorTask, acks_late=True)  # pylint: disable=not-callable
 def reset_problem_attempts(entry_id, xmodule_instance_args):
     """Resets problem attempts to zero for a particular problem for all students in a course.
 
@@ -116,7 +126,7 @@ def reset_problem_attempts(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
-@task(base=BaseInstructorTask)  # pylint: disable=not-callable
+@task(base=BaseInstructorTask, acks_late=True)  # pylint: disable=not-callable
 def delete_problem_state(entry_id, xmodule_instance_args):
     """Deletes problem state entirely for all students on a particular problem in a course.
 
@@ -292,6 +302,17 @@ def generate_certificates(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def generate_certificates_subtask(entry_id, course_id, user_ids, subtask_status_dict):
+    """
+    Generate certificates for a subset of the students of a
+    `generate_certificates` task.
+    """
+    return generate_certificates_for_subtask(
+        entry_id, CourseKey.from_string(course_id), user_ids, subtask_status_dict
+    )
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def cohort_students(entry_id, xmodule_instance_args):
     """
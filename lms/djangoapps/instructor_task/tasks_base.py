@@ -63,6 +63,7 @@ class BaseInstructorTask(Task):
         if len(entry.subtasks) == 0:
             entry.task_output = InstructorTask.create_output_for_success(task_progress)
             entry.task_state = SUCCESS
+            entry.checkpoint = ''
             entry.save_now()
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
@@ -1,24 +1,43 @@
 """
 Instructor tasks related to certificates.
 """
+import logging
 from time import time
 
+from celery.states import FAILURE, SUCCESS
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db.models import Q
 
-from certificates.api import generate_user_certificates
+from certificates.api import generate_certificates_for_users
 from certificates.models import CertificateStatuses, GeneratedCertificate
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status
+)
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
 
 from .runner import TaskProgress
 
+TASK_LOG = logging.getLogger('edx.celery.task')
+
+# Number of students whose certificates are generated between two updates of the task progress.
+CERTIFICATE_GENERATION_BATCH_SIZE = 100
+
 
 def generate_students_certificates(
-        _xmodule_instance_args, _entry_id, course_id, task_input, action_name):
+        _xmodule_instance_args, entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate certificates for only students present in 'students' key in task_input
     json column, otherwise generate certificates for all enrolled students.
+
+    When certificates are required for more than
+    CERTIFICATE_GENERATION_STUDENTS_PER_TASK students, they are generated
+    by subtasks running in parallel instead.
     """
     start_time = time()
     students_to_generate_certs_for = CourseEnrollment.objects.users_enrolled_in(course_id)
@@ -70,24 +89,120 @@ def generate_students_certificates(
     current_step = {'step': 'Generating Certificates'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    course = modulestore().get_course(course_id, depth=0)
-    # Generate certificate for each student
-    for student in students_require_certs:
-        task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
+    students_require_certs = list(students_require_certs)
+    students_per_task = settings.CERTIFICATE_GENERATION_STUDENTS_PER_TASK
+    if len(students_require_certs) > students_per_task:
+        return _queue_certificate_generation_subtasks(
+            InstructorTask.objects.get(pk=entry_id),
             course_id,
-            course=course
+            [student.id for student in students_require_certs],
+            action_name,
+            students_per_task,
+            task_progress.skipped,
         )
 
-        if CertificateStatuses.is_passing_status(status):
-            task_progress.succeeded += 1
-        else:
-            task_progress.failed += 1
+    course = modulestore().get_course(course_id, depth=0)
+    for status_counts in _generate_certificates(students_require_certs, course_id, course):
+        task_progress.attempted += sum(status_counts)
+        task_progress.succeeded += status_counts[0]
+        task_progress.failed += status_counts[1]
+        task_progress.update_task_state(extra_meta=current_step)
 
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _generate_certificates(students, course_id, course):
+    """
+    Generate the certificates of the students in batches, and yield the
+    number of passing and of other certificate statuses of each batch.
+    """
+    for index in xrange(0, len(students), CERTIFICATE_GENERATION_BATCH_SIZE):
+        batch = students[index:index + CERTIFICATE_GENERATION_BATCH_SIZE]
+        succeeded = 0
+        for __, status in generate_certificates_for_users(batch, course_id, course=course):
+            if CertificateStatuses.is_passing_status(status):
+                succeeded += 1
+        yield succeeded, len(batch) - succeeded
+
+
+def _queue_certificate_generation_subtasks(entry, course_id, user_ids, action_name, students_per_task, skipped):
+    """
+    Queue subtasks generating the certificates of the given users, each for
+    at most `students_per_task` of them, and return the task progress, in
+    which the `skipped` students that do not require a certificate are
+    counted too.
+    """
+    # Avoid a circular import, as the tasks module imports this one.
+    from lms.djangoapps.instructor_task.tasks import generate_certificates_subtask
+
+    def _create_subtask(to_list, initial_subtask_status):
+        """Return a subtask generating the certificates of the users in to_list."""
+        return generate_certificates_subtask.subtask(
+            (
+                entry.id,
+                unicode(course_id),
+                [item['pk'] for item in to_list],
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    user_querysets = [
+        User.objects.filter(id__in=user_ids[index:index + students_per_task]).order_by('id')
+        for index in xrange(0, len(user_ids), students_per_task)
+    ]
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_subtask,
+        user_querysets,
+        [],
+        students_per_task,
+        len(user_ids),
+        skipped_num_items=skipped,
+    )
+
+
+def generate_certificates_for_subtask(entry_id, course_id, user_ids, subtask_status_dict):
+    """
+    Generate the certificates of the given users in the course as a subtask
+    of the certificate generation task `entry_id`, and return the status of
+    the subtask as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    TASK_LOG.info(
+        u"Task: %s, InstructorTask ID: %s, generating certificates of %d students as a subtask",
+        current_task_id, entry_id, len(user_ids)
+    )
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    try:
+        students = list(User.objects.filter(id__in=user_ids).order_by('id'))
+        course = modulestore().get_course(course_id, depth=0)
+        for succeeded, failed in _generate_certificates(students, course_id, course):
+            subtask_status.increment(succeeded=succeeded, failed=failed)
+        # Users deleted since the subtask was queued count as skipped.
+        subtask_status.increment(skipped=len(user_ids) - len(students), state=SUCCESS)
+    except Exception:
+        TASK_LOG.exception(
+            u"Task: %s, InstructorTask ID: %s, certificate generation subtask failed unexpectedly",
+            current_task_id, entry_id
+        )
+        # As it is not known which of the remaining students got a
+        # certificate, count all of them as having failed.
+        subtask_status.increment(
+            failed=len(user_ids) - subtask_status.succeeded - subtask_status.failed - subtask_status.skipped,
+            state=FAILURE
+        )
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
 def students_require_certificate(course_id, enrolled_students, statuses_to_regenerate=None):
     """
     Returns list of students where certificates needs to be generated.
@@ -9,15 +9,20 @@ from datetime import datetime
 from time import time
 
 import unicodecsv
-from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
 from django.core.files.storage import DefaultStorage
 from openassessment.data import OraAggregateData
 from pytz import UTC
 
 from instructor_analytics.basic import get_proctored_exam_results
 from instructor_analytics.csvs import format_dictlist
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.cohorts import (
+    BULK_COHORT_CHUNK_SIZE,
+    COHORT_ASSIGNMENT_ADDED,
+    COHORT_ASSIGNMENT_INVALID_EMAIL,
+    COHORT_ASSIGNMENT_PREASSIGNED,
+    COHORT_ASSIGNMENT_USER_NOT_FOUND,
+    bulk_add_users_to_cohorts
+)
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from survey.models import SurveyAnswer
 from util.file import UniversalNewlineIterator, course_filename_prefix_generator
@@ -126,13 +131,10 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     start_time = time()
     start_date = datetime.now(UTC)
 
-    # Iterate through rows to get total assignments for task progress
     with DefaultStorage().open(task_input['file_name']) as f:
-        total_assignments = 0
-        for _line in unicodecsv.DictReader(UniversalNewlineIterator(f)):
-            total_assignments += 1
+        rows = list(unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'))
 
-    task_progress = TaskProgress(action_name, total_assignments, start_time)
+    task_progress = TaskProgress(action_name, len(rows), start_time)
     current_step = {'step': 'Cohorting Students'}
     task_progress.update_task_state(extra_meta=current_step)
 
@@ -142,62 +144,68 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     # users, and a cached reference to the corresponding cohort object
     # to prevent redundant cohort queries.
     cohorts_status = {}
-
-    with DefaultStorage().open(task_input['file_name']) as f:
-        for row in unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'):
+    # Cohort names are matched case-insensitively, as by the default collation of MySQL, so all
+    # the cohorts of the course are fetched rather than those with the names in the file.
+    cohorts_by_name = {
+        cohort.name.lower(): cohort
+        for cohort in CourseUserGroup.objects.filter(course_id=course_id, group_type=CourseUserGroup.COHORT)
+    }
+
+    # Users are added to the existing cohorts in bulk, one chunk of rows at a time; the outcome of
+    # each assignment is then reported as if the assignments had been made one by one.
+    for chunk_start in xrange(0, len(rows), BULK_COHORT_CHUNK_SIZE):
+        assignments = []
+        assigned_cohort_names = []
+        for row in rows[chunk_start:chunk_start + BULK_COHORT_CHUNK_SIZE]:
             # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
             username_or_email = row.get('email') or row.get('username')
             cohort_name = row.get('cohort') or ''
             task_progress.attempted += 1
 
             if not cohorts_status.get(cohort_name):
+                cohort = cohorts_by_name.get(cohort_name.lower())
                 cohorts_status[cohort_name] = {
                     'Cohort Name': cohort_name,
+                    'Exists': cohort is not None,
                     'Learners Added': 0,
                     'Learners Not Found': set(),
                     'Invalid Email Addresses': set(),
                     'Preassigned Learners': set()
                 }
-                try:
-                    cohorts_status[cohort_name]['cohort'] = CourseUserGroup.objects.get(
-                        course_id=course_id,
-                        group_type=CourseUserGroup.COHORT,
-                        name=cohort_name
-                    )
-                    cohorts_status[cohort_name]["Exists"] = True
-                except CourseUserGroup.DoesNotExist:
-                    cohorts_status[cohort_name]["Exists"] = False
+                if cohort is not None:
+                    cohorts_status[cohort_name]['cohort'] = cohort
 
             if not cohorts_status[cohort_name]['Exists']:
                 task_progress.failed += 1
                 continue
 
-            try:
-                # If add_user_to_cohort successfully adds a user, a user object is returned.
-                # If a user is preassigned to a cohort, no user object is returned (we already have the email address).
-                (user, previous_cohort, preassigned) = add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                if preassigned:
-                    cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
-                    task_progress.preassigned += 1
-                else:
-                    cohorts_status[cohort_name]['Learners Added'] += 1
-                    task_progress.succeeded += 1
-            except User.DoesNotExist:
-                # Raised when a user with the username could not be found, and the email is not valid
-                cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
+            assignments.append((username_or_email, cohorts_status[cohort_name]['cohort']))
+            assigned_cohort_names.append(cohort_name)
+
+        outcomes = bulk_add_users_to_cohorts(course_id, assignments)
+        for (username_or_email, __), cohort_name, outcome in zip(assignments, assigned_cohort_names, outcomes):
+            status = cohorts_status[cohort_name]
+            if outcome == COHORT_ASSIGNMENT_ADDED:
+                status['Learners Added'] += 1
+                task_progress.succeeded += 1
+            elif outcome == COHORT_ASSIGNMENT_PREASSIGNED:
+                status['Preassigned Learners'].add(username_or_email)
+                task_progress.preassigned += 1
+            elif outcome == COHORT_ASSIGNMENT_USER_NOT_FOUND:
+                # The user with the username could not be found, and the email is not valid
+                status['Learners Not Found'].add(username_or_email)
                 task_progress.failed += 1
-            except ValidationError:
-                # Raised when a user with the username could not be found, and the email is not valid,
-                # but the entered string contains an "@"
-                # Since there is no way to know if the entered string is an invalid username or an invalid email,
-                # assume that a string with the "@" symbol in it is an attempt at entering an email
-                cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
+            elif outcome == COHORT_ASSIGNMENT_INVALID_EMAIL:
+                # The user could not be found, and the email is not valid, but the entered string
+                # contains an "@".  Since there is no way to know if the entered string is an invalid
+                # username or an invalid email, assume that it is an attempt at entering an email
+                status['Invalid Email Addresses'].add(username_or_email)
                 task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
+            else:
+                # The user is already in the given cohort
                 task_progress.skipped += 1
 
-            task_progress.update_task_state(extra_meta=current_step)
+        task_progress.update_task_state(extra_meta=current_step)
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
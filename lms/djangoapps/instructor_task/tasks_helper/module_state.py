@@ -3,6 +3,7 @@ Instructor Tasks related to module state.
 """
 import json
 import logging
+from collections import defaultdict
 from time import time
 
 from django.contrib.auth.models import User
@@ -13,10 +14,11 @@ import dogstats_wrapper as dog_stats_api
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
-from courseware.models import StudentModule
+from courseware.models import StudentModule, chunks
 from courseware.module_render import get_module_for_descriptor_internal
 from eventtracking import tracker
 from lms.djangoapps.grades.scores import weighted_score
+from student.models import anonymous_id_for_user
 from track.contexts import course_context_from_course_id
 from track.event_transaction_utils import create_new_event_transaction_id, set_event_transaction_type
 from track.views import task_track
@@ -36,8 +38,12 @@ TASK_LOG = logging.getLogger('edx.celery.task')
 GRADES_RESCORE_EVENT_TYPE = 'edx.grades.problem.rescored'
 GRADES_OVERRIDE_EVENT_TYPE = 'edx.grades.problem.score_overridden'
 
+# number of StudentModules passed to the prepare_fcn of perform_module_state_update at a time
+STUDENT_MODULE_CHUNK_SIZE = 100
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+
+def perform_module_state_update(update_fcn, filter_fcn, entry_id, course_id, task_input, action_name,
+                                prepare_fcn=None):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -56,6 +62,14 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     the update is successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If a `prepare_fcn` is not None, it is called before updating each chunk of StudentModules, with the
+    dict of module descriptors by usage key and the list of StudentModules in the chunk, for instance
+    to compute what the updates of the chunk have in common at once.
+
+    StudentModule instances are visited in order of their ids, and the id of the last one updated is
+    periodically checkpointed on the InstructorTask entry.  If the task is restarted, for instance
+    because its worker was killed, the update resumes after that StudentModule.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -113,26 +127,38 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     if filter_fcn is not None:
         modules_to_update = filter_fcn(modules_to_update)
 
-    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
+    task_progress = TaskProgress(action_name, None, start_time, entry_id=entry_id)
+    last_module_id = task_progress.resume()
+    modules_to_update = modules_to_update.order_by('id')
+    if last_module_id is not None:
+        modules_to_update = modules_to_update.filter(id__gt=last_module_id)
+    task_progress.total = task_progress.attempted + modules_to_update.count()
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update, task_input)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+    for module_chunk in chunks(modules_to_update, STUDENT_MODULE_CHUNK_SIZE):
+        if prepare_fcn is not None:
+            prepare_fcn(problems, module_chunk)
+
+        for module_to_update in module_chunk:
+            task_progress.attempted += 1
+            module_descriptor = problems[unicode(module_to_update.module_state_key)]
+            # There is no try here:  if there's an error, we let it throw, and the task will
+            # be marked as FAILED, with a stack trace.
+            with dog_stats_api.timer(
+                'instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]
+            ):
+                update_status = update_fcn(module_descriptor, module_to_update, task_input)
+                if update_status == UPDATE_STATUS_SUCCEEDED:
+                    # If the update_fcn returns true, then it performed some kind of work.
+                    # Logging of failures is left to the update_fcn itself.
+                    task_progress.succeeded += 1
+                elif update_status == UPDATE_STATUS_FAILED:
+                    task_progress.failed += 1
+                elif update_status == UPDATE_STATUS_SKIPPED:
+                    task_progress.skipped += 1
+                else:
+                    raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+            task_progress.checkpoint(module_to_update.id)
 
     return task_progress.update_task_state()
 
@@ -224,6 +250,46 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
         return UPDATE_STATUS_SUCCEEDED
 
 
+def warm_rescore_script_cache(xmodule_instance_args, problems, student_modules):
+    """
+    Runs the scripts of the problems about to be rescored for the given StudentModules, in one
+    sandbox per problem, and caches their results.
+
+    Rescoring a randomized problem runs its scripts with each student's seed, which would otherwise
+    start a sandbox per StudentModule.  Problems that were not answered are not rescored, and are
+    left out.  Failures are only logged, since rescoring the StudentModules reports them.
+    """
+    learners_by_problem = defaultdict(list)
+    for student_module in student_modules:
+        state = json.loads(student_module.state) if student_module.state else {}
+        if state.get('done') and state.get('seed') is not None:
+            learners_by_problem[unicode(student_module.module_state_key)].append((student_module, state['seed']))
+
+    for usage_key, learners in learners_by_problem.iteritems():
+        first_module = learners[0][0]
+        try:
+            with modulestore().bulk_operations(first_module.course_id):
+                instance = _get_module_instance_for_task(
+                    first_module.course_id,
+                    first_module.student,
+                    problems[usage_key],
+                    xmodule_instance_args,
+                    grade_bucket_type='rescore',
+                    course=get_course_by_id(first_module.course_id),
+                )
+                if instance is None or not hasattr(instance, 'warm_script_cache'):
+                    continue
+
+                # XModules such as capa problems get the anonymous id of the student
+                # that is not specific to the course; see get_module_for_descriptor_internal.
+                instance.warm_script_cache([
+                    (seed, anonymous_id_for_user(student_module.student, None))
+                    for student_module, seed in learners
+                ])
+        except Exception:  # pylint: disable=broad-except
+            TASK_LOG.warning(u"Could not run the scripts of problem %s ahead of rescoring", usage_key, exc_info=True)
+
+
 @outer_atomic
 def override_score_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
     '''
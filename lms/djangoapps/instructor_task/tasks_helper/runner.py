@@ -11,22 +11,84 @@ from util.db import outer_atomic
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Minimum number of seconds between two checkpoints of a task's progress.
+CHECKPOINT_INTERVAL_SECONDS = 30
+
+# Progress counters saved with each checkpoint.
+CHECKPOINT_COUNTERS = ('attempted', 'succeeded', 'skipped', 'failed', 'preassigned')
+
 
 class TaskProgress(object):
     """
     Encapsulates the current task's progress by keeping track of
     'attempted', 'succeeded', 'skipped', 'failed', 'total',
     'action_name', and 'duration_ms' values.
+
+    If `entry_id` is given, the progress can be checkpointed on the
+    InstructorTask entry together with a cursor (such as the id of the
+    last processed user or StudentModule), so that a task restarted after
+    its worker was killed can resume from the cursor.
     """
-    def __init__(self, action_name, total, start_time):
+    def __init__(self, action_name, total, start_time, entry_id=None):
         self.action_name = action_name
         self.total = total
         self.start_time = start_time
+        self.entry_id = entry_id
         self.attempted = 0
         self.succeeded = 0
         self.skipped = 0
         self.failed = 0
         self.preassigned = 0
+        self._last_checkpoint_time = start_time
+
+    def resume(self):
+        """
+        Restore the progress saved by the last checkpoint of the task.
+
+        Returns:
+            The cursor saved by the last checkpoint, or None if the task
+            has no checkpoint.
+        """
+        if self.entry_id is None:
+            return None
+
+        checkpoint = InstructorTask.objects.get(pk=self.entry_id).checkpoint
+        if not checkpoint:
+            return None
+
+        checkpoint = json.loads(checkpoint)
+        for counter in CHECKPOINT_COUNTERS:
+            setattr(self, counter, checkpoint[counter])
+        # Count the time spent before the restart in the task's duration.
+        self.start_time -= checkpoint['duration_ms'] / 1000.0
+        TASK_LOG.info(
+            u'InstructorTask ID: %s, Resuming %s task from checkpoint %s',
+            self.entry_id, self.action_name, checkpoint['cursor'],
+        )
+        return checkpoint['cursor']
+
+    def checkpoint(self, cursor, force=False):
+        """
+        Save the current progress and `cursor` on the InstructorTask entry,
+        unless a checkpoint was saved less than CHECKPOINT_INTERVAL_SECONDS
+        ago and `force` is False.
+
+        The cursor must be JSON-serializable, and should identify the last
+        item whose processing is reflected in the progress counters.
+        """
+        if self.entry_id is None:
+            return
+
+        now = time()
+        if not force and now - self._last_checkpoint_time < CHECKPOINT_INTERVAL_SECONDS:
+            return
+        self._last_checkpoint_time = now
+
+        checkpoint = {counter: getattr(self, counter) for counter in CHECKPOINT_COUNTERS}
+        checkpoint['cursor'] = cursor
+        checkpoint['duration_ms'] = int((now - self.start_time) * 1000)
+        with outer_atomic():
+            InstructorTask.objects.filter(pk=self.entry_id).update(checkpoint=json.dumps(checkpoint))
 
     def update_task_state(self, extra_meta=None):
         """
@@ -29,8 +29,10 @@ from lms.djangoapps.instructor_task.tasks import (
     override_problem_score
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import upload_ora2_data
+from lms.djangoapps.instructor_task.tasks_helper.runner import TaskProgress
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskModuleTestCase
+from student.models import anonymous_id_for_user
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
@@ -447,6 +449,25 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    def test_rescoring_warms_script_cache(self):
+        """
+        Tests that the scripts of the problem are run for all the answered problems at once.
+        """
+        mock_instance = MagicMock()
+        mock_instance.has_submitted_answer.return_value = True
+        students = self._create_students_with_state(3, json.dumps({'done': True, 'seed': 7}))
+        StudentModule.objects.filter(student=students[2]).update(state=json.dumps({'seed': 7}))
+        task_entry = self._create_input_entry()
+        with patch(
+                'lms.djangoapps.instructor_task.tasks_helper.module_state.get_module_for_descriptor_internal'
+        ) as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+
+        mock_instance.warm_script_cache.assert_called_once_with([
+            (7, anonymous_id_for_user(student, None)) for student in students[:2]
+        ])
+
 
 @attr(shard=3)
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
@@ -497,6 +518,54 @@ class TestResetAttemptsInstructorTask(TestInstructorTasks):
         # check that entries were reset
         self._assert_num_attempts(students, 0)
 
+    def test_reset_resumes_from_checkpoint(self):
+        initial_attempts = 3
+        input_state = json.dumps({'attempts': initial_attempts})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        modules = StudentModule.objects.filter(course_id=self.course.id, module_state_key=self.location).order_by('id')
+        # checkpoint the task as if it had been interrupted after resetting the first 4 modules
+        task_entry = self._create_input_entry()
+        task_entry.checkpoint = json.dumps({
+            'cursor': modules[3].id,
+            'attempted': 4,
+            'succeeded': 4,
+            'skipped': 0,
+            'failed': 0,
+            'preassigned': 0,
+            'duration_ms': 1000,
+        })
+        task_entry.save()
+
+        status = self._run_task_with_mock_celery(reset_problem_attempts, task_entry.id, task_entry.task_id)
+        self.assertEquals(status.get('attempted'), num_students)
+        self.assertEquals(status.get('succeeded'), num_students)
+        self.assertEquals(status.get('total'), num_students)
+        self.assertGreater(status.get('duration_ms'), 1000)
+        # only the modules after the checkpoint were reset
+        self._assert_num_attempts([module.student for module in modules[:4]], initial_attempts)
+        self._assert_num_attempts([module.student for module in modules[4:]], 0)
+        # the checkpoint is cleared once the task succeeds
+        self.assertEquals(InstructorTask.objects.get(id=task_entry.id).checkpoint, '')
+
+    def test_reset_saves_checkpoint(self):
+        input_state = json.dumps({'attempts': 3})
+        self._create_students_with_state(3, input_state)
+        task_entry = self._create_input_entry()
+        checkpoints = []
+
+        def save_checkpoint(task_progress, cursor, force=False):  # pylint: disable=unused-argument
+            """Record the checkpoints of the task."""
+            checkpoints.append((cursor, task_progress.attempted))
+
+        with patch.object(TaskProgress, 'checkpoint', autospec=True, side_effect=save_checkpoint):
+            self._run_task_with_mock_celery(reset_problem_attempts, task_entry.id, task_entry.task_id)
+
+        module_ids = StudentModule.objects.filter(
+            course_id=self.course.id, module_state_key=self.location,
+        ).order_by('id').values_list('id', flat=True)
+        self.assertEqual(checkpoints, zip(module_ids, [1, 2, 3]))
+
     def _test_reset_with_student(self, use_email):
         """Run a reset task for one student, with several StudentModules for the problem defined."""
         num_students = 10
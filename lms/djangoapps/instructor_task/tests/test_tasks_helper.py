@@ -8,17 +8,21 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 import tempfile
 import urllib
 from datetime import datetime
+from uuid import uuid4
 
 import ddt
 import unicodecsv
+from celery.states import SUCCESS
 from django.conf import settings
 from django.core.urlresolvers import reverse
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from freezegun import freeze_time
 from mock import MagicMock, Mock, patch
 from nose.plugins.attrib import attr
@@ -33,6 +37,7 @@ from courseware.tests.factories import InstructorFactory
 from instructor_analytics.basic import UNAVAILABLE
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
+from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_enrollment_report,
@@ -52,6 +57,8 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tasks_helper.runner import TaskProgress
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -1570,6 +1577,22 @@ class TestCohortStudents(TestReportMixin, InstructorTaskCourseTestCase):
             verify_order=False
         )
 
+    def test_cohort_name_case_insensitive(self):
+        result = self._cohort_students_and_upload(
+            u'username,email,cohort\n'
+            u'student_1\xec,,cohort 1\n'
+            u'student_2,,COHORT 1'
+        )
+        self.assertDictContainsSubset({'total': 2, 'attempted': 2, 'succeeded': 2, 'failed': 0}, result)
+        self.assertEqual(set(self.cohort_1.users.all()), {self.student_1, self.student_2})
+        self.verify_rows_in_csv(
+            [
+                dict(zip(self.csv_header_row, ['cohort 1', 'True', '1', '', '', ''])),
+                dict(zip(self.csv_header_row, ['COHORT 1', 'True', '1', '', '', ''])),
+            ],
+            verify_order=False
+        )
+
     def test_preassigned_user(self):
         result = self._cohort_students_and_upload(
             'username,email,cohort\n'
@@ -1705,6 +1728,29 @@ class TestCohortStudents(TestReportMixin, InstructorTaskCourseTestCase):
             verify_order=False
         )
 
+    def test_progress_updated_per_chunk(self):
+        attempted = []
+        update_task_state = TaskProgress.update_task_state
+
+        def record_attempted(task_progress, *args, **kwargs):
+            """
+            Records the number of rows attempted at each progress update.
+            """
+            attempted.append(task_progress.attempted)
+            return update_task_state(task_progress, *args, **kwargs)
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.misc.BULK_COHORT_CHUNK_SIZE', 2):
+            with patch.object(TaskProgress, 'update_task_state', autospec=True, side_effect=record_attempted):
+                result = self._cohort_students_and_upload(
+                    u'username,email,cohort\n'
+                    u'student_1\xec,,Cohort 1\n'
+                    u'student_2,,Cohort 2\n'
+                    u'student_1\xec,,Does Not Exist'
+                )
+        self.assertDictContainsSubset({'total': 3, 'attempted': 3, 'succeeded': 2, 'failed': 1}, result)
+        # Once before cohorting, once per chunk of rows, then before and after uploading the results
+        self.assertEqual(attempted, [0, 2, 3, 3, 3])
+
 
 @patch('lms.djangoapps.instructor_task.tasks_helper.misc.DefaultStorage', new=MockDefaultStorage)
 class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
@@ -1975,8 +2021,10 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             'failed': 3,
             'skipped': 2
         }
-        with self.assertNumQueries(171):
+        with CaptureQueriesContext(connection) as queries:
             self.assertCertificatesGenerated(task_input, expected_results)
+        # Generating the certificates one student at a time took 171 queries.
+        self.assertLess(len(queries), 171)
 
         expected_results = {
             'action_name': 'certificates generated',
@@ -1989,6 +2037,43 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
         with self.assertNumQueries(3):
             self.assertCertificatesGenerated(task_input, expected_results)
 
+    @override_settings(CERTIFICATE_GENERATION_STUDENTS_PER_TASK=3)
+    def test_certificate_generation_in_subtasks(self):
+        """
+        Verify that certificates are generated by subtasks when they are
+        required for many students.
+        """
+        students = self._create_students(10)
+        for student in students[:2]:
+            GeneratedCertificateFactory.create(
+                user=student,
+                course_id=self.course.id,
+                status=CertificateStatuses.downloadable,
+                mode='honor'
+            )
+        for student in students[2:7]:
+            CertificateWhitelistFactory.create(user=student, course_id=self.course.id, whitelist=True)
+        entry = InstructorTaskFactory.create(
+            task_type='generate_certificates',
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+        )
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
+                mock_queue.return_value = (0, "Successfully queued")
+                generate_students_certificates(
+                    None, entry.id, self.course.id, {'student_set': None}, 'certificates generated'
+                )
+
+        entry = InstructorTask.objects.get(id=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['total'], 3)
+        self.assertDictContainsSubset(
+            {'total': 10, 'attempted': 8, 'succeeded': 5, 'failed': 3, 'skipped': 2},
+            json.loads(entry.task_output)
+        )
+
     @ddt.data(
         CertificateStatuses.downloadable,
         CertificateStatuses.generating,
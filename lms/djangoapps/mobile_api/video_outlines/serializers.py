@@ -5,21 +5,26 @@ from edxval.api import ValInternalError, get_video_info_for_course_and_profiles
 from rest_framework.reverse import reverse
 
 from courseware.access import has_access
-from courseware.courses import get_course_by_id
-from courseware.model_data import FieldDataCache
-from courseware.module_render import get_module_for_descriptor
-from util.module_utils import get_dynamic_descriptor_children
-from xmodule.modulestore.django import modulestore
-from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
+from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+
+from .transformer import VideoSummaryTransformer
 
 
 class BlockOutline(object):
     """
-    Serializes course videos, pulling data from VAL and the video modules.
+    Serializes course videos, pulling data from VAL and the course's block structure.
+
+    The course hierarchy is read from the collected block structure, so that
+    the path to each video includes the split_test blocks it is in, and the
+    blocks the user has access to from the block structure transformed for
+    the user.  No XModule is loaded or bound.
     """
-    def __init__(self, course_id, start_block, block_types, request, video_profiles):
-        """Create a BlockOutline using `start_block` as a starting point."""
-        self.start_block = start_block
+    def __init__(self, course_id, start_block_key, block_types, request, video_profiles):
+        """Create a BlockOutline using the block at `start_block_key` as a starting point."""
+        self.start_block_key = start_block_key
         self.block_types = block_types
         self.course_id = course_id
         self.request = request  # needed for making full URLS
@@ -31,87 +36,124 @@ class BlockOutline(object):
         except ValInternalError:  # pragma: nocover
             self.local_cache['course_videos'] = {}
 
-    def __iter__(self):
-        def parent_or_requested_block_type(usage_key):
-            """
-            Returns whether the usage_key's block_type is one of self.block_types or a parent type.
-            """
-            return (
-                usage_key.block_type in self.block_types or
-                usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
-            )
-
-        def create_module(descriptor):
-            """
-            Factory method for creating and binding a module for the given descriptor.
-            """
-            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-                self.course_id, self.request.user, descriptor, depth=0,
-            )
-            course = get_course_by_id(self.course_id)
-            return get_module_for_descriptor(
-                self.request.user, self.request, descriptor, field_data_cache, self.course_id, course=course
-            )
+        self.collected_blocks = get_block_structure_manager(course_id).get_collected()
+        # As when XModules are bound for them, staff users only see their
+        # own group of split tests, but see all content restricted to groups.
+        self.is_staff = has_access(request.user, 'staff', course_id)
+        transformers = [
+            transformer for transformer in COURSE_BLOCK_ACCESS_TRANSFORMERS
+            if not (self.is_staff and isinstance(transformer, UserPartitionTransformer))
+        ]
+        self.user_blocks = get_course_blocks(
+            request.user,
+            start_block_key,
+            BlockStructureTransformers(transformers),
+            collected_block_structure=self.collected_blocks,
+        )
 
-        with modulestore().bulk_operations(self.course_id):
-            child_to_parent = {}
-            stack = [self.start_block]
-            while stack:
-                curr_block = stack.pop()
-
-                if curr_block.hide_from_toc:
-                    # For now, if the 'hide_from_toc' setting is set on the block, do not traverse down
-                    # the hierarchy.  The reason being is that these blocks may not have human-readable names
-                    # to display on the mobile clients.
-                    # Eventually, we'll need to figure out how we want these blocks to be displayed on the
-                    # mobile clients.  As they are still accessible in the browser, just not navigatable
-                    # from the table-of-contents.
-                    continue
-
-                if curr_block.location.block_type in self.block_types:
-                    if not has_access(self.request.user, 'load', curr_block, course_key=self.course_id):
-                        continue
-
-                    summary_fn = self.block_types[curr_block.category]
-                    block_path = list(path(curr_block, child_to_parent, self.start_block))
-                    unit_url, section_url = find_urls(self.course_id, curr_block, child_to_parent, self.request)
-
-                    yield {
-                        "path": block_path,
-                        "named_path": [b["name"] for b in block_path],
-                        "unit_url": unit_url,
-                        "section_url": section_url,
-                        "summary": summary_fn(self.course_id, curr_block, self.request, self.local_cache)
-                    }
-
-                if curr_block.has_children:
-                    children = get_dynamic_descriptor_children(
+    def __iter__(self):
+        child_to_parent = {}
+        stack = [self.start_block_key]
+        while stack:
+            curr_block = stack.pop()
+
+            if self.collected_blocks.get_xblock_field(curr_block, 'hide_from_toc'):
+                # For now, if the 'hide_from_toc' setting is set on the block, do not traverse down
+                # the hierarchy.  The reason being is that these blocks may not have human-readable names
+                # to display on the mobile clients.
+                # Eventually, we'll need to figure out how we want these blocks to be displayed on the
+                # mobile clients.  As they are still accessible in the browser, just not navigatable
+                # from the table-of-contents.
+                continue
+
+            if curr_block.block_type in self.block_types:
+                summary_fn = self.block_types[curr_block.block_type]
+                block_path = list(path(self.collected_blocks, curr_block, child_to_parent, self.start_block_key))
+                unit_url, section_url = find_urls(
+                    self.course_id, self.collected_blocks, curr_block, child_to_parent, self.request
+                )
+
+                yield {
+                    "path": block_path,
+                    "named_path": [b["name"] for b in block_path],
+                    "unit_url": unit_url,
+                    "section_url": section_url,
+                    "summary": summary_fn(
+                        self.course_id,
                         curr_block,
-                        self.request.user.id,
-                        create_module,
-                        usage_key_filter=parent_or_requested_block_type
+                        self.collected_blocks.get_transformer_block_field(
+                            curr_block, VideoSummaryTransformer, VideoSummaryTransformer.VIDEO_SUMMARY, {}
+                        ),
+                        self.request,
+                        self.local_cache,
                     )
-                    for block in reversed(children):
-                        stack.append(block)
-                        child_to_parent[block] = curr_block
+                }
+
+            for block in reversed(self._get_children(curr_block)):
+                stack.append(block)
+                child_to_parent[block] = curr_block
+
+    def _get_children(self, block_key):
+        """
+        Returns the keys of the children of the given block that the user has access to.
+
+        split_test blocks are removed from the user's block structure, their
+        children being kept, so they are traversed as long as they are in the
+        course.
+        """
+        children = [
+            child for child in self.collected_blocks.get_children(block_key)
+            if child in self.user_blocks or child.block_type == 'split_test'
+        ]
+        if block_key.block_type == 'split_test' and self.is_staff:
+            group_child = self._get_split_test_group_child(block_key)
+            children = [child for child in children if child == group_child]
+        return children
+
+    def _get_split_test_group_child(self, block_key):
+        """
+        Returns the key of the child of the given split_test block for the
+        user's group, or None if the user is not in a group.
+        """
+        user_partition_id = self.collected_blocks.get_transformer_block_field(
+            block_key, VideoSummaryTransformer, VideoSummaryTransformer.USER_PARTITION_ID
+        )
+        user_partitions = self.collected_blocks.get_transformer_data(UserPartitionTransformer, 'user_partitions')
+        partition = next(
+            (partition for partition in user_partitions or [] if partition.id == user_partition_id),
+            None
+        )
+        if partition is None:
+            return None
 
+        group = partition.scheme.get_group_for_user(self.course_id, self.request.user, partition, assign=True)
+        if group is None:
+            return None
 
-def path(block, child_to_parent, start_block):
+        group_id_to_child = self.collected_blocks.get_transformer_block_field(
+            block_key, VideoSummaryTransformer, VideoSummaryTransformer.GROUP_ID_TO_CHILD, {}
+        )
+        return group_id_to_child.get(unicode(group.id))
+
+
+def path(block_structure, block_key, child_to_parent, start_block_key):
     """path for block"""
     block_path = []
-    while block in child_to_parent:
-        block = child_to_parent[block]
-        if block is not start_block:
+    while block_key in child_to_parent:
+        block_key = child_to_parent[block_key]
+        if block_key != start_block_key:
             block_path.append({
                 # to be consistent with other edx-platform clients, return the defaulted display name
-                'name': block.display_name_with_default_escaped,
-                'category': block.category,
-                'id': unicode(block.location)
+                'name': block_structure.get_transformer_block_field(
+                    block_key, VideoSummaryTransformer, VideoSummaryTransformer.DISPLAY_NAME
+                ),
+                'category': block_key.block_type,
+                'id': unicode(block_key)
             })
     return reversed(block_path)
 
 
-def find_urls(course_id, block, child_to_parent, request):
+def find_urls(course_id, block_structure, block_key, child_to_parent, request):
     """
     Find the section and unit urls for a block.
 
@@ -122,21 +164,21 @@ def find_urls(course_id, block, child_to_parent, request):
 
     """
     block_path = []
-    while block in child_to_parent:
-        block = child_to_parent[block]
-        block_path.append(block)
+    while block_key in child_to_parent:
+        block_key = child_to_parent[block_key]
+        block_path.append(block_key)
 
     block_list = list(reversed(block_path))
     block_count = len(block_list)
 
-    chapter_id = block_list[1].location.block_id if block_count > 1 else None
+    chapter_id = block_list[1].block_id if block_count > 1 else None
     section = block_list[2] if block_count > 2 else None
     position = None
 
     if block_count > 3:
         position = 1
-        for block in section.children:
-            if block.name == block_list[3].url_name:
+        for child_key in block_structure.get_children(section):
+            if child_key.block_id == block_list[3].block_id:
                 break
             position += 1
 
@@ -150,7 +192,7 @@ def find_urls(course_id, block, child_to_parent, request):
         chapter_url = reverse("courseware_chapter", kwargs=kwargs, request=request)
         return chapter_url, chapter_url
 
-    kwargs['section'] = section.url_name
+    kwargs['section'] = section.block_id
     section_url = reverse("courseware_section", kwargs=kwargs, request=request)
     if position is None:
         return section_url, section_url
@@ -160,18 +202,18 @@ def find_urls(course_id, block, child_to_parent, request):
     return unit_url, section_url
 
 
-def video_summary(video_profiles, course_id, video_descriptor, request, local_cache):
+def video_summary(video_profiles, course_id, video_key, video_info, request, local_cache):
     """
-    returns summary dict for the given video module
+    returns summary dict for the given video, from the video data collected by VideoSummaryTransformer
     """
     always_available_data = {
-        "name": video_descriptor.display_name,
-        "category": video_descriptor.category,
-        "id": unicode(video_descriptor.scope_ids.usage_id),
-        "only_on_web": video_descriptor.only_on_web,
+        "name": video_info.get('name'),
+        "category": video_key.block_type,
+        "id": unicode(video_key),
+        "only_on_web": video_info.get('only_on_web', False),
     }
 
-    if video_descriptor.only_on_web:
+    if always_available_data['only_on_web']:
         ret = {
             "video_url": None,
             "video_thumbnail_url": None,
@@ -184,7 +226,7 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
         return ret
 
     # Get encoded videos
-    video_data = local_cache['course_videos'].get(video_descriptor.edx_video_id, {})
+    video_data = local_cache['course_videos'].get(video_info.get('edx_video_id'), {})
 
     # Get highest priority video to populate backwards compatible field
     default_encoded_video = {}
@@ -198,30 +240,25 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
     if default_encoded_video:
         video_url = default_encoded_video['url']
     # Then fall back to VideoDescriptor fields for video URLs
-    elif video_descriptor.html5_sources:
-        video_url = video_descriptor.html5_sources[0]
     else:
-        video_url = video_descriptor.source
+        video_url = video_info.get('fallback_url')
 
     # Get duration/size, else default
     duration = video_data.get('duration', None)
     size = default_encoded_video.get('file_size', 0)
 
     # Transcripts...
-    transcripts_info = video_descriptor.get_transcripts_info()
-    transcript_langs = video_descriptor.available_translations(transcripts_info, verify_assets=False)
-
     transcripts = {
         lang: reverse(
             'video-transcripts-detail',
             kwargs={
                 'course_id': unicode(course_id),
-                'block_id': video_descriptor.scope_ids.usage_id.block_id,
+                'block_id': video_key.block_id,
                 'lang': lang
             },
             request=request,
         )
-        for lang in transcript_langs
+        for lang in video_info.get('transcript_languages', [])
     }
 
     ret = {
@@ -230,7 +267,7 @@ def video_summary(video_profiles, course_id, video_descriptor, request, local_ca
         "duration": duration,
         "size": size,
         "transcripts": transcripts,
-        "language": video_descriptor.get_default_transcript_language(transcripts_info),
+        "language": video_info.get('language'),
         "encoded_videos": video_data.get('profiles')
     }
     ret.update(always_available_data)
@@ -14,6 +14,7 @@ from nose.plugins.attrib import attr
 
 from mobile_api.models import MobileApiConfig
 from mobile_api.testutils import MobileAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, remove_user_from_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
@@ -22,6 +23,8 @@ from xmodule.modulestore.tests.factories import ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
 from xmodule.video_module import transcripts_utils
 
+from .transformer import VideoSummaryTransformer
+
 
 class TestVideoAPITestCase(MobileAPITestCase):
     """
@@ -198,6 +201,36 @@ class TestVideoAPIMixin(object):
         return sub_block_a, sub_block_b
 
 
+@attr(shard=2)
+class TestVideoSummaryTransformer(TestVideoAPITestCase, TestVideoAPIMixin):
+    """
+    Tests the data collected by VideoSummaryTransformer
+    """
+    def test_collect(self):
+        video = self._create_video_with_subs()
+        block_structure = get_block_structure_manager(self.course.id).get_collected()
+
+        self.assertEqual(
+            block_structure.get_transformer_block_field(
+                video.location, VideoSummaryTransformer, VideoSummaryTransformer.VIDEO_SUMMARY
+            ),
+            {
+                'name': u"test video omega \u03a9",
+                'only_on_web': False,
+                'edx_video_id': self.edx_video_id,
+                'fallback_url': video.source,
+                'transcript_languages': ['en'],
+                'language': u'en',
+            }
+        )
+        self.assertEqual(
+            block_structure.get_transformer_block_field(
+                self.nameless_unit.location, VideoSummaryTransformer, VideoSummaryTransformer.DISPLAY_NAME
+            ),
+            self.nameless_unit.location.block_id
+        )
+
+
 @attr(shard=2)
 class TestNonStandardCourseStructure(MobileAPITestCase, TestVideoAPIMixin, MilestonesTestCaseMixin):
     """
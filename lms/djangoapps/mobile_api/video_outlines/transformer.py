@@ -0,0 +1,86 @@
+"""
+Video Summary Transformer
+"""
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+
+class VideoSummaryTransformer(BlockStructureTransformer):
+    """
+    The VideoSummaryTransformer collects the course data needed by the
+    mobile video outline, so that outlines are served from the block
+    structure without loading the course from the modulestore.
+
+    No runtime transformations are performed.
+
+    The following values are stored as transformer_block_fields:
+
+        display_name_with_default_escaped: (string) for every block
+        video_summary: (dict) for video blocks, see collect_video_data
+        user_partition_id: (int) for split_test blocks
+        group_id_to_child: (dict) for split_test blocks
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+    DISPLAY_NAME = 'display_name_with_default_escaped'
+    VIDEO_SUMMARY = 'video_summary'
+    USER_PARTITION_ID = 'user_partition_id'
+    GROUP_ID_TO_CHILD = 'group_id_to_child'
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'video_summary'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        block_structure.request_xblock_fields('hide_from_toc')
+
+        for block_key in block_structure.topological_traversal():
+            block = block_structure.get_xblock(block_key)
+            block_structure.set_transformer_block_field(
+                block_key, cls, cls.DISPLAY_NAME, block.display_name_with_default_escaped
+            )
+
+            if block_key.block_type == 'video':
+                block_structure.set_transformer_block_field(
+                    block_key, cls, cls.VIDEO_SUMMARY, collect_video_data(block)
+                )
+            elif block_key.block_type == 'split_test':
+                block_structure.set_transformer_block_field(
+                    block_key, cls, cls.USER_PARTITION_ID, block.user_partition_id
+                )
+                block_structure.set_transformer_block_field(
+                    block_key, cls, cls.GROUP_ID_TO_CHILD, dict(block.group_id_to_child)
+                )
+
+    def transform(self, usage_info, block_structure):
+        """
+        Perform no transformations.
+        """
+        pass
+
+
+def collect_video_data(video_descriptor):
+    """
+    Returns the data of the given video descriptor that its summary in the
+    video outline is built from.
+    """
+    transcripts_info = video_descriptor.get_transcripts_info()
+    return {
+        'name': video_descriptor.display_name,
+        'only_on_web': video_descriptor.only_on_web,
+        'edx_video_id': video_descriptor.edx_video_id,
+        # The video URL used when no encoding of the video is found in VAL.
+        'fallback_url': (
+            video_descriptor.html5_sources[0] if video_descriptor.html5_sources else video_descriptor.source
+        ),
+        'transcript_languages': video_descriptor.available_translations(transcripts_info, verify_assets=False),
+        'language': video_descriptor.get_default_transcript_language(transcripts_info),
+    }
@@ -154,6 +154,21 @@ class CourseTeam(models.Model):
         self.save()
 
 
+class CourseTeamIndexUpdate(models.Model):
+    """This model represents a change to a team which has not yet been
+    sent to the search index.
+
+    Whether the team is indexed or removed from the index is decided when
+    the update is sent, depending on whether the team still exists.
+    """
+
+    class Meta(object):
+        app_label = "teams"
+
+    team_id = models.CharField(max_length=255, db_index=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+
 class CourseTeamMembership(models.Model):
     """This model represents the membership of a single user in a single team."""
 
@@ -10,7 +10,7 @@ from django.utils import translation
 from elasticsearch.exceptions import ConnectionError
 from search.search_engine_base import SearchEngine
 
-from lms.djangoapps.teams.models import CourseTeam
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamIndexUpdate
 from request_cache import get_request_or_stub
 
 from .errors import ElasticSearchConnectionError
@@ -37,6 +37,10 @@ class CourseTeamIndexer(object):
     INDEX_NAME = "course_team_index"
     DOCUMENT_TYPE_NAME = "course_team"
     ENABLE_SEARCH_KEY = "ENABLE_TEAMS"
+    ENABLE_BATCHED_INDEXING_KEY = "ENABLE_TEAMS_BATCHED_INDEXING"
+
+    # Maximum number of queued updates sent to the search index in a single batch.
+    BATCH_SIZE = 500
 
     def __init__(self, course_team):
         self.course_team = course_team
@@ -111,6 +115,49 @@ class CourseTeamIndexer(object):
         """
         cls.engine().remove(cls.DOCUMENT_TYPE_NAME, [course_team.team_id])
 
+    @classmethod
+    @if_search_enabled
+    def enqueue(cls, course_team):
+        """
+        Queue course_team to be indexed, or removed from the index if it no
+        longer exists, by the next call to `index_pending` (if feature is enabled).
+        """
+        CourseTeamIndexUpdate.objects.create(team_id=course_team.team_id)
+
+    @classmethod
+    @if_search_enabled
+    def index_pending(cls, batch_size=None):
+        """
+        Send the oldest queued updates to the index in bulk (if feature is enabled).
+
+        Several updates of the same team are sent once, with the current state
+        of the team.  The updates are only removed from the queue once they
+        have been sent, so that they are sent again if the search engine is
+        unavailable.
+
+        Returns the number of queued updates that were sent.
+        """
+        updates = list(CourseTeamIndexUpdate.objects.order_by('id')[:batch_size or cls.BATCH_SIZE])
+        if not updates:
+            return 0
+
+        team_ids = set(update.team_id for update in updates)
+        course_teams = list(CourseTeam.objects.filter(team_id__in=team_ids))
+        removed_team_ids = team_ids - set(course_team.team_id for course_team in course_teams)
+
+        search_engine = cls.engine()
+        if course_teams:
+            search_engine.index(
+                cls.DOCUMENT_TYPE_NAME,
+                [CourseTeamIndexer(course_team).data() for course_team in course_teams]
+            )
+        if removed_team_ids:
+            search_engine.remove(cls.DOCUMENT_TYPE_NAME, list(removed_team_ids))
+
+        # Only the updates read above are removed: others, even with lower ids, may have been committed since.
+        CourseTeamIndexUpdate.objects.filter(id__in=[update.id for update in updates]).delete()
+        return len(updates)
+
     @classmethod
     @if_search_enabled
     def engine(cls):
@@ -130,6 +177,13 @@ class CourseTeamIndexer(object):
         """
         return settings.FEATURES.get(cls.ENABLE_SEARCH_KEY, False)
 
+    @classmethod
+    def batched_indexing_is_enabled(cls):
+        """
+        Return boolean of whether changes to course teams are queued and indexed in batches.
+        """
+        return settings.FEATURES.get(cls.ENABLE_BATCHED_INDEXING_KEY, False)
+
 
 @receiver(post_save, sender=CourseTeam, dispatch_uid='teams.signals.course_team_post_save_callback')
 def course_team_post_save_callback(**kwargs):
@@ -137,7 +191,10 @@ def course_team_post_save_callback(**kwargs):
     Reindex object after save.
     """
     try:
-        CourseTeamIndexer.index(kwargs['instance'])
+        if CourseTeamIndexer.batched_indexing_is_enabled():
+            CourseTeamIndexer.enqueue(kwargs['instance'])
+        else:
+            CourseTeamIndexer.index(kwargs['instance'])
     except ElasticSearchConnectionError:
         pass
 
@@ -148,6 +205,9 @@ def course_team_post_delete_callback(**kwargs):  # pylint: disable=invalid-name
     Reindex object after delete.
     """
     try:
-        CourseTeamIndexer.remove(kwargs['instance'])
+        if CourseTeamIndexer.batched_indexing_is_enabled():
+            CourseTeamIndexer.enqueue(kwargs['instance'])
+        else:
+            CourseTeamIndexer.remove(kwargs['instance'])
     except ElasticSearchConnectionError:
         pass
@@ -0,0 +1,33 @@
+"""
+Asynchronous tasks for the teams app.
+"""
+import logging
+
+from celery.task import task
+
+from .errors import ElasticSearchConnectionError
+from .search_indexes import CourseTeamIndexer
+
+log = logging.getLogger(__name__)
+
+
+@task(name='teams.index_pending_course_teams')
+def index_pending_course_teams():
+    """
+    Send all the queued changes to course teams to the search index, in batches.
+    """
+    sent_count = 0
+    try:
+        while True:
+            batch_count = CourseTeamIndexer.index_pending()
+            if not batch_count:
+                break
+            sent_count += batch_count
+    except ElasticSearchConnectionError:
+        log.warning(
+            u'Could not connect to the search engine after sending %d course team updates, '
+            u'the remaining updates stay queued.',
+            sent_count
+        )
+    else:
+        log.info(u'Sent %d queued course team updates to the search index.', sent_count)
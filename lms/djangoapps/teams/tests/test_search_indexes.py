@@ -0,0 +1,69 @@
+"""Tests for the batched indexing of course teams."""
+from django.conf import settings
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+
+from lms.djangoapps.teams.models import CourseTeamIndexUpdate
+from lms.djangoapps.teams.search_indexes import CourseTeamIndexer
+from lms.djangoapps.teams.tasks import index_pending_course_teams
+from lms.djangoapps.teams.tests.factories import CourseTeamFactory
+
+COURSE_KEY = CourseKey.from_string('edx/history/1')
+
+
+@patch.dict(settings.FEATURES, {'ENABLE_TEAMS': True, 'ENABLE_TEAMS_BATCHED_INDEXING': True})
+class CourseTeamBatchedIndexingTest(TestCase):
+    """Tests for queueing changes to course teams and sending them to the index in batches."""
+
+    def setUp(self):
+        super(CourseTeamBatchedIndexingTest, self).setUp()
+        patcher = patch.object(CourseTeamIndexer, 'engine')
+        self.mock_engine = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_changes_are_queued(self):
+        team = CourseTeamFactory(course_id=COURSE_KEY, team_id='team1')
+        team.description = 'A new description'
+        team.save()
+
+        self.assertFalse(self.mock_engine.index.called)
+        self.assertEqual(CourseTeamIndexUpdate.objects.filter(team_id='team1').count(), 2)
+
+    def test_queued_changes_are_coalesced(self):
+        team1 = CourseTeamFactory(course_id=COURSE_KEY, team_id='team1')
+        team1.save()
+        CourseTeamFactory(course_id=COURSE_KEY, team_id='team2')
+        team3 = CourseTeamFactory(course_id=COURSE_KEY, team_id='team3')
+        team3.delete()
+
+        self.assertEqual(CourseTeamIndexer.index_pending(), 5)
+
+        self.assertEqual(self.mock_engine.index.call_count, 1)
+        doc_type, documents = self.mock_engine.index.call_args[0]
+        self.assertEqual(doc_type, CourseTeamIndexer.DOCUMENT_TYPE_NAME)
+        self.assertItemsEqual([document['id'] for document in documents], ['team1', 'team2'])
+        self.mock_engine.remove.assert_called_once_with(CourseTeamIndexer.DOCUMENT_TYPE_NAME, ['team3'])
+        self.assertFalse(CourseTeamIndexUpdate.objects.exists())
+
+    def test_task_sends_all_batches(self):
+        for index in range(5):
+            CourseTeamFactory(course_id=COURSE_KEY, team_id='team{}'.format(index))
+
+        with patch.object(CourseTeamIndexer, 'BATCH_SIZE', 2):
+            index_pending_course_teams()
+
+        self.assertEqual(self.mock_engine.index.call_count, 3)
+        self.assertFalse(CourseTeamIndexUpdate.objects.exists())
+
+    def test_updates_committed_during_indexing_are_kept(self):
+        # An update whose transaction got a lower id, but was committed after the queue was read.
+        late_update_id = CourseTeamIndexUpdate.objects.create(team_id='team2').id
+        CourseTeamIndexUpdate.objects.filter(id=late_update_id).delete()
+        CourseTeamFactory(course_id=COURSE_KEY, team_id='team1')
+        self.mock_engine.index.side_effect = lambda *args: CourseTeamIndexUpdate.objects.create(
+            id=late_update_id, team_id='team2'
+        )
+
+        self.assertEqual(CourseTeamIndexer.index_pending(), 1)
+        self.assertEqual(list(CourseTeamIndexUpdate.objects.values_list('id', flat=True)), [late_update_id])
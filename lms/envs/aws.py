@@ -611,6 +611,13 @@ BROKER_USE_SSL = ENV_TOKENS.get('CELERY_BROKER_USE_SSL', False)
 # Block Structures
 BLOCK_STRUCTURES_SETTINGS = ENV_TOKENS.get('BLOCK_STRUCTURES_SETTINGS', BLOCK_STRUCTURES_SETTINGS)
 
+# Sampling profiler
+SAMPLING_PROFILER.update(ENV_TOKENS.get('SAMPLING_PROFILER', {}))
+
+# Query instrumentation
+QUERY_BUDGETS = ENV_TOKENS.get('QUERY_BUDGETS', QUERY_BUDGETS)
+QUERY_BUDGET_ACTION = ENV_TOKENS.get('QUERY_BUDGET_ACTION', QUERY_BUDGET_ACTION)
+
 # upload limits
 STUDENT_FILEUPLOAD_MAX_SIZE = ENV_TOKENS.get("STUDENT_FILEUPLOAD_MAX_SIZE", STUDENT_FILEUPLOAD_MAX_SIZE)
 
@@ -639,6 +646,10 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 
 # Grades download
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
+CERTIFICATE_GENERATION_STUDENTS_PER_TASK = ENV_TOKENS.get(
+    'CERTIFICATE_GENERATION_STUDENTS_PER_TASK',
+    CERTIFICATE_GENERATION_STUDENTS_PER_TASK
+)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
@@ -782,6 +793,12 @@ if FEATURES.get('ENABLE_COURSEWARE_SEARCH') or \
 
 ELASTIC_SEARCH_CONFIG = ENV_TOKENS.get('ELASTIC_SEARCH_CONFIG', [{}])
 
+if FEATURES.get('ENABLE_TEAMS_BATCHED_INDEXING'):
+    CELERYBEAT_SCHEDULE['index-course-teams'] = {
+        'task': 'teams.index_pending_course_teams',
+        'schedule': datetime.timedelta(seconds=ENV_TOKENS.get('TEAMS_INDEXING_PERIOD_SECONDS', 60)),
+    }
+
 # Facebook app
 FACEBOOK_API_VERSION = AUTH_TOKENS.get("FACEBOOK_API_VERSION")
 FACEBOOK_APP_SECRET = AUTH_TOKENS.get("FACEBOOK_APP_SECRET")
@@ -1009,9 +1026,13 @@ BASE_COOKIE_DOMAIN = ENV_TOKENS.get(
 # the service, and override the default parameters which are defined in common.py
 
 COURSES_API_CACHE_TIMEOUT = ENV_TOKENS.get('COURSES_API_CACHE_TIMEOUT', COURSES_API_CACHE_TIMEOUT)
+EDX_API_CACHE_STALE_TIMEOUT = ENV_TOKENS.get('EDX_API_CACHE_STALE_TIMEOUT', EDX_API_CACHE_STALE_TIMEOUT)
 
 # Add an ICP license for serving content in China if your organization is registered to do so
 ICP_LICENSE = ENV_TOKENS.get('ICP_LICENSE', None)
 
 ############## Settings for CourseGraph ############################
 COURSEGRAPH_JOB_QUEUE = ENV_TOKENS.get('COURSEGRAPH_JOB_QUEUE', LOW_PRIORITY_QUEUE)
+
+############## Startup ############################
+LAZY_STARTUP = ENV_TOKENS.get('LAZY_STARTUP', LAZY_STARTUP)
@@ -328,6 +328,10 @@ FEATURES = {
     # Teams feature
     'ENABLE_TEAMS': True,
 
+    # Queue the changes to course teams and send them to the search index in
+    # batches from a periodic task, instead of indexing each change as it is saved.
+    'ENABLE_TEAMS_BATCHED_INDEXING': False,
+
     # Show video bumper in LMS
     'ENABLE_VIDEO_BUMPER': False,
 
@@ -1149,6 +1153,16 @@ FOOTER_BROWSER_CACHE_MAX_AGE = 5 * 60
 # Credit api notification cache timeout
 CREDIT_NOTIFICATION_CACHE_TIMEOUT = 5 * 60 * 60
 
+# Number of seconds for which waffle switches, flags and course overrides are
+# cached in each process before being read again. 0 disables the cache.
+WAFFLE_UTILS_CACHE_TIMEOUT = 30
+
+# Defer the work that can be done on first use, rather than when a process
+# starts, to shorten the startup of web and celery workers.  The Mako template
+# lookups are then set up, theme directories indexed and optional runtime
+# services created on first use.
+LAZY_STARTUP = False
+
 ################################# Deprecation warnings #####################
 
 # Ignore deprecation warnings (so we don't clutter Jenkins builds/production)
@@ -1161,6 +1175,8 @@ MIDDLEWARE_CLASSES = (
 
     'request_cache.middleware.RequestCache',
     'openedx.core.djangoapps.monitoring_utils.middleware.MonitoringCustomMetrics',
+    'openedx.core.djangoapps.monitoring_utils.middleware.QueryInstrumentationMiddleware',
+    'openedx.core.djangoapps.performance.middleware.SamplingProfilerMiddleware',
 
     'mobile_api.middleware.AppVersionUpgrade',
     'openedx.core.djangoapps.header_control.middleware.HeaderControlMiddleware',
@@ -1809,6 +1825,7 @@ DEBUG_TOOLBAR_PATCH_SETTINGS = False
 # Tasks are only registered when the module they are defined in is imported.
 CELERY_IMPORTS = (
     'openedx.core.djangoapps.programs.tasks.v1.tasks',
+    'openedx.core.lib.edx_api_utils',
 )
 
 # Message configuration
@@ -1881,6 +1898,34 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # DIRECTORY_PREFIX='/modeltest/',
 )
 
+############################ Sampling Profiler ################################
+
+# Enabled with the 'performance.enable_sampling_profiler' waffle switch.
+SAMPLING_PROFILER = dict(
+    # Fraction of requests that are sampled.
+    SAMPLE_RATE=0.01,
+
+    # Minimum latency, in seconds, for a sampled request to be stored.
+    LATENCY_THRESHOLD=1.0,
+
+    # Time, in seconds, between two stack samples.
+    SAMPLING_INTERVAL=0.005,
+
+    # Number of recent profiles kept per view, and for how long, in seconds.
+    MAX_PROFILES_PER_VIEW=20,
+    CACHE_TIMEOUT=24 * 60 * 60,
+)
+
+########################## Query Instrumentation ##############################
+
+# Enabled with the 'monitoring_utils.enable_query_instrumentation' waffle switch.
+# Optional per-view and per-task budgets, keyed by view or task name, e.g.
+# {'courseware.views.views.progress': {'MAX_QUERIES': 300, 'MAX_DB_TIME': 1.5, 'MAX_DUPLICATE_QUERIES': 50}}
+QUERY_BUDGETS = {}
+
+# Whether an exceeded budget is logged ('log') or raised ('raise').
+QUERY_BUDGET_ACTION = 'log'
+
 ################################ Bulk Email ###################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -2134,6 +2179,9 @@ INSTALLED_APPS = (
     # Monitoring functionality
     'openedx.core.djangoapps.monitoring',
 
+    # Performance logging and sampling profiler
+    'openedx.core.djangoapps.performance',
+
     # Course action state
     'course_action_state',
 
@@ -2543,6 +2591,10 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Certificate generation tasks for more students than this are split into
+# subtasks that each generate the certificates of this many students.
+CERTIFICATE_GENERATION_STUDENTS_PER_TASK = 1000
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -3249,5 +3301,9 @@ COURSE_ENROLLMENT_MODES = {
 
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+# How long, in seconds, data cached by get_edx_api_data may be served stale
+# past its configured TTL while it is refreshed in the background.
+EDX_API_CACHE_STALE_TIMEOUT = 24 * 60 * 60
+
 ############## Settings for CourseGraph ############################
 COURSEGRAPH_JOB_QUEUE = LOW_PRIORITY_QUEUE
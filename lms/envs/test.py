@@ -237,6 +237,9 @@ CACHES = {
     },
 }
 
+# Waffle values changed in a test would otherwise stay cached after its transaction is rolled back
+WAFFLE_UTILS_CACHE_TIMEOUT = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
@@ -6,6 +6,7 @@ import logging
 
 import django
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 
 # Force settings to run so that the python path is modified
 
@@ -65,15 +66,13 @@ def run():
     # register any dependency injections that we need to support in edx_proctoring
     # right now edx_proctoring is dependent on the openedx.core.djangoapps.credit
     if settings.FEATURES.get('ENABLE_SPECIAL_EXAMS'):
-        # Import these here to avoid circular dependencies of the form:
-        # edx-platform app --> DRF --> django translation --> edx-platform app
         from edx_proctoring.runtime import set_runtime_service
-        from lms.djangoapps.instructor.services import InstructorService
-        from openedx.core.djangoapps.credit.services import CreditService
-        set_runtime_service('credit', CreditService())
-
-        # register InstructorService (for deleting student attempts and user staff access roles)
-        set_runtime_service('instructor', InstructorService())
+        for name, create_service in (('credit', _create_credit_service), ('instructor', _create_instructor_service)):
+            if settings.LAZY_STARTUP:
+                # The service, and the apps it imports, are only loaded when first used.
+                set_runtime_service(name, SimpleLazyObject(create_service))
+            else:
+                set_runtime_service(name, create_service())
 
     # In order to allow modules to use a handler url, we need to
     # monkey-patch the x_module library.
@@ -90,6 +89,26 @@ def run():
     validate_lms_config(settings)
 
 
+def _create_credit_service():
+    """
+    Returns the credit service used by edx_proctoring.
+    """
+    # Imported here to avoid circular dependencies of the form:
+    # edx-platform app --> DRF --> django translation --> edx-platform app
+    from openedx.core.djangoapps.credit.services import CreditService
+    return CreditService()
+
+
+def _create_instructor_service():
+    """
+    Returns the instructor service used by edx_proctoring, for deleting student
+    attempts and user staff access roles.
+    """
+    # Imported here for the same reason as CreditService.
+    from lms.djangoapps.instructor.services import InstructorService
+    return InstructorService()
+
+
 def add_mimetypes():
     """
     Add extra mimetypes. Used in xblock_resource.
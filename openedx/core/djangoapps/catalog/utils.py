@@ -3,10 +3,8 @@ import copy
 import logging
 
 import waffle
-from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from edx_rest_api_client.client import EdxRestApiClient
 
 from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
@@ -14,24 +12,19 @@ from openedx.core.djangoapps.catalog.cache import (
     SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
-from openedx.core.lib.edx_api_utils import get_edx_api_data
-from openedx.core.lib.token_utils import JwtBuilder
+from openedx.core.lib.edx_api_utils import get_api_client, get_edx_api_data
 
 logger = logging.getLogger(__name__)
 
 
 def create_catalog_api_client(user, site=None):
     """Returns an API client which can be used to make Catalog API requests."""
-    scopes = ['email', 'profile']
-    expires_in = settings.OAUTH_ID_TOKEN_EXPIRATION
-    jwt = JwtBuilder(user).build_token(scopes, expires_in)
-
     if site:
         url = site.configuration.get_value('COURSE_CATALOG_API_URL')
     else:
         url = CatalogIntegration.current().get_internal_api_url()
 
-    return EdxRestApiClient(url, jwt=jwt)
+    return get_api_client(url, user)
 
 
 def get_programs(site, uuid=None):
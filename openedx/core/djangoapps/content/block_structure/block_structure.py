@@ -23,6 +23,14 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# A dictionary key value for storing the names of the xBlock fields
+# requested by a transformer.
+TRANSFORMER_REQUESTED_FIELDS_KEY = '_requested_xblock_fields'
+
+# Name of the xBlock field collected for every block in order to detect
+# the blocks that changed since the block structure was last collected.
+EDITED_ON_FIELD = 'edited_on'
+
 
 class _BlockRelations(object):
     """
@@ -734,6 +742,34 @@ class BlockStructureBlockData(BlockStructure):
             raise TransformerException('Version attributes are not set on transformer {0}.', transformer.name())
         self.set_transformer_data(transformer, TRANSFORMER_VERSION_KEY, transformer.WRITE_VERSION)
 
+    def _copy_transformer_data(self, source_block_structure, transformer, usage_keys):
+        """
+        Copies the given transformer's data from the given source block
+        structure, including its block-specific data for the blocks
+        identified by the given usage_keys.
+
+        Arguments:
+            source_block_structure (BlockStructureBlockData) - The block
+                structure from which the data is copied.
+
+            transformer (BlockStructureTransformer) - The transformer
+                whose data is copied.
+
+            usage_keys ([UsageKey]) - Usage keys of the blocks whose
+                transformer data is copied.
+        """
+        try:
+            self.transformer_data[transformer] = source_block_structure.transformer_data[transformer]
+        except KeyError:
+            pass
+
+        for usage_key in usage_keys:
+            try:
+                transformer_block_data = source_block_structure.get_transformer_block_data(usage_key, transformer)
+            except KeyError:
+                continue
+            self._get_or_create_block(usage_key).transformer_data[transformer] = transformer_block_data
+
     def _get_or_create_block(self, usage_key):
         """
         Returns the BlockData associated with the given usage_key.
@@ -770,6 +806,12 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         # set(string)
         self._requested_xblock_fields = set()
 
+        # Set of usage keys of the blocks that are to be collected, or
+        # None if all blocks are to be collected.  Only set while a
+        # transformer incrementally collects the blocks that changed.
+        # set(UsageKey)
+        self._blocks_to_collect = None
+
     def request_xblock_fields(self, *field_names):
         """
         Records request for collecting data for the given xBlock fields.
@@ -796,9 +838,59 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         return self._xblock_map[usage_key]
 
+    def collect_traversal(self, **kwargs):
+        """
+        Performs a topological traversal of the blocks whose data is to
+        be collected.  These are all of the blocks in the structure,
+        except while an incremental collect is in progress, when only
+        the blocks that changed since the previous collect are yielded.
+
+        Transformers that support incremental collection
+        (INCREMENTAL_COLLECT) should use this traversal instead of
+        topological_traversal in their collect method.
+
+        Arguments:
+            kwargs (dict) - Optional keyword arguments to be forwarded
+                to topological_traversal.
+        """
+        for block_key in self.topological_traversal(**kwargs):
+            if self._blocks_to_collect is None or block_key in self._blocks_to_collect:
+                yield block_key
+
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
+    def _get_changed_blocks(self, previous_block_structure):
+        """
+        Returns the set of usage keys of the blocks whose collected data
+        may differ from the data in the given previously collected block
+        structure.
+
+        A block is considered changed if it was added or edited, or if
+        its parents changed.  Since blocks inherit field values and
+        collected data from their ancestors, all descendants of a changed
+        block are considered changed too.  Blocks without an edit
+        timestamp are always considered changed.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - The
+                block structure that was previously collected for the
+                same root block.
+        """
+        changed_blocks = set()
+        for block_key in self.topological_traversal():
+            parents = self.get_parents(block_key)
+            edited_on = getattr(self.get_xblock(block_key), EDITED_ON_FIELD, None)
+            if (
+                    edited_on is None or
+                    block_key not in previous_block_structure or
+                    previous_block_structure.get_xblock_field(block_key, EDITED_ON_FIELD) != edited_on or
+                    set(previous_block_structure.get_parents(block_key)) != set(parents) or
+                    any(parent_key in changed_blocks for parent_key in parents)
+            ):
+                changed_blocks.add(block_key)
+        return changed_blocks
+
     def _add_xblock(self, usage_key, xblock):
         """
         Associates the given xBlock object with the given usage_key.
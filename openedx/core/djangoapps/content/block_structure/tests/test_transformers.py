@@ -7,9 +7,11 @@ from unittest import TestCase
 
 from ..block_structure import BlockStructureModulestoreData
 from ..exceptions import TransformerException, TransformerDataIncompatible
+from ..factory import BlockStructureFactory
 from ..transformers import BlockStructureTransformers
 from .helpers import (
-    ChildrenMapTestMixin, MockTransformer, MockFilteringTransformer, mock_registered_transformers
+    ChildrenMapTestMixin, MockModulestoreFactory, MockTransformer, MockFilteringTransformer,
+    mock_registered_transformers
 )
 
 
@@ -82,3 +84,100 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
                 self.transformers.verify_versions(block_structure)
             self.transformers.collect(block_structure)
             self.assertTrue(self.transformers.verify_versions(block_structure))
+
+
+class IncrementalTransformer(MockTransformer):
+    """
+    Mock transformer that supports incremental collection and records the
+    blocks it collects.
+    """
+    INCREMENTAL_COLLECT = True
+    collected_blocks = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        block_structure.request_xblock_fields('display_name')
+        for block_key in block_structure.collect_traversal():
+            cls.collected_blocks.append(block_key)
+            block_structure.set_transformer_block_field(
+                block_key, cls, 'edited_on', block_structure.get_xblock(block_key).edited_on
+            )
+
+
+class FullCollectTransformer(MockTransformer):
+    """
+    Mock transformer that does not support incremental collection.
+    """
+    collect_call_count = 0
+
+    @classmethod
+    def collect(cls, block_structure):
+        cls.collect_call_count += 1
+
+
+@attr(shard=2)
+class TestIncrementalCollect(ChildrenMapTestMixin, TestCase):
+    """
+    Test class for BlockStructureTransformers.collect_incrementally.
+    """
+    def setUp(self):
+        super(TestIncrementalCollect, self).setUp()
+        IncrementalTransformer.collected_blocks = []
+        FullCollectTransformer.collect_call_count = 0
+        self.registered_transformers = [IncrementalTransformer(), FullCollectTransformer()]
+
+        self.modulestore = MockModulestoreFactory.create(self.SIMPLE_CHILDREN_MAP, self.block_key_factory)
+        for block_key, xblock in self.modulestore.blocks.iteritems():
+            xblock.field_map.update(edited_on=1, display_name='block {}'.format(block_key))
+        self.previous_block_structure = self.collect()
+
+    def collect(self, previous_block_structure=None):
+        """
+        Collects the block structure from the mock modulestore, incrementally
+        if a previous block structure is given.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(0, self.modulestore)
+        with mock_registered_transformers(self.registered_transformers):
+            if previous_block_structure:
+                BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+            else:
+                BlockStructureTransformers.collect(block_structure)
+        IncrementalTransformer.collected_blocks, collected_blocks = [], IncrementalTransformer.collected_blocks
+        self.collected_blocks = set(collected_blocks)
+        return block_structure
+
+    def test_nothing_changed(self):
+        block_structure = self.collect(self.previous_block_structure)
+        self.assertEquals(self.collected_blocks, set())
+        self.assertEquals(FullCollectTransformer.collect_call_count, 1)
+        self.assertEquals(block_structure.get_transformer_block_field(3, IncrementalTransformer, 'edited_on'), 1)
+        self.assertEquals(block_structure.get_xblock_field(3, 'display_name'), 'block 3')
+
+    def test_changed_subtree(self):
+        self.modulestore.blocks[1].field_map['edited_on'] = 2
+        block_structure = self.collect(self.previous_block_structure)
+
+        self.assertEquals(self.collected_blocks, {1, 3, 4})
+        self.assertEquals(FullCollectTransformer.collect_call_count, 2)
+        self.assertEquals(block_structure.get_transformer_block_field(1, IncrementalTransformer, 'edited_on'), 2)
+        self.assertEquals(block_structure.get_transformer_block_field(2, IncrementalTransformer, 'edited_on'), 1)
+        self.assertEquals(block_structure.get_xblock_field(2, 'display_name'), 'block 2')
+
+    def test_changed_transformer_version(self):
+        with patch.object(IncrementalTransformer, 'WRITE_VERSION', 2):
+            self.collect(self.previous_block_structure)
+        self.assertEquals(self.collected_blocks, {0, 1, 2, 3, 4})
+        self.assertEquals(FullCollectTransformer.collect_call_count, 1)
+
+    def test_changed_parents(self):
+        self.modulestore = MockModulestoreFactory.create(self.DAG_CHILDREN_MAP, self.block_key_factory)
+        for xblock in self.modulestore.blocks.itervalues():
+            xblock.field_map.update(edited_on=1)
+        previous_block_structure = self.collect()
+
+        # Block 3 is still a child of block 2, which is unchanged, but
+        # its merged data may depend on block 1.
+        self.modulestore.blocks[1].children.remove(3)
+        self.modulestore.blocks[1].field_map['edited_on'] = 2
+        self.collect(previous_block_structure)
+        self.assertEquals(self.collected_blocks, {1, 3, 5, 6})
@@ -55,6 +55,20 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Transformers whose collected data for a block depends only on
+    # that block's xBlock and on the data collected for its ancestors
+    # may set INCREMENTAL_COLLECT to True.  When a course is updated
+    # and the block_structure.incremental_collect waffle switch is
+    # enabled, their data is then only collected again for the blocks
+    # that changed (and their descendants), and reused for all other
+    # blocks.
+    #
+    # Such transformers must only store block-specific data (using
+    # set_transformer_block_field) and must iterate over the blocks
+    # using collect_traversal rather than topological_traversal in
+    # their collect method.
+    INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
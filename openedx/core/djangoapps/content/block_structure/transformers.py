@@ -4,6 +4,7 @@ Module for a collection of BlockStructureTransformers.
 import functools
 from logging import getLogger
 
+from .block_structure import EDITED_ON_FIELD, TRANSFORMER_REQUESTED_FIELDS_KEY
 from .exceptions import TransformerException, TransformerDataIncompatible
 from .transformer import FilteringTransformerMixin
 from .transformer_registry import TransformerRegistry
@@ -76,12 +77,91 @@ class BlockStructureTransformers(object):
         Collects data for each registered transformer.
         """
         for transformer in TransformerRegistry.get_registered_transformers():
-            block_structure._add_transformer(transformer)  # pylint: disable=protected-access
-            transformer.collect(block_structure)
+            cls._collect_transformer(block_structure, transformer)
 
         # Collect all fields that were requested by the transformers.
+        block_structure.request_xblock_fields(EDITED_ON_FIELD)
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def collect_incrementally(cls, block_structure, previous_block_structure):
+        """
+        Collects data for each registered transformer, reusing the data
+        collected in previous_block_structure wherever the inputs of a
+        transformer did not change.
+
+        The data of a transformer is reused as is when no block changed
+        since the previous collect and the transformer's WRITE_VERSION is
+        unchanged.  When blocks changed, transformers that support
+        incremental collection (INCREMENTAL_COLLECT) only collect the
+        changed blocks and reuse their data for all other blocks, while
+        all other transformers collect the entire structure.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - The block
+                structure to collect, freshly created from the modulestore.
+
+            previous_block_structure (BlockStructureBlockData) - The block
+                structure previously collected for the same root block.
+        """
+        # pylint: disable=protected-access
+        changed_blocks = block_structure._get_changed_blocks(previous_block_structure)
+        unchanged_blocks = [block_key for block_key in block_structure if block_key not in changed_blocks]
+        reused_transformers = []
+
+        for transformer in TransformerRegistry.get_registered_transformers():
+            requested_fields = previous_block_structure.get_transformer_data(
+                transformer, TRANSFORMER_REQUESTED_FIELDS_KEY
+            )
+            is_reusable = (
+                requested_fields is not None and
+                previous_block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION and
+                (not changed_blocks or (transformer.INCREMENTAL_COLLECT and unchanged_blocks))
+            )
+            if not is_reusable:
+                cls._collect_transformer(block_structure, transformer)
+                continue
+
+            reused_transformers.append(transformer.name())
+            block_structure._copy_transformer_data(previous_block_structure, transformer, unchanged_blocks)
+            block_structure.request_xblock_fields(*requested_fields)
+            if changed_blocks:
+                block_structure._blocks_to_collect = changed_blocks
+                try:
+                    cls._collect_transformer(block_structure, transformer)
+                finally:
+                    block_structure._blocks_to_collect = None
+
+        logger.info(
+            "BlockStructure: Incrementally collected %s; changed blocks: %d of %d, reused transformers: %s.",
+            unicode(block_structure.root_block_usage_key),
+            len(changed_blocks),
+            len(block_structure),
+            sorted(reused_transformers),
+        )
+
+        # Collect all fields that were requested by the transformers.
+        block_structure.request_xblock_fields(EDITED_ON_FIELD)
+        block_structure._collect_requested_xblock_fields()
+
+    @classmethod
+    def _collect_transformer(cls, block_structure, transformer):
+        """
+        Collects data for the given transformer, recording the xBlock
+        fields it requests so they can be requested again when its data
+        is reused by a later incremental collect.
+        """
+        # pylint: disable=protected-access
+        previously_requested_fields = block_structure._requested_xblock_fields
+        block_structure._requested_xblock_fields = set()
+
+        block_structure._add_transformer(transformer)
+        transformer.collect(block_structure)
+
+        requested_fields = block_structure._requested_xblock_fields
+        block_structure.set_transformer_data(transformer, TRANSFORMER_REQUESTED_FIELDS_KEY, set(requested_fields))
+        block_structure._requested_xblock_fields = previously_requested_fields | requested_fields
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
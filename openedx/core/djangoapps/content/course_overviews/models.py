@@ -3,6 +3,8 @@ Declaration of CourseOverview model
 """
 import json
 import logging
+import threading
+from collections import OrderedDict
 from urlparse import urlparse, urlunparse
 
 from django.conf import settings
@@ -27,6 +29,9 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, UsageK
 
 log = logging.getLogger(__name__)
 
+# Maximum number of CourseOverviews kept in each process by CourseOverview.get_many.
+COURSE_OVERVIEW_PROCESS_CACHE_SIZE = 2000
+
 
 class CourseOverview(TimeStampedModel):
     """
@@ -103,6 +108,12 @@ class CourseOverview(TimeStampedModel):
 
     language = TextField(null=True)
 
+    # Per-process LRU of overviews loaded by get_many, keyed by course id. An
+    # entry is only reused while its version and modified timestamp match the
+    # database, so overviews regenerated by any process are picked up.
+    _process_cache = OrderedDict()
+    _process_cache_lock = threading.Lock()
+
     @classmethod
     def _create_or_update(cls, course):
         """
@@ -319,6 +330,98 @@ class CourseOverview(TimeStampedModel):
             )
         }
 
+    @classmethod
+    def get_many(cls, course_ids, defer_regeneration=False):
+        """
+        Return a dict mapping course_ids to CourseOverviews, loading all of
+        them in bulk.
+
+        Up-to-date overviews are loaded with a single query (along with their
+        image sets and tabs), and are reused from a per-process cache when they
+        haven't changed since they were last loaded.  Overviews that are
+        missing or outdated are regenerated from the modulestore, like
+        get_from_id does, unless defer_regeneration is True, in which case
+        they are regenerated by a celery task and left out of the result.
+
+        The returned overviews may be shared with other requests of this
+        process, so callers must not modify them.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded.
+            defer_regeneration (bool): whether to regenerate missing and
+                outdated overviews in the background instead of synchronously.
+
+        Returns:
+            dict[CourseKey, CourseOverview]: overviews of the requested courses
+                that exist (or could be generated).
+        """
+        course_ids = set(course_ids)
+        if not course_ids:
+            return {}
+
+        overviews = {}
+        ids_to_load = []
+        current_versions = cls.objects.filter(id__in=course_ids).values_list('id', 'version', 'modified')
+        with cls._process_cache_lock:
+            for course_id, version, modified in current_versions:
+                course_id = CourseKey.from_string(course_id) if isinstance(course_id, basestring) else course_id
+                if version < cls.VERSION:
+                    continue
+                cached = cls._process_cache.pop(course_id, None)
+                if cached is not None and cached.modified == modified:
+                    cls._process_cache[course_id] = cached
+                    overviews[course_id] = cached
+                else:
+                    ids_to_load.append(course_id)
+
+        if ids_to_load:
+            loaded = list(
+                cls.objects.select_related('image_set').prefetch_related('tabs').filter(id__in=ids_to_load)
+            )
+            # Regenerate the thumbnail images if they're missing, as get_from_id does.
+            missing_image_sets = [overview for overview in loaded if not hasattr(overview, 'image_set')]
+            if missing_image_sets and CourseOverviewImageConfig.current().enabled:
+                for course_overview in missing_image_sets:
+                    CourseOverviewImageSet.create(course_overview)
+            overviews.update((course_overview.id, course_overview) for course_overview in loaded)
+            cls._add_to_process_cache(loaded)
+
+        ids_to_regenerate = course_ids - set(overviews)
+        if ids_to_regenerate:
+            if defer_regeneration:
+                from .tasks import schedule_course_overview_update
+                schedule_course_overview_update(ids_to_regenerate)
+            else:
+                for course_id in ids_to_regenerate:
+                    try:
+                        overviews[course_id] = cls.get_from_id(course_id)
+                    except (cls.DoesNotExist, IOError):
+                        log.warning('Unable to generate course overview for %s.', unicode(course_id))
+
+        return overviews
+
+    @classmethod
+    def _add_to_process_cache(cls, course_overviews):
+        """
+        Add the given overviews to the per-process cache, evicting the least
+        recently used ones beyond COURSE_OVERVIEW_PROCESS_CACHE_SIZE.
+        """
+        with cls._process_cache_lock:
+            for course_overview in course_overviews:
+                cls._process_cache.pop(course_overview.id, None)
+                cls._process_cache[course_overview.id] = course_overview
+            while len(cls._process_cache) > COURSE_OVERVIEW_PROCESS_CACHE_SIZE:
+                cls._process_cache.popitem(last=False)
+
+    @classmethod
+    def clear_process_cache(cls):
+        """
+        Empty the per-process cache used by get_many.
+        """
+        with cls._process_cache_lock:
+            cls._process_cache.clear()
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -0,0 +1,54 @@
+"""
+Asynchronous tasks related to the Course Overviews sub-application
+"""
+import logging
+
+from celery.task import task
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+log = logging.getLogger('edx.celery.task')
+
+# Number of courses regenerated by each task, so that large batches are spread across workers.
+COURSE_OVERVIEW_TASK_CHUNK_SIZE = 10
+
+# Seconds during which a course whose regeneration was scheduled is not scheduled again.
+COURSE_OVERVIEW_REGENERATION_LOCK_TIMEOUT = 5 * 60
+COURSE_OVERVIEW_REGENERATION_LOCK_KEY_TPL = u'course_overviews.regeneration_scheduled.{}'
+
+
+def schedule_course_overview_update(course_ids):
+    """
+    Schedules the regeneration of the given course overviews, in chunks of
+    COURSE_OVERVIEW_TASK_CHUNK_SIZE courses.  Courses already scheduled within
+    the last COURSE_OVERVIEW_REGENERATION_LOCK_TIMEOUT seconds are skipped.
+    """
+    course_ids = [
+        unicode(course_id) for course_id in course_ids
+        if cache.add(
+            COURSE_OVERVIEW_REGENERATION_LOCK_KEY_TPL.format(course_id),
+            True,
+            COURSE_OVERVIEW_REGENERATION_LOCK_TIMEOUT,
+        )
+    ]
+    for index in range(0, len(course_ids), COURSE_OVERVIEW_TASK_CHUNK_SIZE):
+        async_course_overview_update.delay(*course_ids[index:index + COURSE_OVERVIEW_TASK_CHUNK_SIZE])
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.async_course_overview_update')
+def async_course_overview_update(*course_ids):
+    """
+    Regenerates the course overviews of the given courses from the modulestore.
+
+    Course ids are passed as strings, since course keys are not JSON-serializable.
+    """
+    # Import here to avoid circular import.
+    from .models import CourseOverview
+
+    for course_id in course_ids:
+        try:
+            CourseOverview.get_from_id(CourseKey.from_string(course_id))
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u'An error occurred while generating course overview for %s', course_id)
+        finally:
+            cache.delete(COURSE_OVERVIEW_REGENERATION_LOCK_KEY_TPL.format(course_id))
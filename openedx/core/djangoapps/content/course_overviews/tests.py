@@ -545,6 +545,64 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
         self.assertEqual(len(course_ids_to_overviews), 1)
         self.assertIn(course_with_overview_1.id, course_ids_to_overviews)
 
+    def test_get_many(self):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_with_old_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        courses = [course_with_overview, course_with_old_overview, course_without_overview]
+
+        old_overview = CourseOverview.get_from_id(course_with_old_overview.id)
+        old_overview.version = CourseOverview.VERSION - 1
+        old_overview.save()
+
+        # Missing and outdated overviews are regenerated.
+        CourseOverview.clear_process_cache()
+        course_ids_to_overviews = CourseOverview.get_many(course.id for course in courses)
+        self.assertEqual(set(course_ids_to_overviews), {course.id for course in courses})
+        for course_overview in course_ids_to_overviews.itervalues():
+            self.assertEqual(course_overview.version, CourseOverview.VERSION)
+
+        # Up-to-date overviews are reused from the process cache, after
+        # checking they haven't changed.
+        with self.assertNumQueries(1):
+            cached_overviews = CourseOverview.get_many(course.id for course in courses)
+        self.assertEqual(cached_overviews, course_ids_to_overviews)
+        self.assertIs(cached_overviews[course_with_overview.id], course_ids_to_overviews[course_with_overview.id])
+
+        # Modified overviews are reloaded.
+        CourseOverview.load_from_module_store(course_with_overview.id)
+        reloaded_overview = CourseOverview.get_many([course_with_overview.id])[course_with_overview.id]
+        self.assertIsNot(reloaded_overview, course_ids_to_overviews[course_with_overview.id])
+
+    def test_get_many_bulk_query(self):
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        CourseOverview.clear_process_cache()
+
+        # One query for the versions, one for the overviews and their image
+        # sets, and one for their tabs.
+        disabled_config = CourseOverviewImageConfig(enabled=False)
+        with mock.patch.object(CourseOverviewImageConfig, 'current', return_value=disabled_config):
+            with self.assertNumQueries(3):
+                course_ids_to_overviews = CourseOverview.get_many(course_ids)
+                for course_overview in course_ids_to_overviews.itervalues():
+                    list(course_overview.tabs.all())
+        self.assertEqual(set(course_ids_to_overviews), set(course_ids))
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.tasks.async_course_overview_update.delay')
+    def test_get_many_deferred_regeneration(self, mock_delay):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+
+        course_ids_to_overviews = CourseOverview.get_many(
+            [course_with_overview.id, course_without_overview.id], defer_regeneration=True
+        )
+        self.assertEqual(set(course_ids_to_overviews), {course_with_overview.id})
+        mock_delay.assert_called_once_with(unicode(course_without_overview.id))
+
+        # The regeneration isn't scheduled again while it is pending.
+        CourseOverview.get_many([course_without_overview.id], defer_regeneration=True)
+        self.assertEqual(mock_delay.call_count, 1)
+
 
 @attr(shard=3)
 @ddt.ddt
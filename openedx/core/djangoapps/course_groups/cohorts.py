@@ -5,14 +5,19 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+import threading
+from collections import defaultdict
+from uuid import uuid4
 
 import request_cache
 from courseware import courses
 from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
 from django.core.exceptions import ValidationError
+from django.core.signals import request_finished, request_started
 from django.core.validators import validate_email
 from django.db import IntegrityError, transaction
-from django.db.models.signals import m2m_changed, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import ugettext as _
@@ -45,7 +50,10 @@ def _cohort_added(sender, **kwargs):
 
 @receiver(m2m_changed, sender=CourseUserGroup.users.through)
 def _cohort_membership_changed(sender, **kwargs):
-    """Emits a tracking log event each time cohort membership is modified"""
+    """
+    Emits a tracking log event each time cohort membership is modified, and
+    invalidates the cached cohort memberships of the users concerned.
+    """
     def get_event_iter(user_id_iter, cohort_iter):
         """
         Returns a dictionary containing a mashup of cohort and user information for the given lists
@@ -71,20 +79,37 @@ def _cohort_membership_changed(sender, **kwargs):
     if reverse:
         user_id_iter = [instance.id]
         if action == "pre_clear":
-            cohort_iter = instance.course_groups.filter(group_type=CourseUserGroup.COHORT)
+            cohort_iter = list(instance.course_groups.filter(group_type=CourseUserGroup.COHORT))
         else:
-            cohort_iter = CourseUserGroup.objects.filter(pk__in=pk_set, group_type=CourseUserGroup.COHORT)
+            cohort_iter = list(CourseUserGroup.objects.filter(pk__in=pk_set, group_type=CourseUserGroup.COHORT))
+        for course_key in set(cohort.course_id for cohort in cohort_iter):
+            _invalidate_cohort_membership_cache(course_key, user_id_iter)
     else:
         cohort_iter = [instance] if instance.group_type == CourseUserGroup.COHORT else []
         if action == "pre_clear":
             user_id_iter = (user.id for user in instance.users.all())
+            if cohort_iter:
+                _invalidate_course_cohort_cache(instance.course_id)
         else:
             user_id_iter = pk_set
+            if cohort_iter:
+                _invalidate_cohort_membership_cache(instance.course_id, pk_set)
 
     for event in get_event_iter(user_id_iter, cohort_iter):
         tracker.emit(event_name, event)
 
 
+@receiver(post_save, sender=CourseUserGroup)
+@receiver(post_delete, sender=CourseUserGroup)
+def _cohort_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached cohorts and cohort memberships of the course each
+    time one of its cohorts is modified or deleted.
+    """
+    if instance.group_type == CourseUserGroup.COHORT:
+        _invalidate_course_cohort_cache(instance.course_id)
+
+
 # A 'default cohort' is an auto-cohort that is automatically created for a course if no cohort with automatic
 # assignment have been specified. It is intended to be used in a cohorted course for users who have yet to be assigned
 # to a cohort, if the course staff have not explicitly created a cohort of type "RANDOM".
@@ -159,6 +184,13 @@ def get_cohort_id(user, course_key, use_cached=False):
 
 COHORT_CACHE_NAMESPACE = u"cohorts.get_cohort"
 
+# Cohort memberships are also cached across requests, as a mapping of
+# (user, course) to cohort id.  The cache keys of a course include a version
+# which is replaced whenever all of its cached memberships and cohorts must
+# be invalidated at once, as when a cohort is renamed or deleted.
+COHORT_MEMBERSHIP_CACHE_TIMEOUT = 60 * 60
+_NO_COHORT_ID = 0
+
 
 def _cohort_cache_key(user_id, course_key):
     """
@@ -167,6 +199,168 @@ def _cohort_cache_key(user_id, course_key):
     return u"{}.{}".format(user_id, course_key)
 
 
+def _course_cohort_cache_version(course_key):
+    """
+    Returns the current version of the cross-request cache entries of the
+    given course, creating one if it has none yet.
+    """
+    version_key = u"cohorts.version.{}".format(course_key)
+    version = django_cache.get(version_key)
+    if version is None:
+        django_cache.add(version_key, uuid4().hex, None)
+        version = django_cache.get(version_key)
+    return version
+
+
+def _cohort_membership_cache_key(course_key, version, user_id):
+    """
+    Returns the cross-request cache key of the cohort membership of the given
+    user in the given version of the course cache entries.
+    """
+    return u"cohorts.membership.{}.{}.{}".format(course_key, version, user_id)
+
+
+class _PendingCohortCacheInvalidations(threading.local):
+    """
+    The cache invalidations requested by this thread inside a transaction,
+    to be repeated once it is committed.
+    """
+    def __init__(self):
+        super(_PendingCohortCacheInvalidations, self).__init__()
+        self.course_keys = set()
+        self.user_ids_by_course_key = defaultdict(set)
+
+
+_pending_invalidations = _PendingCohortCacheInvalidations()
+
+
+def _invalidate_course_cohort_cache(course_key):
+    """
+    Invalidates the cached cohorts and cohort memberships of the given course.
+    """
+    request_cache.clear_cache(COHORT_CACHE_NAMESPACE)
+    django_cache.set(u"cohorts.version.{}".format(course_key), uuid4().hex, None)
+    if transaction.get_connection().in_atomic_block:
+        _pending_invalidations.course_keys.add(course_key)
+
+
+def _invalidate_cohort_membership_cache(course_key, user_ids):
+    """
+    Invalidates the cached cohort memberships of the given users in the given
+    course.
+    """
+    user_ids = set(user_ids)
+    cache = request_cache.get_cache(COHORT_CACHE_NAMESPACE)
+    for user_id in user_ids:
+        cache.pop(_cohort_cache_key(user_id, course_key), None)
+    version = _course_cohort_cache_version(course_key)
+    django_cache.delete_many([_cohort_membership_cache_key(course_key, version, user_id) for user_id in user_ids])
+    if transaction.get_connection().in_atomic_block:
+        _pending_invalidations.user_ids_by_course_key[course_key].update(user_ids)
+
+
+def _invalidate_cohort_caches_after_commit():
+    """
+    Repeats the cache invalidations requested inside the transaction that this
+    thread just committed.
+
+    Caches are invalidated as soon as cohorts change, from signal handlers, but
+    other processes can still read and cache the previous state until the change
+    is committed.  Django 1.8 has no hook to run code on commit, so the functions
+    of this module that change cohorts call this after their transaction, and it
+    is called again when a request finishes, after the transaction of the request
+    has been committed.  While the thread is still inside a transaction, as in a
+    view with ATOMIC_REQUESTS, the invalidations are left pending until then.
+    """
+    if transaction.get_connection().in_atomic_block:
+        return
+
+    course_keys = _pending_invalidations.course_keys
+    user_ids_by_course_key = _pending_invalidations.user_ids_by_course_key
+    _pending_invalidations.course_keys = set()
+    _pending_invalidations.user_ids_by_course_key = defaultdict(set)
+
+    for course_key in course_keys:
+        _invalidate_course_cohort_cache(course_key)
+    for course_key, user_ids in user_ids_by_course_key.iteritems():
+        if course_key not in course_keys:
+            _invalidate_cohort_membership_cache(course_key, user_ids)
+
+
+@receiver(request_started, dispatch_uid='cohorts.clear_pending_cache_invalidations')
+def _clear_pending_cohort_cache_invalidations(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the invalidations left pending by a previous request of this thread.
+    """
+    _pending_invalidations.course_keys = set()
+    _pending_invalidations.user_ids_by_course_key = defaultdict(set)
+
+
+@receiver(request_finished, dispatch_uid='cohorts.invalidate_caches_after_request')
+def _invalidate_cohort_caches_after_request(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Repeats the cache invalidations requested during the request, once its
+    transaction has been committed.
+    """
+    _invalidate_cohort_caches_after_commit()
+
+
+def _get_course_cohorts_by_id(course_key, version):
+    """
+    Returns a dict mapping the ids of the cohorts of the given course to the
+    cohorts, cached across requests in the given version of the course cache
+    entries.
+    """
+    cache_key = u"cohorts.cohorts.{}.{}".format(course_key, version)
+    cohorts_by_id = django_cache.get(cache_key)
+    if cohorts_by_id is None:
+        cohorts_by_id = CourseUserGroup.objects.filter(
+            course_id=course_key, group_type=CourseUserGroup.COHORT,
+        ).in_bulk()
+        django_cache.set(cache_key, cohorts_by_id, COHORT_MEMBERSHIP_CACHE_TIMEOUT)
+    return cohorts_by_id
+
+
+def _get_cohorts_for_users(course_key, user_ids):
+    """
+    Returns a dict mapping each of the given user ids to the user's cohort in
+    the given course, or None if the user has no cohort.
+
+    Memberships are read from the cross-request cache with a single get_many,
+    and only the users missing from it are looked up in the database.
+    """
+    version = _course_cohort_cache_version(course_key)
+    cache_keys = {
+        user_id: _cohort_membership_cache_key(course_key, version, user_id) for user_id in user_ids
+    }
+    cached = django_cache.get_many(cache_keys.values())
+    cohort_ids = {
+        user_id: cached[cache_key] for user_id, cache_key in cache_keys.iteritems() if cache_key in cached
+    }
+
+    missing_user_ids = [user_id for user_id in user_ids if user_id not in cohort_ids]
+    if missing_user_ids:
+        found = {}
+        for user_ids_chunk in _chunks(missing_user_ids):
+            found.update(
+                CohortMembership.objects.filter(
+                    course_id=course_key, user_id__in=user_ids_chunk,
+                ).values_list('user_id', 'course_user_group_id')
+            )
+        missing_cohort_ids = {user_id: found.get(user_id, _NO_COHORT_ID) for user_id in missing_user_ids}
+        django_cache.set_many(
+            {cache_keys[user_id]: cohort_id for user_id, cohort_id in missing_cohort_ids.iteritems()},
+            COHORT_MEMBERSHIP_CACHE_TIMEOUT,
+        )
+        cohort_ids.update(missing_cohort_ids)
+
+    if any(cohort_id != _NO_COHORT_ID for cohort_id in cohort_ids.itervalues()):
+        cohorts_by_id = _get_course_cohorts_by_id(course_key, version)
+    else:
+        cohorts_by_id = {}
+    return {user_id: cohorts_by_id.get(cohort_id) for user_id, cohort_id in cohort_ids.iteritems()}
+
+
 def bulk_cache_cohorts(course_key, users):
     """
     Pre-fetches and caches the cohort assignments for the
@@ -178,26 +372,20 @@ def bulk_cache_cohorts(course_key, users):
     cache = request_cache.get_cache(COHORT_CACHE_NAMESPACE)
 
     if is_course_cohorted(course_key):
-        cohorts_by_user = {
-            membership.user: membership
-            for membership in
-            CohortMembership.objects.filter(user__in=users, course_id=course_key).select_related('user__id')
-        }
-        for user, membership in cohorts_by_user.iteritems():
-            cache[_cohort_cache_key(user.id, course_key)] = membership.course_user_group
-        uncohorted_users = filter(lambda u: u not in cohorts_by_user, users)
+        cohorts_by_user_id = _get_cohorts_for_users(course_key, [user.id for user in users])
     else:
-        uncohorted_users = users
+        cohorts_by_user_id = {}
 
-    for user in uncohorted_users:
-        cache[_cohort_cache_key(user.id, course_key)] = None
+    for user in users:
+        cache[_cohort_cache_key(user.id, course_key)] = cohorts_by_user_id.get(user.id)
 
 
 def get_cohort(user, course_key, assign=True, use_cached=False):
     """
     Returns the user's cohort for the specified course.
 
-    The cohort for the user is cached for the duration of a request. Pass
+    The cohort for the user is cached for the duration of a request, and
+    across requests until the user's cohort membership changes. Pass
     use_cached=True to use the cached value instead of fetching from the
     database.
 
@@ -228,18 +416,26 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
         return cache.setdefault(cache_key, None)
 
     # If course is cohorted, check if the user already has a cohort.
-    try:
-        membership = CohortMembership.objects.get(
-            course_id=course_key,
-            user_id=user.id,
-        )
-        return cache.setdefault(cache_key, membership.course_user_group)
-    except CohortMembership.DoesNotExist:
+    if use_cached:
+        cohort = _get_cohorts_for_users(course_key, [user.id])[user.id]
+        if cohort is not None:
+            return cache.setdefault(cache_key, cohort)
         # Didn't find the group. If we do not want to assign, return here.
         if not assign:
-            # Do not cache the cohort here, because in the next call assign
-            # may be True, and we will have to assign the user a cohort.
             return None
+    else:
+        try:
+            membership = CohortMembership.objects.get(
+                course_id=course_key,
+                user_id=user.id,
+            )
+            return cache.setdefault(cache_key, membership.course_user_group)
+        except CohortMembership.DoesNotExist:
+            # Didn't find the group. If we do not want to assign, return here.
+            if not assign:
+                # Do not cache the cohort here, because in the next call assign
+                # may be True, and we will have to assign the user a cohort.
+                return None
 
     # Otherwise assign the user a cohort.
     try:
@@ -260,7 +456,8 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
                 course_user_group=course_user_group,
             )
 
-            return cache.setdefault(cache_key, membership.course_user_group)
+        _invalidate_cohort_caches_after_commit()
+        return cache.setdefault(cache_key, membership.course_user_group)
     except IntegrityError as integrity_error:
         # An IntegrityError is raised when multiple workers attempt to
         # create the same row in one of the cohort model entries:
@@ -269,7 +466,9 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
             "HANDLING_INTEGRITY_ERROR: IntegrityError encountered for course '%s' and user '%s': %s",
             course_key, user.id, unicode(integrity_error)
         )
-        return get_cohort(user, course_key, assign, use_cached)
+        # Read the membership created by the other worker from the database,
+        # in case the cached membership was not invalidated yet.
+        return get_cohort(user, course_key, assign, use_cached=False)
 
 
 def get_random_cohort(course_key):
@@ -427,6 +626,7 @@ def remove_user_from_cohort(cohort, username_or_email):
         membership.delete()
     except CohortMembership.DoesNotExist:
         raise ValueError("User {} was not present in cohort {}".format(username_or_email, cohort))
+    _invalidate_cohort_caches_after_commit()
 
 
 def add_user_to_cohort(cohort, username_or_email):
@@ -454,6 +654,7 @@ def add_user_to_cohort(cohort, username_or_email):
 
         membership = CohortMembership(course_user_group=cohort, user=user)
         membership.save()  # This will handle both cases, creation and updating, of a CohortMembership for this user.
+        _invalidate_cohort_caches_after_commit()
 
         tracker.emit(
             "edx.cohort.user_add_requested",
@@ -499,6 +700,238 @@ def add_user_to_cohort(cohort, username_or_email):
                 raise ex
 
 
+# Outcomes of bulk_add_users_to_cohorts for each assignment, matching the
+# results and exceptions of add_user_to_cohort.
+COHORT_ASSIGNMENT_ADDED = 'added'
+COHORT_ASSIGNMENT_PREASSIGNED = 'preassigned'
+COHORT_ASSIGNMENT_ALREADY_PRESENT = 'already_present'
+COHORT_ASSIGNMENT_USER_NOT_FOUND = 'user_not_found'
+COHORT_ASSIGNMENT_INVALID_EMAIL = 'invalid_email'
+
+# Number of users or email addresses looked up or updated per query.
+BULK_COHORT_CHUNK_SIZE = 1000
+
+
+def _chunks(items, chunk_size=BULK_COHORT_CHUNK_SIZE):
+    """
+    Yields successive chunks of the given list.
+    """
+    for index in xrange(0, len(items), chunk_size):
+        yield items[index:index + chunk_size]
+
+
+def bulk_add_users_to_cohorts(course_key, assignments):
+    """
+    Adds users to cohorts of the given course in bulk.
+
+    This is equivalent to calling add_user_to_cohort for each assignment in
+    order, but users, memberships and preassignments are looked up and
+    updated with a few queries per chunk of users rather than per
+    assignment.  Cohort membership changes are signalled once per cohort.
+
+    Arguments:
+        course_key: CourseKey of the course
+        assignments: list of (username_or_email, cohort) tuples, where
+            cohort is a CourseUserGroup of the course
+
+    Returns:
+        A list with the outcome of each assignment, one of the
+        COHORT_ASSIGNMENT_* values.
+    """
+    users_by_identifier = _bulk_get_users_by_username_or_email(
+        [username_or_email for username_or_email, __ in assignments]
+    )
+    user_ids = list({user_id for user_id, __ in users_by_identifier.itervalues()})
+    initial_cohort_ids = {}
+    for user_ids_chunk in _chunks(user_ids):
+        initial_cohort_ids.update(
+            CohortMembership.objects.filter(
+                course_id=course_key, user_id__in=user_ids_chunk,
+            ).values_list('user_id', 'course_user_group_id')
+        )
+
+    cohorts = {cohort.id: cohort for __, cohort in assignments}
+    missing_cohort_ids = set(initial_cohort_ids.itervalues()) - set(cohorts)
+    if missing_cohort_ids:
+        cohorts.update(CourseUserGroup.objects.in_bulk(missing_cohort_ids))
+
+    # Replay the assignments in memory to compute their outcomes and the final state.
+    cohort_ids = dict(initial_cohort_ids)
+    preassignments = {}
+    outcomes = []
+    events = []
+    for username_or_email, cohort in assignments:
+        user = users_by_identifier.get(username_or_email.lower())
+        if user is not None:
+            user_id, __ = user
+            previous_cohort_id = cohort_ids.get(user_id)
+            if previous_cohort_id == cohort.id:
+                outcomes.append(COHORT_ASSIGNMENT_ALREADY_PRESENT)
+                continue
+            cohort_ids[user_id] = cohort.id
+            previous_cohort = cohorts.get(previous_cohort_id)
+            events.append(("edx.cohort.user_add_requested", {
+                "user_id": user_id,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+                "previous_cohort_id": previous_cohort_id,
+                "previous_cohort_name": previous_cohort.name if previous_cohort else None,
+            }))
+            outcomes.append(COHORT_ASSIGNMENT_ADDED)
+        else:
+            try:
+                validate_email(username_or_email)
+            except ValidationError:
+                if "@" in username_or_email:
+                    outcomes.append(COHORT_ASSIGNMENT_INVALID_EMAIL)
+                else:
+                    outcomes.append(COHORT_ASSIGNMENT_USER_NOT_FOUND)
+                continue
+            preassignments[username_or_email] = cohort
+            events.append(("edx.cohort.email_address_preassigned", {
+                "user_email": username_or_email,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+            }))
+            outcomes.append(COHORT_ASSIGNMENT_PREASSIGNED)
+
+    changed_user_ids = [
+        user_id for user_id, cohort_id in cohort_ids.iteritems()
+        if initial_cohort_ids.get(user_id) != cohort_id
+    ]
+    for user_ids_chunk in _chunks(changed_user_ids):
+        _bulk_update_cohort_memberships(
+            course_key, cohorts, {user_id: initial_cohort_ids.get(user_id) for user_id in user_ids_chunk},
+            {user_id: cohort_ids[user_id] for user_id in user_ids_chunk},
+        )
+        _invalidate_cohort_caches_after_commit()
+    _bulk_update_preassignments(course_key, preassignments)
+
+    for event_name, event in events:
+        tracker.emit(event_name, event)
+    return outcomes
+
+
+def _bulk_get_users_by_username_or_email(usernames_or_emails):
+    """
+    Returns a dict mapping each of the given usernames and email addresses
+    that identifies a user, in lower case, to a (user id, username) tuple.
+    Strings are looked up as email addresses if they contain an '@', as
+    usernames otherwise, as done by get_user_by_username_or_email.
+    """
+    emails = sorted({value for value in usernames_or_emails if '@' in value})
+    usernames = sorted({value for value in usernames_or_emails if '@' not in value})
+    users = {}
+    for emails_chunk in _chunks(emails):
+        for user_id, username, email in User.objects.filter(email__in=emails_chunk).values_list(
+                'id', 'username', 'email'):
+            users.setdefault(email.lower(), (user_id, username))
+    for usernames_chunk in _chunks(usernames):
+        for user_id, username in User.objects.filter(username__in=usernames_chunk).values_list('id', 'username'):
+            users.setdefault(username.lower(), (user_id, username))
+    return users
+
+
+def _bulk_update_cohort_memberships(course_key, cohorts, previous_cohort_ids, new_cohort_ids):
+    """
+    Moves the given users from their previous cohort, if any, to their new
+    cohort, updating both CohortMembership and the CourseUserGroup users.
+
+    If memberships were concurrently created for some of the users, falls
+    back to saving the memberships one by one.
+    """
+    memberships_through = CourseUserGroup.users.through
+    removed = _group_by_value({
+        user_id: cohort_id for user_id, cohort_id in previous_cohort_ids.iteritems() if cohort_id is not None
+    })
+    added = _group_by_value(new_cohort_ids)
+    try:
+        with transaction.atomic():
+            CohortMembership.objects.bulk_create([
+                CohortMembership(course_user_group_id=cohort_id, user_id=user_id, course_id=course_key)
+                for user_id, cohort_id in new_cohort_ids.iteritems()
+                if previous_cohort_ids[user_id] is None
+            ])
+            for cohort_id, user_ids in added.iteritems():
+                CohortMembership.objects.filter(
+                    course_id=course_key, user_id__in=[
+                        user_id for user_id in user_ids if previous_cohort_ids[user_id] is not None
+                    ],
+                ).update(course_user_group=cohort_id)
+
+            for cohort_id, user_ids in removed.iteritems():
+                _send_cohort_membership_signals(cohorts[cohort_id], 'remove', user_ids)
+                memberships_through.objects.filter(courseusergroup_id=cohort_id, user_id__in=user_ids).delete()
+                _send_cohort_membership_signals(cohorts[cohort_id], 'remove', user_ids, post=True)
+
+            for cohort_id, user_ids in added.iteritems():
+                _send_cohort_membership_signals(cohorts[cohort_id], 'add', user_ids)
+                memberships_through.objects.bulk_create([
+                    memberships_through(courseusergroup_id=cohort_id, user_id=user_id) for user_id in user_ids
+                ])
+                _send_cohort_membership_signals(cohorts[cohort_id], 'add', user_ids, post=True)
+    except IntegrityError:
+        log.warning(u"Cohort memberships were concurrently updated in %s; saving them one by one.", course_key)
+        users = User.objects.in_bulk(new_cohort_ids.keys())
+        for user_id, cohort_id in new_cohort_ids.iteritems():
+            try:
+                CohortMembership(course_user_group=cohorts[cohort_id], user=users[user_id]).save()
+            except ValueError:
+                pass
+
+
+def _group_by_value(values_by_key):
+    """
+    Returns a dict mapping each value of the given dict to the list of its keys.
+    """
+    keys_by_value = {}
+    for key, value in values_by_key.iteritems():
+        keys_by_value.setdefault(value, []).append(key)
+    return keys_by_value
+
+
+def _send_cohort_membership_signals(cohort, action, user_ids, post=False):
+    """
+    Sends the m2m_changed signal for users added to or removed from the
+    cohort by bulk queries, as done by the CourseUserGroup.users manager.
+    """
+    m2m_changed.send(
+        sender=CourseUserGroup.users.through,
+        instance=cohort,
+        action=u'{}_{}'.format('post' if post else 'pre', action),
+        reverse=False,
+        model=User,
+        pk_set=set(user_ids),
+        using=CourseUserGroup.objects.db,
+    )
+
+
+def _bulk_update_preassignments(course_key, preassignments):
+    """
+    Creates or updates the UnregisteredLearnerCohortAssignments of the
+    given email addresses, given as a dict mapping them to their cohort.
+    """
+    emails = preassignments.keys()
+    for emails_chunk in _chunks(emails):
+        existing = set(
+            UnregisteredLearnerCohortAssignments.objects.filter(
+                course_id=course_key, email__in=emails_chunk,
+            ).values_list('email', flat=True)
+        )
+        with transaction.atomic():
+            for cohort, chunk_emails in _group_by_value(
+                    {email: preassignments[email] for email in emails_chunk if email in existing}).iteritems():
+                UnregisteredLearnerCohortAssignments.objects.filter(
+                    course_id=course_key, email__in=chunk_emails,
+                ).update(course_user_group=cohort)
+            UnregisteredLearnerCohortAssignments.objects.bulk_create([
+                UnregisteredLearnerCohortAssignments(
+                    course_user_group=preassignments[email], email=email, course_id=course_key,
+                )
+                for email in emails_chunk if email not in existing
+            ])
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
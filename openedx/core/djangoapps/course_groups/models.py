@@ -146,7 +146,6 @@ def remove_user_from_cohort(sender, instance, **kwargs):  # pylint: disable=unus
     has its users list updated to reflect the change as well.
     """
     instance.course_user_group.users.remove(instance.user)
-    instance.course_user_group.save()
 
 
 class CourseUserGroupPartitionGroup(models.Model):
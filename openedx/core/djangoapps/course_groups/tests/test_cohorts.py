@@ -7,10 +7,13 @@ from mock import call, patch
 from nose.plugins.attrib import attr
 
 import before_after
+import request_cache
 from django.contrib.auth.models import User
-from django.db import IntegrityError
+from django.core.cache import cache as django_cache
+from django.db import IntegrityError, connection
 from django.http import Http404
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
@@ -19,7 +22,12 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE,
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
 from .. import cohorts
-from ..models import CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup
+from ..models import (
+    CourseCohort,
+    CourseUserGroup,
+    CourseUserGroupPartitionGroup,
+    UnregisteredLearnerCohortAssignments
+)
 from ..tests.helpers import CohortFactory, CourseCohortFactory, config_course_cohorts, config_course_cohorts_legacy
 
 
@@ -701,6 +709,83 @@ class TestCohorts(ModuleStoreTestCase):
         # Note that the following get() will fail with MultipleObjectsReturned if race condition is not handled.
         self.assertEqual(first_cohort.users.get(), course_user)
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_bulk_add_users_to_cohorts(self, mock_tracker):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() gives the same results as
+        adding the users one by one with cohorts.add_user_to_cohort().
+        """
+        moved_user = UserFactory(username="Username", email="a@b.com")
+        new_user = UserFactory(username="RandomUsername", email="b@b.com")
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        cohorts.add_user_to_cohort(first_cohort, "Username")
+
+        outcomes = cohorts.bulk_add_users_to_cohorts(course.id, [
+            ("a@b.com", second_cohort),
+            ("RandomUsername", first_cohort),
+            ("RandomUsername", first_cohort),
+            ("new_email@example.com", second_cohort),
+            ("non_existent_username", first_cohort),
+            ("invalid@email", first_cohort),
+        ])
+        self.assertEqual(outcomes, [
+            cohorts.COHORT_ASSIGNMENT_ADDED,
+            cohorts.COHORT_ASSIGNMENT_ADDED,
+            cohorts.COHORT_ASSIGNMENT_ALREADY_PRESENT,
+            cohorts.COHORT_ASSIGNMENT_PREASSIGNED,
+            cohorts.COHORT_ASSIGNMENT_USER_NOT_FOUND,
+            cohorts.COHORT_ASSIGNMENT_INVALID_EMAIL,
+        ])
+        self.assertEqual(list(first_cohort.users.all()), [new_user])
+        self.assertEqual(list(second_cohort.users.all()), [moved_user])
+        self.assertEqual(cohorts.get_cohort(moved_user, course.id), second_cohort)
+        self.assertEqual(cohorts.get_cohort(new_user, course.id), first_cohort)
+        self.assertTrue(
+            UnregisteredLearnerCohortAssignments.objects.filter(
+                email="new_email@example.com", course_user_group=second_cohort
+            ).exists()
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": moved_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_removed",
+            {"user_id": moved_user.id, "cohort_id": first_cohort.id, "cohort_name": first_cohort.name}
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.email_address_preassigned",
+            {
+                "user_email": "new_email@example.com",
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+            }
+        )
+
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_bulk_add_users_to_cohorts_num_queries(self, mock_tracker):  # pylint: disable=unused-argument
+        """
+        Make sure the number of queries of cohorts.bulk_add_users_to_cohorts()
+        does not depend on the number of users.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        cohort = CohortFactory(course_id=course.id, name="Cohort")
+        num_queries = []
+        for num_users in (2, 20):
+            users = UserFactory.create_batch(num_users)
+            with CaptureQueriesContext(connection) as queries:
+                cohorts.bulk_add_users_to_cohorts(course.id, [(user.username, cohort) for user in users])
+            num_queries.append(len(queries))
+        self.assertEqual(num_queries[0], num_queries[1])
+
     def test_set_cohorted_with_invalid_data_type(self):
         """
         Test that cohorts.set_course_cohorted raises exception if argument is not a boolean.
@@ -713,6 +798,118 @@ class TestCohorts(ModuleStoreTestCase):
         self.assertEqual("Cohorted must be a boolean", value_error.exception.message)
 
 
+@attr(shard=2)
+class TestCohortMembershipCache(ModuleStoreTestCase):
+    """
+    Test the cross-request cache of cohort memberships
+    """
+    MODULESTORE = TEST_DATA_MIXED_MODULESTORE
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestCohortMembershipCache, self).setUp()
+        self.course = ToyCourseFactory.create()
+        config_course_cohorts(self.course, is_cohorted=True)
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        self.cohort = CohortFactory(course_id=self.course.id, name="Cohort", users=[self.user])
+        self.other_cohort = CohortFactory(course_id=self.course.id, name="OtherCohort")
+
+    def _get_cohort_in_new_request(self, user):
+        """
+        Returns the cohort of the user, as a new request would.
+        """
+        request_cache.clear_cache(cohorts.COHORT_CACHE_NAMESPACE)
+        return cohorts.get_cohort(user, self.course.id, assign=False, use_cached=True)
+
+    def test_warm_cache(self):
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+        self.assertIsNone(self._get_cohort_in_new_request(self.other_user))
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+            self.assertIsNone(self._get_cohort_in_new_request(self.other_user))
+
+    def test_bulk_cache_cohorts(self):
+        users = [self.user, self.other_user]
+        cohorts.bulk_cache_cohorts(self.course.id, users)
+        with self.assertNumQueries(0):
+            cohorts.bulk_cache_cohorts(self.course.id, users)
+            self.assertEqual(cohorts.get_cohort(self.user, self.course.id, use_cached=True), self.cohort)
+            self.assertIsNone(cohorts.get_cohort(self.other_user, self.course.id, assign=False, use_cached=True))
+
+    def test_membership_changes(self):
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+        self.assertIsNone(self._get_cohort_in_new_request(self.other_user))
+
+        cohorts.add_user_to_cohort(self.other_cohort, self.user.username)
+        cohorts.add_user_to_cohort(self.cohort, self.other_user.username)
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.other_cohort)
+        self.assertEqual(self._get_cohort_in_new_request(self.other_user), self.cohort)
+
+        cohorts.remove_user_from_cohort(self.cohort, self.other_user.username)
+        self.assertIsNone(self._get_cohort_in_new_request(self.other_user))
+
+        cohorts.bulk_add_users_to_cohorts(self.course.id, [(self.user.username, self.cohort)])
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+
+    def test_cohort_changes(self):
+        self.assertEqual(self._get_cohort_in_new_request(self.user).name, "Cohort")
+        self.cohort.name = "RenamedCohort"
+        self.cohort.save()
+        self.assertEqual(self._get_cohort_in_new_request(self.user).name, "RenamedCohort")
+
+        self.cohort.delete()
+        self.assertIsNone(self._get_cohort_in_new_request(self.user))
+
+    def test_removing_user_keeps_other_memberships(self):
+        cohorts.add_user_to_cohort(self.cohort, self.other_user.username)
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+
+        cohorts.remove_user_from_cohort(self.cohort, self.other_user.username)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+        self.assertIsNone(self._get_cohort_in_new_request(self.other_user))
+
+    def test_membership_cached_before_commit(self):
+        """
+        Another process can cache the previous membership after the signal
+        handlers invalidated it, but before the transaction of the request is
+        committed.
+        """
+        def cache_previous_membership(*args, **kwargs):  # pylint: disable=unused-argument
+            """
+            Caches the previous membership of the user, as another process would before the commit.
+            """
+            version = cohorts._course_cohort_cache_version(self.course.id)  # pylint: disable=protected-access
+            django_cache.set(
+                cohorts._cohort_membership_cache_key(  # pylint: disable=protected-access
+                    self.course.id, version, self.user.id
+                ),
+                self.cohort.id,
+            )
+
+        cohorts._clear_pending_cohort_cache_invalidations(sender=None)  # pylint: disable=protected-access
+        with before_after.after(
+            'openedx.core.djangoapps.course_groups.cohorts._invalidate_cohort_membership_cache',
+            cache_previous_membership,
+        ):
+            cohorts.add_user_to_cohort(self.other_cohort, self.user.username)
+
+        # The test runs in a transaction, so the invalidations wait for the end of the request.
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.cohort)
+        with patch.object(connection, 'in_atomic_block', False):
+            cohorts._invalidate_cohort_caches_after_request(sender=None)  # pylint: disable=protected-access
+        self.assertEqual(self._get_cohort_in_new_request(self.user), self.other_cohort)
+
+    def test_pending_invalidations_cleared_by_new_request(self):
+        cohorts.add_user_to_cohort(self.other_cohort, self.user.username)
+        cohorts._clear_pending_cohort_cache_invalidations(sender=None)  # pylint: disable=protected-access
+        with patch.object(cohorts, '_invalidate_cohort_membership_cache') as mock_invalidate:
+            with patch.object(connection, 'in_atomic_block', False):
+                cohorts._invalidate_cohort_caches_after_request(sender=None)  # pylint: disable=protected-access
+        self.assertFalse(mock_invalidate.called)
+
+
 @attr(shard=2)
 @ddt.ddt
 class TestCohortsAndPartitionGroups(ModuleStoreTestCase):
@@ -1,21 +1,14 @@
 """Helper functions for working with Credentials."""
 from __future__ import unicode_literals
 
-from django.conf import settings
-from edx_rest_api_client.client import EdxRestApiClient
-
 from openedx.core.djangoapps.credentials.models import CredentialsApiConfig
-from openedx.core.lib.edx_api_utils import get_edx_api_data
-from openedx.core.lib.token_utils import JwtBuilder
+from openedx.core.lib.edx_api_utils import get_api_client, get_edx_api_data
 
 
 def get_credentials_api_client(user):
     """ Returns an authenticated Credentials API client. """
 
-    scopes = ['email', 'profile']
-    expires_in = settings.OAUTH_ID_TOKEN_EXPIRATION
-    jwt = JwtBuilder(user).build_token(scopes, expires_in)
-    return EdxRestApiClient(CredentialsApiConfig.current().internal_api_url, jwt=jwt)
+    return get_api_client(CredentialsApiConfig.current().internal_api_url, user)
 
 
 def get_credentials(user, program_uuid=None):
@@ -12,6 +12,7 @@ from mock import patch
 from .factories import CountryFactory, CountryAccessRuleFactory, RestrictedCourseFactory
 from .. import messages
 from lms.djangoapps.course_api.tests.mixins import CourseApiFactoryMixin
+from openedx.core.djangoapps.geoinfo.api import clear_country_code_cache
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
 from openedx.core.djangoapps.theming.tests.test_util import with_comprehensive_theme
 from student.tests.factories import UserFactory
@@ -125,6 +126,7 @@ class CheckCourseAccessViewTest(CourseApiFactoryMixin, ModuleStoreTestCase):
         self.user.is_staff = False
         self.user.save()
         # Appear to make a request from an IP in the blocked country
+        clear_country_code_cache()
         with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
             mock_ip.return_value = 'US'
             response = self.client.get(self.url, data=self.request_data)
@@ -0,0 +1,83 @@
+"""
+Process-wide lookup of the country of origin of IP addresses.
+
+The GeoIP databases at settings.GEOIP_PATH (IPv4) and settings.GEOIPV6_PATH
+(IPv6) are opened once per process, memory-mapped, and shared by all
+threads.  The most recently looked up addresses are kept in a bounded LRU
+cache in front of them, since the same addresses are looked up repeatedly
+by the CountryMiddleware and the embargo checks.
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+import pygeoip
+
+log = logging.getLogger(__name__)
+
+# Number of IP addresses whose country code is cached per process.
+COUNTRY_CODE_CACHE_SIZE = 10000
+
+_MISSING = object()
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+_country_codes = OrderedDict()
+_country_codes_lock = threading.Lock()
+
+
+def country_code_from_ip(ip_addr):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code.
+    """
+    with _country_codes_lock:
+        country_code = _country_codes.pop(ip_addr, _MISSING)
+        if country_code is not _MISSING:
+            _country_codes[ip_addr] = country_code
+            return country_code
+
+    if ip_addr.find(':') >= 0:
+        country_code = _get_database(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
+    else:
+        country_code = _get_database(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+
+    with _country_codes_lock:
+        _country_codes[ip_addr] = country_code
+        while len(_country_codes) > COUNTRY_CODE_CACHE_SIZE:
+            _country_codes.popitem(last=False)
+    return country_code
+
+
+def clear_country_code_cache():
+    """
+    Removes all cached country codes.  Meant for tests that change the
+    results of GeoIP lookups.
+    """
+    with _country_codes_lock:
+        _country_codes.clear()
+
+
+def _get_database(path):
+    """
+    Returns the shared, memory-mapped GeoIP database at the given path,
+    opening it on first use.
+    """
+    path = unicode(path)
+    database = _databases.get(path)
+    if database is None:
+        with _databases_lock:
+            database = _databases.get(path)
+            if database is None:
+                log.info(u'Opening GeoIP database %s', path)
+                database = _databases[path] = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+    return database
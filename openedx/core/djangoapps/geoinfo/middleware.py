@@ -12,10 +12,9 @@ decorator `django.utils.decorators.decorator_from_middleware(middleware_class)`
 
 import logging
 
-from django.conf import settings
 from ipware.ip import get_real_ip
 
-import pygeoip
+from .api import country_code_from_ip
 
 log = logging.getLogger(__name__)
 
@@ -37,10 +36,7 @@ class CountryMiddleware(object):
             del request.session['ip_address']
             del request.session['country_code']
         elif new_ip_address != old_ip_address:
-            if new_ip_address.find(':') >= 0:
-                country_code = pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(new_ip_address)
-            else:
-                country_code = pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(new_ip_address)
+            country_code = country_code_from_ip(new_ip_address)
             request.session['country_code'] = country_code
             request.session['ip_address'] = new_ip_address
             log.debug('Country code for IP: %s is set to %s', new_ip_address, country_code)
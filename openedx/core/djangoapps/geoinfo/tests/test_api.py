@@ -0,0 +1,48 @@
+"""
+Tests for the GeoIP lookup API.
+"""
+# pylint: disable=protected-access
+from django.conf import settings
+from django.test import TestCase
+from mock import patch
+
+import pygeoip
+
+from openedx.core.djangoapps.geoinfo import api
+
+
+class CountryCodeFromIpTests(TestCase):
+    """
+    Tests of country_code_from_ip.
+    """
+    def setUp(self):
+        super(CountryCodeFromIpTests, self).setUp()
+        api.clear_country_code_cache()
+        self.addCleanup(api.clear_country_code_cache)
+        patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='CN')
+        self.mock_country_code_by_addr = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_databases_opened_once(self):
+        self.assertEqual(api.country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(api.country_code_from_ip('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+        ipv4_database = api._get_database(settings.GEOIP_PATH)
+        self.assertIs(api._get_database(settings.GEOIP_PATH), ipv4_database)
+        self.assertIsNot(api._get_database(settings.GEOIPV6_PATH), ipv4_database)
+
+    def test_country_codes_cached(self):
+        for __ in range(3):
+            self.assertEqual(api.country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 1)
+
+    @patch.object(api, 'COUNTRY_CODE_CACHE_SIZE', 2)
+    def test_cache_size(self):
+        for ip_addr in ('117.79.83.1', '117.79.83.2', '117.79.83.1', '117.79.83.3'):
+            api.country_code_from_ip(ip_addr)
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 3)
+
+        # The least recently used address was evicted
+        api.country_code_from_ip('117.79.83.2')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 4)
+        api.country_code_from_ip('117.79.83.3')
+        self.assertEqual(self.mock_country_code_by_addr.call_count, 4)
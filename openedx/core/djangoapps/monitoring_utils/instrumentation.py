@@ -0,0 +1,404 @@
+"""
+Query-count, query-time and cache instrumentation for requests and celery tasks.
+
+While an InstrumentationRecorder is active on a thread, it captures:
+
+* the number of database queries and the total time spent running them,
+* duplicated queries, grouped by a fingerprint of their SQL with literal
+  values stripped (a large count for a single fingerprint usually means an
+  N+1 query pattern), and
+* django cache hits and misses.
+
+Requests are instrumented by the QueryInstrumentationMiddleware and celery
+tasks through the task_prerun and task_postrun signals below, when the
+'monitoring_utils.enable_query_instrumentation' waffle switch is on.  The
+results are logged as one JSON object per line on the 'query_instrumentation'
+logger.
+
+Budgets can be configured per view name or task name in
+settings.QUERY_BUDGETS, for example:
+
+    QUERY_BUDGETS = {
+        'courseware.views.views.progress': {
+            'MAX_QUERIES': 300,
+            'MAX_DB_TIME': 1.5,
+            'MAX_DUPLICATE_QUERIES': 50,
+        },
+    }
+
+A budget that is exceeded is either logged or raised as a QueryBudgetExceeded
+error, depending on settings.QUERY_BUDGET_ACTION ('log' or 'raise').
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.utils import CursorWrapper
+
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+
+log = logging.getLogger(__name__)
+instrumentation_log = logging.getLogger('query_instrumentation')
+
+WAFFLE_NAMESPACE = 'monitoring_utils'
+ENABLE_QUERY_INSTRUMENTATION = u'enable_query_instrumentation'
+
+METRIC_PREFIX = 'query_instrumentation'
+REPORTED_METRICS = ('num_queries', 'db_time', 'num_duplicate_queries', 'cache_hits', 'cache_misses')
+
+# Maps budget settings to the stat they limit.
+BUDGET_LIMITS = {
+    'MAX_QUERIES': 'num_queries',
+    'MAX_DB_TIME': 'db_time',
+    'MAX_DUPLICATE_QUERIES': 'num_duplicate_queries',
+}
+
+# Number of duplicated query fingerprints included in the logged stats.
+MAX_LOGGED_DUPLICATES = 10
+
+# Backends that cannot interpolate parameters log "QUERY = '...' - PARAMS = (...)".
+_UNINTERPOLATED_QUERY = re.compile(r"^QUERY = u?'(?P<sql>.*)' - PARAMS = .*$", re.DOTALL)
+_FINGERPRINT_SUBSTITUTIONS = (
+    (re.compile(r'%s'), u'?'),
+    (re.compile(r"'(?:[^']|'')*'"), u'?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), u'?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), u'(...)'),
+    (re.compile(r'\s+'), u' '),
+)
+
+_MISSING = object()
+_local = threading.local()
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when a view or task exceeds its configured query budget and
+    settings.QUERY_BUDGET_ACTION is 'raise'.
+    """
+    pass
+
+
+def is_instrumentation_enabled():
+    """
+    Returns whether query instrumentation is enabled.
+    """
+    return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE).is_enabled(ENABLE_QUERY_INSTRUMENTATION)
+
+
+def fingerprint(sql):
+    """
+    Returns the given SQL with literal values removed, so that queries only
+    differing by their parameters share a fingerprint.
+    """
+    uninterpolated = _UNINTERPOLATED_QUERY.match(sql)
+    if uninterpolated:
+        sql = uninterpolated.group('sql')
+    for pattern, replacement in _FINGERPRINT_SUBSTITUTIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def _active_recorders():
+    """
+    Returns the stack of recorders active on the current thread.
+    """
+    if not hasattr(_local, 'recorders'):
+        _local.recorders = []
+    return _local.recorders
+
+
+def _record_cache_access(hits, misses):
+    """
+    Adds cache hits and misses to every recorder active on this thread.
+    """
+    for recorder in _active_recorders():
+        recorder.cache_hits += hits
+        recorder.cache_misses += misses
+
+
+def _record_query(sql, duration):
+    """
+    Adds a query to every recorder active on this thread.
+    """
+    recorders = _active_recorders()
+    if recorders:
+        sql_fingerprint = fingerprint(sql)
+        for recorder in recorders:
+            recorder.num_queries += 1
+            recorder.db_time += duration
+            recorder.fingerprints[sql_fingerprint] += 1
+
+
+class RecordingCursorWrapper(CursorWrapper):
+    """
+    A cursor that reports each query it runs to the recorders active on the current thread.
+    """
+    def execute(self, sql, params=None):
+        start_time = time.time()
+        try:
+            return super(RecordingCursorWrapper, self).execute(sql, params)
+        finally:
+            _record_query(sql, time.time() - start_time)
+
+    def executemany(self, sql, param_list):
+        start_time = time.time()
+        try:
+            return super(RecordingCursorWrapper, self).executemany(sql, param_list)
+        finally:
+            _record_query(sql, time.time() - start_time)
+
+
+def _instrument_connection(connection):
+    """
+    Makes the given connection return recording cursors, until as many calls
+    to _uninstrument_connection are made.
+
+    Django only wraps cursors with make_debug_cursor when queries are logged,
+    so logging is forced, and the connection's own make_debug_cursor is still
+    applied when its queries were already being logged (e.g. with DEBUG).
+    Connections are thread local, so this only affects the current thread.
+    """
+    depth = getattr(connection, '_query_instrumentation_depth', 0)
+    if depth == 0:
+        original_make_debug_cursor = connection.make_debug_cursor
+        queries_logged = connection.queries_logged
+
+        def make_debug_cursor(cursor):  # pylint: disable=missing-docstring
+            if queries_logged:
+                cursor = original_make_debug_cursor(cursor)
+            return RecordingCursorWrapper(cursor, connection)
+
+        connection._query_instrumentation_force_debug_cursor = connection.force_debug_cursor
+        connection.force_debug_cursor = True
+        connection.make_debug_cursor = make_debug_cursor
+    connection._query_instrumentation_depth = depth + 1
+
+
+def _uninstrument_connection(connection):
+    """
+    Undoes a call to _instrument_connection.
+    """
+    connection._query_instrumentation_depth -= 1
+    if connection._query_instrumentation_depth == 0:
+        connection.force_debug_cursor = connection._query_instrumentation_force_debug_cursor
+        del connection.make_debug_cursor
+
+
+def _instrument_cache_class(cache_class):
+    """
+    Wraps the get and get_many methods of the given cache backend class to
+    count hits and misses.  Nested calls (such as BaseCache.get_many calling
+    get) are only counted once.
+
+    Returns the methods defined by the class itself, to restore them later.
+    """
+    own_methods = {name: cache_class.__dict__.get(name) for name in ('get', 'get_many')}
+    original_get = cache_class.get
+    original_get_many = cache_class.get_many
+
+    def get(self, key, default=None, version=None):  # pylint: disable=missing-docstring
+        _local.cache_depth = getattr(_local, 'cache_depth', 0) + 1
+        try:
+            value = original_get(self, key, default=_MISSING, version=version)
+        finally:
+            _local.cache_depth -= 1
+        if _local.cache_depth == 0:
+            hit = value is not _MISSING
+            _record_cache_access(int(hit), int(not hit))
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):  # pylint: disable=missing-docstring
+        keys = list(keys)
+        _local.cache_depth = getattr(_local, 'cache_depth', 0) + 1
+        try:
+            values = original_get_many(self, keys, version=version)
+        finally:
+            _local.cache_depth -= 1
+        if _local.cache_depth == 0:
+            _record_cache_access(len(values), len(keys) - len(values))
+        return values
+
+    cache_class.get = get
+    cache_class.get_many = get_many
+    return own_methods
+
+
+def _restore_cache_class(cache_class, own_methods):
+    """
+    Undoes _instrument_cache_class, given the methods it returned.
+    """
+    for name, method in own_methods.iteritems():
+        if method is None:
+            delattr(cache_class, name)
+        else:
+            setattr(cache_class, name, method)
+
+
+_cache_instrumentation_lock = threading.Lock()
+_cache_instrumentation = {
+    # Number of recorders active in the process.
+    'recorders': 0,
+    # Maps the instrumented cache backend classes to their own methods.
+    'classes': {},
+}
+
+
+def _start_cache_instrumentation():
+    """
+    Instruments the backend classes of all configured django caches, if no
+    recorder already did.
+
+    Backend classes are shared by all threads, so while any recorder is active
+    the caches of other threads are instrumented as well.  Their accesses are
+    not recorded though, since only the recorders of the current thread are
+    updated, and the wrapped methods otherwise behave as the original ones.
+    """
+    with _cache_instrumentation_lock:
+        if _cache_instrumentation['recorders'] == 0:
+            for alias in settings.CACHES:
+                cache_class = caches[alias].__class__
+                if cache_class not in _cache_instrumentation['classes']:
+                    _cache_instrumentation['classes'][cache_class] = _instrument_cache_class(cache_class)
+        _cache_instrumentation['recorders'] += 1
+
+
+def _stop_cache_instrumentation():
+    """
+    Restores the cache backend classes once no recorder is active anymore.
+    """
+    with _cache_instrumentation_lock:
+        _cache_instrumentation['recorders'] -= 1
+        if _cache_instrumentation['recorders'] == 0:
+            for cache_class, own_methods in _cache_instrumentation['classes'].iteritems():
+                _restore_cache_class(cache_class, own_methods)
+            _cache_instrumentation['classes'].clear()
+
+
+class InstrumentationRecorder(object):
+    """
+    Records database and cache activity on the current thread between
+    start() and stop().
+
+    Usage:
+
+        recorder = InstrumentationRecorder(u'my.task.name', u'task')
+        recorder.start()
+        ...
+        stats = recorder.stop()
+    """
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.num_queries = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._start_time = None
+        self._connections = []
+
+    def start(self):
+        """
+        Starts recording.  Queries are captured by making every database
+        connection of the thread return recording cursors for the duration
+        of the recording.
+        """
+        _start_cache_instrumentation()
+        self._start_time = time.time()
+        self._connections = connections.all()
+        for connection in self._connections:
+            _instrument_connection(connection)
+        _active_recorders().append(self)
+
+    def stop(self):
+        """
+        Stops recording and returns a dict of the recorded stats.
+        """
+        recorders = _active_recorders()
+        if self in recorders:
+            recorders.remove(self)
+            for connection in self._connections:
+                _uninstrument_connection(connection)
+            self._connections = []
+            _stop_cache_instrumentation()
+
+        duplicates = Counter({sql: count for sql, count in self.fingerprints.iteritems() if count > 1})
+        return {
+            'name': self.name,
+            'type': self.kind,
+            'duration': time.time() - self._start_time,
+            'num_queries': self.num_queries,
+            'db_time': self.db_time,
+            'num_duplicate_queries': sum(duplicates.values()) - len(duplicates),
+            'duplicate_queries': dict(duplicates.most_common(MAX_LOGGED_DUPLICATES)),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+def exceeded_budget(stats):
+    """
+    Returns a list of (setting, limit, value) tuples for every limit of the
+    configured budget exceeded by the given stats.
+    """
+    budget = getattr(settings, 'QUERY_BUDGETS', {}).get(stats['name'], {})
+    return [
+        (limit_name, budget[limit_name], stats[stat_name])
+        for limit_name, stat_name in sorted(BUDGET_LIMITS.iteritems())
+        if limit_name in budget and stats[stat_name] > budget[limit_name]
+    ]
+
+
+def log_stats(stats):
+    """
+    Logs the given stats as JSON and enforces the configured budget, if any.
+    """
+    instrumentation_log.info(json.dumps(stats, sort_keys=True))
+
+    exceeded = exceeded_budget(stats)
+    if exceeded:
+        message = u'Query budget exceeded by {} {}: {}'.format(
+            stats['type'],
+            stats['name'],
+            u', '.join(u'{}={} (limit {})'.format(name, value, limit) for name, limit, value in exceeded),
+        )
+        if getattr(settings, 'QUERY_BUDGET_ACTION', 'log') == 'raise':
+            raise QueryBudgetExceeded(message)
+        log.warning(message)
+
+
+@task_prerun.connect
+def start_task_instrumentation(task_id=None, task=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Starts instrumenting a celery task.
+    """
+    if is_instrumentation_enabled():
+        recorder = InstrumentationRecorder(task.name, u'task')
+        _local.task_recorders = getattr(_local, 'task_recorders', {})
+        _local.task_recorders[task_id] = recorder
+        recorder.start()
+
+
+@task_postrun.connect
+def stop_task_instrumentation(task_id=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stops instrumenting a celery task and reports the results.
+    """
+    recorder = getattr(_local, 'task_recorders', {}).pop(task_id, None)
+    if recorder is None:
+        return
+
+    # Imported here as the monitoring_utils package imports this module.
+    from openedx.core.djangoapps import monitoring_utils
+
+    stats = recorder.stop()
+    for metric_name in REPORTED_METRICS:
+        monitoring_utils.set_custom_metric(u'{}.{}'.format(METRIC_PREFIX, metric_name), stats[metric_name])
+    log_stats(stats)
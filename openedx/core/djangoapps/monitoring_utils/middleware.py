@@ -17,6 +17,14 @@ import psutil
 import request_cache
 from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
 
+from .instrumentation import (
+    METRIC_PREFIX,
+    REPORTED_METRICS,
+    InstrumentationRecorder,
+    is_instrumentation_enabled,
+    log_stats
+)
+
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
@@ -173,3 +181,38 @@ class MonitoringMemoryMiddleware(object):
         Returns whether this middleware is enabled.
         """
         return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE).is_enabled(u'enable_memory_middleware')
+
+
+class QueryInstrumentationMiddleware(object):
+    """
+    Middleware for recording the database queries, duplicated queries and
+    cache accesses of each view.  Make sure to add below MonitoringCustomMetrics
+    in MIDDLEWARE_CLASSES, so the results are included in its batch report.
+
+    See openedx.core.djangoapps.monitoring_utils.instrumentation for details.
+    """
+    recorder_attr = '_query_instrumentation_recorder'
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        """
+        Starts recording once the view is known.
+        """
+        if is_instrumentation_enabled():
+            view_name = u'{}.{}'.format(view_func.__module__, getattr(view_func, '__name__', ''))
+            recorder = InstrumentationRecorder(view_name, u'view')
+            setattr(request, self.recorder_attr, recorder)
+            recorder.start()
+
+    def process_response(self, request, response):
+        """
+        Stops recording and reports the results as custom metrics.
+        """
+        recorder = getattr(request, self.recorder_attr, None)
+        if recorder is not None:
+            delattr(request, self.recorder_attr)
+            stats = recorder.stop()
+            for metric_name in REPORTED_METRICS:
+                metric = u'{}.{}'.format(METRIC_PREFIX, metric_name)
+                MonitoringCustomMetrics.accumulate_metric(metric, stats[metric_name])
+            log_stats(stats)
+        return response
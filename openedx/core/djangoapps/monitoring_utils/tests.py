@@ -1,11 +1,27 @@
 """
 Tests for monitoring custom metrics.
 """
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
 from django.test import TestCase
-from mock import call, patch
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import Mock, call, patch
 
 from openedx.core.djangoapps import monitoring_utils
-from openedx.core.djangoapps.monitoring_utils.middleware import MonitoringCustomMetrics
+from openedx.core.djangoapps.monitoring_utils.instrumentation import (
+    ENABLE_QUERY_INSTRUMENTATION,
+    WAFFLE_NAMESPACE,
+    InstrumentationRecorder,
+    QueryBudgetExceeded,
+    fingerprint,
+    log_stats,
+    start_task_instrumentation,
+    stop_task_instrumentation
+)
+from openedx.core.djangoapps.monitoring_utils.middleware import MonitoringCustomMetrics, QueryInstrumentationMiddleware
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
 
 
 class TestMonitoringCustomMetrics(TestCase):
@@ -45,3 +61,89 @@ class TestMonitoringCustomMetrics(TestCase):
         # Assert call args to newrelic.agent.add_custom_parameter().  Due to
         # the nature of python dicts, call order is undefined.
         mock_newrelic_agent.add_custom_parameter.has_calls(nr_agent_calls_expected, any_order=True)
+
+
+class TestQueryInstrumentation(TestCase):
+    """
+    Test the query instrumentation recorder, budgets and middleware.
+    """
+    def setUp(self):
+        super(TestQueryInstrumentation, self).setUp()
+        cache.clear()
+
+    def _record(self, name=u'test.view'):
+        """
+        Runs a few queries and cache lookups while recording.
+        """
+        recorder = InstrumentationRecorder(name, u'view')
+        recorder.start()
+        for username in ('alice', 'bob', 'carol'):
+            User.objects.filter(username=username).exists()
+        cache.set('present', 1)
+        cache.get('present')
+        cache.get('absent')
+        cache.get_many(['present', 'absent'])
+        return recorder.stop()
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint(u"SELECT * FROM auth_user WHERE id IN (1, 2,3) AND username = 'it''s'  LIMIT 21"),
+            u'SELECT * FROM auth_user WHERE id IN (...) AND username = ? LIMIT ?',
+        )
+
+    def test_recorder(self):
+        stats = self._record()
+        self.assertEqual(stats['num_queries'], 3)
+        self.assertEqual(stats['num_duplicate_queries'], 2)
+        self.assertEqual(stats['duplicate_queries'].values(), [3])
+        self.assertEqual(stats['cache_hits'], 2)
+        self.assertEqual(stats['cache_misses'], 2)
+
+    def test_recorder_with_full_queries_log(self):
+        # Long-running workers fill the bounded log of queries, which must not hide new queries.
+        self.addCleanup(connection.queries_log.clear)
+        connection.queries_log.extend({'sql': u'SELECT 1', 'time': u'0.000'} for __ in range(9000))
+        self.assertEqual(self._record()['num_queries'], 3)
+
+    def test_instrumentation_removed_after_recording(self):
+        cache_class = caches['default'].__class__
+        cache_get = cache_class.get
+        recorder = InstrumentationRecorder(u'test.view', u'view')
+        recorder.start()
+        self.assertNotEqual(cache_class.get, cache_get)
+        self.assertIn('make_debug_cursor', connection.__dict__)
+        recorder.stop()
+        self.assertEqual(cache_class.get, cache_get)
+        self.assertNotIn('make_debug_cursor', connection.__dict__)
+
+    @patch('openedx.core.djangoapps.monitoring_utils.set_custom_metric')
+    def test_task(self, mock_set_custom_metric):
+        task = Mock()
+        task.name = u'test.task'
+        with WaffleSwitchNamespace(name=WAFFLE_NAMESPACE).override(ENABLE_QUERY_INSTRUMENTATION, active=True):
+            start_task_instrumentation(task_id=u'task-id', task=task)
+            User.objects.exists()
+            stop_task_instrumentation(task_id=u'task-id')
+        mock_set_custom_metric.assert_any_call(u'query_instrumentation.num_queries', 1)
+
+    @override_settings(QUERY_BUDGETS={u'test.view': {'MAX_QUERIES': 2}}, QUERY_BUDGET_ACTION='raise')
+    def test_budget_raise(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            log_stats(self._record())
+
+    @override_settings(QUERY_BUDGETS={u'test.view': {'MAX_QUERIES': 2, 'MAX_DUPLICATE_QUERIES': 5}})
+    @patch('openedx.core.djangoapps.monitoring_utils.instrumentation.log')
+    def test_budget_log(self, mock_log):
+        log_stats(self._record())
+        self.assertEqual(mock_log.warning.call_count, 1)
+        self.assertIn(u'num_queries=3 (limit 2)', mock_log.warning.call_args[0][0])
+
+    @patch('openedx.core.djangoapps.monitoring_utils.middleware.MonitoringCustomMetrics.accumulate_metric')
+    def test_middleware(self, mock_accumulate):
+        middleware = QueryInstrumentationMiddleware()
+        request = RequestFactory().get('/')
+        with WaffleSwitchNamespace(name=WAFFLE_NAMESPACE).override(ENABLE_QUERY_INSTRUMENTATION, active=True):
+            middleware.process_view(request, self.test_middleware, [], {})
+            User.objects.exists()
+            middleware.process_response(request, 'fake response')
+        mock_accumulate.assert_any_call(u'query_instrumentation.num_queries', 1)
@@ -0,0 +1,69 @@
+"""
+Management command for exporting the stacks recorded by the sampling profiler.
+
+Examples:
+
+    # List the profiled views
+    ./manage.py lms export_profiles --settings=aws
+
+    # Write a flame graph input file for the progress page
+    ./manage.py lms export_profiles --view courseware.views.views.progress --output progress.txt
+
+    # Write a speedscope document instead
+    ./manage.py lms export_profiles --view courseware.views.views.progress --format speedscope
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from openedx.core.djangoapps.performance.profiler import ProfileStore, to_collapsed, to_speedscope
+
+
+class Command(BaseCommand):
+    """
+    Export aggregated sampling profiler stacks for a view.
+    """
+    help = 'Export the aggregated stacks recorded by the sampling profiler.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', help='Dotted name of the view to export. Lists the profiled views if omitted.')
+        parser.add_argument(
+            '--format',
+            choices=('collapsed', 'speedscope'),
+            default='collapsed',
+            help='Output format: collapsed stacks (flamegraph.pl) or a speedscope JSON document.',
+        )
+        parser.add_argument('--output', help='File to write to. Defaults to standard output.')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Remove the stored profiles for the view (or all views) instead of exporting them.',
+        )
+
+    def handle(self, *args, **options):
+        store = ProfileStore()
+        view_name = options['view']
+
+        if options['clear']:
+            store.clear(view_name)
+            return
+
+        if not view_name:
+            for name in sorted(store.view_names()):
+                self.stdout.write(u'{} ({} profiles)'.format(name, len(store.get_profiles(name))))
+            return
+
+        stacks = store.aggregate(view_name)
+        if not stacks:
+            raise CommandError(u'No profiles recorded for view {}'.format(view_name))
+
+        if options['format'] == 'speedscope':
+            output = json.dumps(to_speedscope(view_name, stacks))
+        else:
+            output = to_collapsed(stacks)
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output.encode('utf-8'))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,87 @@
+"""
+Management command for reporting the time and memory taken to start each Django app.
+
+Startup is profiled in a new process, with the settings of the current one.
+
+Examples:
+
+    # Report the ten slowest apps to start in the LMS
+    ./manage.py lms profile_startup --settings=aws --limit 10
+
+    # Compare with lazy startup, and write the full report as JSON
+    ./manage.py lms profile_startup --settings=aws --lazy --json --output startup.json
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from openedx.core.djangoapps.performance.startup_profiler import PHASES
+
+
+class Command(BaseCommand):
+    """
+    Report the import time and memory of each Django app during startup.
+    """
+    help = 'Report the time and memory taken to start each Django app.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--startup',
+            help="Startup module to profile, e.g. 'cms.startup'. Defaults to that of the current settings.",
+        )
+        parser.add_argument('--lazy', action='store_true', help='Profile startup with LAZY_STARTUP enabled.')
+        parser.add_argument('--limit', type=int, help='Number of apps to report, slowest first.')
+        parser.add_argument('--json', action='store_true', help='Output the full report as JSON.')
+        parser.add_argument('--output', help='File to write to. Defaults to standard output.')
+
+    def handle(self, *args, **options):
+        settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', '')
+        startup_module = options['startup'] or u'{}.startup'.format(settings_module.split('.')[0])
+
+        command = [sys.executable, '-m', 'openedx.core.djangoapps.performance.startup_profiler', startup_module]
+        if options['lazy']:
+            command.append('--lazy')
+        try:
+            output = subprocess.check_output(command, cwd=settings.REPO_ROOT, env=os.environ.copy())
+        except subprocess.CalledProcessError as error:
+            raise CommandError(u'Profiling {} failed with exit code {}'.format(startup_module, error.returncode))
+
+        report = json.loads(output)
+        if options['limit']:
+            report['apps'] = report['apps'][:options['limit']]
+
+        if options['json']:
+            output = json.dumps(report, indent=2)
+        else:
+            output = self._format_report(startup_module, report)
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output.encode('utf-8'))
+        else:
+            self.stdout.write(output)
+
+    def _format_report(self, startup_module, report):
+        """
+        Returns the report as a table, one app per line.
+        """
+        lines = [
+            u'{}: {:.2f}s, peak memory {} KB (+{} KB)'.format(
+                startup_module, report['seconds'], report['max_rss_kb'], report['max_rss_increase_kb']
+            ),
+            u'{:>8} {}  {:>10}  app'.format(
+                u'total', u' '.join(u'{:>8}'.format(phase) for phase in PHASES), u'memory KB'
+            ),
+        ]
+        for measurement in report['apps']:
+            lines.append(u'{:>8.3f} {}  {:>10}  {}'.format(
+                measurement['seconds'],
+                u' '.join(u'{:>8.3f}'.format(measurement.get(phase, 0.0)) for phase in PHASES),
+                measurement['max_rss_increase_kb'],
+                measurement['app'],
+            ))
+        return u'\n'.join(lines)
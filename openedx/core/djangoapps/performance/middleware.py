@@ -0,0 +1,67 @@
+"""
+Middleware for sampling the stacks of slow requests.
+
+See openedx.core.djangoapps.performance.profiler for details.
+"""
+import logging
+import random
+import time
+
+from .profiler import ProfileStore, StackSampler, is_profiling_enabled, profiler_setting
+
+log = logging.getLogger(__name__)
+
+
+def _view_name(view_func):
+    """
+    Returns the dotted name of the given view function or view instance.
+    """
+    name = getattr(view_func, '__name__', None) or view_func.__class__.__name__
+    return u'{}.{}'.format(view_func.__module__, name)
+
+
+class SamplingProfilerMiddleware(object):
+    """
+    Profiles a random sample of requests and stores the stacks of those that
+    exceed the configured latency threshold, aggregated by view name.
+
+    Sampling is only started once the view is resolved, so the recorded
+    latency covers the view and the response middleware.
+    """
+    sampler_attr = '_sampling_profiler'
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        """
+        Starts a stack sampler for a random sample of requests.
+        """
+        if not is_profiling_enabled() or random.random() >= profiler_setting('SAMPLE_RATE'):
+            return None
+
+        sampler = StackSampler(
+            profiler_setting('SAMPLING_INTERVAL'),
+            max_samples=profiler_setting('MAX_SAMPLES'),
+            max_depth=profiler_setting('MAX_STACK_DEPTH'),
+        )
+        setattr(request, self.sampler_attr, (sampler, _view_name(view_func), time.time()))
+        sampler.start()
+        return None
+
+    def process_response(self, request, response):
+        """
+        Stops the sampler, if any, and stores the profile if the request was
+        slower than the latency threshold.
+        """
+        profiling = getattr(request, self.sampler_attr, None)
+        if profiling is None:
+            return response
+        delattr(request, self.sampler_attr)
+
+        sampler, view_name, start_time = profiling
+        stacks = sampler.stop()
+        duration = time.time() - start_time
+        if stacks and duration >= profiler_setting('LATENCY_THRESHOLD'):
+            try:
+                ProfileStore().add(view_name, stacks, duration, path=request.path)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'Unable to store profile for view %s', view_name)
+        return response
@@ -0,0 +1,275 @@
+"""
+A lightweight sampling profiler for finding hot paths in slow requests.
+
+While a request is being profiled, a background thread periodically captures
+the stack of the thread serving the request.  The captured stacks are kept in
+"collapsed" form (frames joined by semicolons, root first) together with the
+number of times each stack was seen.  When the request turns out to be slower
+than the configured latency threshold, its samples are appended to a rolling
+store that keeps the most recent profiles for every view.
+
+The aggregated samples for a view can then be exported as collapsed stacks
+(for flamegraph.pl and compatible tools) or as a speedscope document (see
+https://www.speedscope.app/).
+
+Configuration lives in settings.SAMPLING_PROFILER and profiling is enabled
+with the 'performance.enable_sampling_profiler' waffle switch.
+"""
+import hashlib
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+
+log = logging.getLogger(__name__)
+
+WAFFLE_NAMESPACE = u'performance'
+WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE, log_prefix=u'Performance: ')
+
+# Switches
+ENABLE_SAMPLING_PROFILER = u'enable_sampling_profiler'
+
+DEFAULT_SETTINGS = dict(
+    SAMPLE_RATE=0.01,
+    LATENCY_THRESHOLD=1.0,
+    SAMPLING_INTERVAL=0.005,
+    MAX_SAMPLES=20000,
+    MAX_STACK_DEPTH=200,
+    MAX_PROFILES_PER_VIEW=20,
+    CACHE_TIMEOUT=24 * 60 * 60,
+)
+
+INDEX_CACHE_KEY = u'performance.profiler.views'
+VIEW_CACHE_KEY_TPL = u'performance.profiler.view.{}'
+
+
+def profiler_setting(name):
+    """
+    Returns the value of the given profiler setting, falling back to the
+    defaults for any setting that is not overridden.
+    """
+    return getattr(settings, 'SAMPLING_PROFILER', {}).get(name, DEFAULT_SETTINGS[name])
+
+
+def is_profiling_enabled():
+    """
+    Returns whether the sampling profiler is enabled.
+    """
+    return WAFFLE_SWITCHES.is_enabled(ENABLE_SAMPLING_PROFILER)
+
+
+def frame_label(frame):
+    """
+    Returns a short label for the given frame, such as
+    'courseware.views.views:progress'.
+    """
+    module_name = frame.f_globals.get('__name__') or frame.f_code.co_filename
+    return u'{}:{}'.format(module_name, frame.f_code.co_name).replace(u';', u':')
+
+
+def collapse_stack(frame, max_depth=None):
+    """
+    Returns the collapsed form of the stack ending at the given frame, with the
+    outermost frame first.  Only the innermost max_depth frames are kept.
+    """
+    labels = []
+    while frame is not None and (max_depth is None or len(labels) < max_depth):
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return u';'.join(reversed(labels))
+
+
+class StackSampler(object):
+    """
+    Periodically samples the stack of a single thread from a background
+    daemon thread.
+
+    Usage:
+
+        sampler = StackSampler(interval=0.005)
+        sampler.start()
+        ...
+        stacks = sampler.stop()
+    """
+    def __init__(self, interval, thread_id=None, max_samples=None, max_depth=None):
+        """
+        Arguments:
+            interval (float): Seconds between two samples.
+            thread_id (int): Identifier of the thread to sample.  Defaults to
+                the thread constructing the sampler.
+            max_samples (int): Sampling stops automatically once this many
+                samples have been taken, so that a request that never
+                completes does not leak a busy thread.
+            max_depth (int): Maximum number of frames kept per stack.
+        """
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.current_thread().ident
+        self.max_samples = max_samples
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.num_samples = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts sampling in a background thread.
+        """
+        self._thread = threading.Thread(target=self._run, name=u'StackSampler-{}'.format(self.thread_id))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops sampling and returns a Counter of collapsed stacks.
+        """
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        """
+        Sampling loop run by the background thread.
+        """
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+            if frame is None:
+                break
+            self.stacks[collapse_stack(frame, self.max_depth)] += 1
+            self.num_samples += 1
+            if self.max_samples and self.num_samples >= self.max_samples:
+                break
+
+
+class ProfileStore(object):
+    """
+    A rolling store of recent profiles, grouped by view name.
+
+    Profiles are kept in the django cache so they can be read by any process
+    sharing it, such as the staff-only endpoint and the export_profiles
+    management command.  Only the most recent max_profiles_per_view profiles
+    are kept for each view.
+    """
+    def __init__(self, max_profiles_per_view=None, timeout=None):
+        self.max_profiles_per_view = max_profiles_per_view or profiler_setting('MAX_PROFILES_PER_VIEW')
+        self.timeout = timeout or profiler_setting('CACHE_TIMEOUT')
+
+    @staticmethod
+    def _view_cache_key(view_name):
+        """
+        Returns the cache key for the profiles of the given view.  View names
+        are hashed to keep keys short and free of unsafe characters.
+        """
+        return VIEW_CACHE_KEY_TPL.format(hashlib.md5(view_name.encode('utf-8')).hexdigest())
+
+    def add(self, view_name, stacks, duration, path=None):
+        """
+        Appends a profile for the given view to the store.
+
+        Arguments:
+            view_name (unicode): Dotted name of the profiled view.
+            stacks (dict): Mapping of collapsed stack to sample count.
+            duration (float): Latency of the profiled request, in seconds.
+            path (unicode): Optional path of the profiled request.
+        """
+        profiles = self.get_profiles(view_name)
+        profiles.append({
+            'timestamp': time.time(),
+            'duration': duration,
+            'path': path,
+            'stacks': dict(stacks),
+        })
+        cache.set(self._view_cache_key(view_name), profiles[-self.max_profiles_per_view:], self.timeout)
+
+        view_names = self.view_names()
+        if view_name not in view_names:
+            view_names.append(view_name)
+            cache.set(INDEX_CACHE_KEY, view_names, self.timeout)
+
+    def view_names(self):
+        """
+        Returns the names of all views that have stored profiles.
+        """
+        return list(cache.get(INDEX_CACHE_KEY) or [])
+
+    def get_profiles(self, view_name):
+        """
+        Returns the list of stored profiles for the given view, oldest first.
+        """
+        return list(cache.get(self._view_cache_key(view_name)) or [])
+
+    def aggregate(self, view_name):
+        """
+        Returns a Counter of collapsed stacks summed over all stored profiles
+        for the given view.
+        """
+        stacks = Counter()
+        for profile in self.get_profiles(view_name):
+            stacks.update(profile['stacks'])
+        return stacks
+
+    def clear(self, view_name=None):
+        """
+        Removes the stored profiles for the given view, or for all views if
+        no view is given.
+        """
+        view_names = self.view_names()
+        to_clear = [view_name] if view_name else view_names
+        cache.delete_many([self._view_cache_key(name) for name in to_clear])
+        remaining = [name for name in view_names if name not in to_clear]
+        cache.set(INDEX_CACHE_KEY, remaining, self.timeout)
+
+
+def to_collapsed(stacks):
+    """
+    Returns the given stacks in the collapsed-stack text format understood by
+    flamegraph.pl and similar tools: one "frame;frame;frame count" per line.
+    """
+    return u''.join(
+        u'{} {}\n'.format(stack, count)
+        for stack, count in sorted(stacks.iteritems())
+    )
+
+
+def to_speedscope(name, stacks, interval=None):
+    """
+    Returns a dict in the speedscope file format for the given stacks, with
+    every sample weighted by the sampling interval in milliseconds.
+    """
+    interval_ms = (interval or profiler_setting('SAMPLING_INTERVAL')) * 1000
+    frames = []
+    frame_indexes = {}
+    samples = []
+    weights = []
+    for stack, count in sorted(stacks.iteritems()):
+        sample = []
+        for label in stack.split(u';'):
+            if label not in frame_indexes:
+                frame_indexes[label] = len(frames)
+                frames.append({'name': label})
+            sample.append(frame_indexes[label])
+        samples.append(sample)
+        weights.append(count * interval_ms)
+
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'edx-platform',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
@@ -0,0 +1,184 @@
+"""
+Measures the time and memory taken to start the LMS or Studio, per Django app.
+
+Startup is profiled in a new python process, since the apps of a running
+process are already imported.  For each installed app, the profiler records
+the time spent importing the app, importing its models, running its ready()
+method and running its startup module, and how much the peak memory of the
+process grew meanwhile.  Memory is measured as the maximum resident set size,
+so the growth attributed to an app is only accurate while memory grows
+steadily, which is the case during startup.
+
+Run it with the profile_startup management command, or directly with:
+
+    DJANGO_SETTINGS_MODULE=lms.envs.aws python -m openedx.core.djangoapps.performance.startup_profiler lms.startup
+"""
+import json
+import os
+import resource
+import sys
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+from importlib import import_module
+
+PHASES = ('import', 'models', 'ready', 'startup')
+
+
+class StartupProfiler(object):
+    """
+    Records the time and memory spent starting each Django app while it is active.
+
+    Usage:
+
+        with StartupProfiler() as profiler:
+            startup.run()
+        report = profiler.report()
+    """
+    def __init__(self):
+        self.measurements = OrderedDict()
+        self._originals = []
+
+    def __enter__(self):
+        from django.apps import AppConfig
+        from openedx.core.lib import django_startup
+
+        profiler = self
+        original_create = AppConfig.create.__func__
+
+        def create(cls, entry):
+            """
+            Creates the app config of the given entry of INSTALLED_APPS, timing its import.
+            """
+            start = profiler.start()
+            app_config = original_create(cls, entry)
+            profiler.stop(app_config.name, 'import', start)
+            app_config.import_models = profiler.wrap(app_config.name, 'models', app_config.import_models)
+            app_config.ready = profiler.wrap(app_config.name, 'ready', app_config.ready)
+            return app_config
+
+        def run_app_startup(app):
+            """
+            Runs the startup module of the given app, timing it.
+            """
+            start = profiler.start()
+            original_run_app_startup(app)
+            profiler.stop(app, 'startup', start)
+
+        original_run_app_startup = django_startup.run_app_startup
+        self._patch(AppConfig, 'create', classmethod(create))
+        self._patch(django_startup, 'run_app_startup', run_app_startup)
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._originals:
+            target, name, original = self._originals.pop()
+            setattr(target, name, original)
+
+    def _patch(self, target, name, replacement):
+        """
+        Replaces the given attribute until the profiler exits.
+        """
+        self._originals.append((target, name, target.__dict__[name]))
+        setattr(target, name, replacement)
+
+    def wrap(self, app_name, phase, func):
+        """
+        Returns a version of func that records its time and memory as the given phase of the given app.
+        """
+        def wrapper(*args, **kwargs):
+            """
+            Calls the wrapped function, timing it.
+            """
+            start = self.start()
+            result = func(*args, **kwargs)
+            self.stop(app_name, phase, start)
+            return result
+        return wrapper
+
+    def start(self):
+        """
+        Returns the current time and peak memory, to be passed to stop().
+        """
+        return time.time(), max_rss_kb()
+
+    def stop(self, app_name, phase, start):
+        """
+        Records the time and memory used by the given phase of the given app since start.
+        """
+        start_time, start_rss_kb = start
+        measurement = self.measurements.setdefault(app_name, {
+            'app': app_name,
+            'seconds': 0.0,
+            'max_rss_increase_kb': 0,
+        })
+        seconds = time.time() - start_time
+        measurement[phase] = measurement.get(phase, 0.0) + seconds
+        measurement['seconds'] += seconds
+        measurement['max_rss_increase_kb'] += max_rss_kb() - start_rss_kb
+
+    def report(self):
+        """
+        Returns the measurements of all apps, slowest first.
+        """
+        return sorted(self.measurements.values(), key=lambda measurement: measurement['seconds'], reverse=True)
+
+
+def max_rss_kb():
+    """
+    Returns the maximum resident set size of this process, in kilobytes.
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, but OS X reports bytes.
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def profile_startup(startup_module_name, lazy=False):
+    """
+    Runs the given startup module, like manage.py does, and returns the measurements of its apps.
+
+    Arguments:
+        startup_module_name (str): e.g. 'lms.startup' or 'cms.startup'
+        lazy (bool): whether to start with LAZY_STARTUP enabled
+
+    Returns:
+        (dict): total time and memory of the startup, and the measurements of each app
+    """
+    from django.conf import settings
+
+    start_time, start_rss_kb = time.time(), max_rss_kb()
+    if lazy:
+        settings.LAZY_STARTUP = True
+
+    with StartupProfiler() as profiler:
+        import_module(startup_module_name).run()
+
+    return {
+        'seconds': time.time() - start_time,
+        'max_rss_kb': max_rss_kb(),
+        'max_rss_increase_kb': max_rss_kb() - start_rss_kb,
+        'apps': profiler.report(),
+    }
+
+
+def main():
+    """
+    Profiles the startup given on the command line, and writes the result as JSON to standard output.
+    """
+    parser = ArgumentParser(description='Profile the startup of the LMS or Studio.')
+    parser.add_argument('startup', help="Startup module to run, e.g. 'lms.startup'")
+    parser.add_argument('--lazy', action='store_true', help='Start with LAZY_STARTUP enabled.')
+    args = parser.parse_args()
+
+    # Start like manage.py does.
+    from safe_lxml import defuse_xml_libs
+    defuse_xml_libs()
+    if not os.environ.get('ENABLE_CONTRACTS'):
+        import contracts
+        contracts.disable_all()
+
+    json.dump(profile_startup(args.startup, lazy=args.lazy), sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Tests for the sampling profiler.
+"""
+import json
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import patch
+
+from courseware.tests.factories import GlobalStaffFactory
+from openedx.core.djangoapps.performance.middleware import SamplingProfilerMiddleware
+from openedx.core.djangoapps.performance.profiler import (
+    ENABLE_SAMPLING_PROFILER,
+    WAFFLE_SWITCHES,
+    ProfileStore,
+    StackSampler,
+    to_collapsed,
+    to_speedscope
+)
+from student.tests.factories import UserFactory
+
+PROFILES_URL = '/performance/profiles'
+VIEW_NAME = u'courseware.views.views.progress'
+
+
+def _busy_view(request):  # pylint: disable=unused-argument
+    """
+    A view that spins for a little while so that it is sampled.
+    """
+    end = time.time() + 0.05
+    while time.time() < end:
+        pass
+
+
+class StackSamplerTest(TestCase):
+    """
+    Tests for StackSampler.
+    """
+    def test_samples_current_thread(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        _busy_view(None)
+        stacks = sampler.stop()
+
+        self.assertGreater(sum(stacks.values()), 0)
+        self.assertTrue(any('test_profiler:_busy_view' in stack for stack in stacks))
+
+    def test_max_samples(self):
+        sampler = StackSampler(interval=0.001, max_samples=2)
+        sampler.start()
+        _busy_view(None)
+        stacks = sampler.stop()
+        self.assertEqual(sum(stacks.values()), 2)
+
+
+class ProfileStoreTest(TestCase):
+    """
+    Tests for ProfileStore and the export formats.
+    """
+    def setUp(self):
+        super(ProfileStoreTest, self).setUp()
+        cache.clear()
+        self.store = ProfileStore(max_profiles_per_view=2)
+
+    def test_rolling_aggregate(self):
+        self.store.add(VIEW_NAME, {u'a;b': 5}, 1.5)
+        self.store.add(VIEW_NAME, {u'a;b': 1, u'a;c': 2}, 1.5)
+        self.assertEqual(self.store.aggregate(VIEW_NAME), Counter({u'a;b': 6, u'a;c': 2}))
+
+        # The oldest profile is dropped once the view is over capacity
+        self.store.add(VIEW_NAME, {u'a;d': 1}, 1.5)
+        self.assertEqual(self.store.aggregate(VIEW_NAME), Counter({u'a;b': 1, u'a;c': 2, u'a;d': 1}))
+        self.assertEqual(self.store.view_names(), [VIEW_NAME])
+
+    def test_clear(self):
+        self.store.add(VIEW_NAME, {u'a;b': 5}, 1.5)
+        self.store.add(u'other.view', {u'a;b': 5}, 1.5)
+        self.store.clear(VIEW_NAME)
+        self.assertEqual(self.store.view_names(), [u'other.view'])
+        self.assertEqual(self.store.get_profiles(VIEW_NAME), [])
+
+    def test_to_collapsed(self):
+        self.assertEqual(to_collapsed(Counter({u'a;c': 2, u'a;b': 6})), u'a;b 6\na;c 2\n')
+
+    def test_to_speedscope(self):
+        document = to_speedscope(VIEW_NAME, Counter({u'a;c': 2, u'a;b': 6}), interval=0.005)
+        self.assertEqual(document['shared']['frames'], [{'name': u'a'}, {'name': u'b'}, {'name': u'c'}])
+        profile = document['profiles'][0]
+        self.assertEqual(profile['samples'], [[0, 1], [0, 2]])
+        self.assertEqual(profile['weights'], [30, 10])
+        self.assertEqual(profile['endValue'], 40)
+
+
+@override_settings(SAMPLING_PROFILER=dict(SAMPLE_RATE=1.0, LATENCY_THRESHOLD=0.01, SAMPLING_INTERVAL=0.001))
+class SamplingProfilerMiddlewareTest(TestCase):
+    """
+    Tests for SamplingProfilerMiddleware.
+    """
+    def setUp(self):
+        super(SamplingProfilerMiddlewareTest, self).setUp()
+        cache.clear()
+        self.middleware = SamplingProfilerMiddleware()
+        self.request = RequestFactory().get('/')
+
+    def _process(self, view_func=_busy_view):
+        """
+        Runs the given view through the middleware.
+        """
+        self.middleware.process_view(self.request, view_func, [], {})
+        view_func(self.request)
+        self.middleware.process_response(self.request, 'fake response')
+
+    def test_disabled(self):
+        self._process()
+        self.assertEqual(ProfileStore().view_names(), [])
+
+    def test_slow_request_is_stored(self):
+        with WAFFLE_SWITCHES.override(ENABLE_SAMPLING_PROFILER, active=True):
+            self._process()
+        view_name = u'{}._busy_view'.format(__name__)
+        self.assertEqual(ProfileStore().view_names(), [view_name])
+        self.assertEqual(ProfileStore().get_profiles(view_name)[0]['path'], '/')
+
+    @patch('openedx.core.djangoapps.performance.middleware.random.random', return_value=0.5)
+    @override_settings(SAMPLING_PROFILER=dict(SAMPLE_RATE=0.1))
+    def test_unsampled_request(self, __):
+        with WAFFLE_SWITCHES.override(ENABLE_SAMPLING_PROFILER, active=True):
+            self._process()
+        self.assertEqual(ProfileStore().view_names(), [])
+
+    def test_fast_request_is_not_stored(self):
+        with WAFFLE_SWITCHES.override(ENABLE_SAMPLING_PROFILER, active=True):
+            self._process(view_func=lambda request: None)
+        self.assertEqual(ProfileStore().view_names(), [])
+
+
+class ProfilesViewTest(TestCase):
+    """
+    Tests for the staff-only profiles endpoint.
+    """
+    def setUp(self):
+        super(ProfilesViewTest, self).setUp()
+        cache.clear()
+        ProfileStore().add(VIEW_NAME, {u'a;b': 5}, 1.5)
+        self.staff = GlobalStaffFactory()
+        self.client.login(username=self.staff.username, password='test')
+
+    def test_non_staff(self):
+        user = UserFactory()
+        self.client.login(username=user.username, password='test')
+        response = self.client.get(PROFILES_URL)
+        self.assertEqual(response.status_code, 403)
+
+    def test_list_views(self):
+        response = self.client.get(PROFILES_URL)
+        self.assertEqual(json.loads(response.content), {VIEW_NAME: 1})
+
+    def test_collapsed(self):
+        response = self.client.get(PROFILES_URL, {'view': VIEW_NAME})
+        self.assertEqual(response.content, 'a;b 5\n')
+
+    def test_speedscope(self):
+        response = self.client.get(PROFILES_URL, {'view': VIEW_NAME, 'format': 'speedscope'})
+        self.assertEqual(json.loads(response.content)['name'], VIEW_NAME)
+
+    def test_unknown_view(self):
+        response = self.client.get(PROFILES_URL, {'view': 'unknown.view'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,71 @@
+"""
+Tests for the startup profiler.
+"""
+import json
+from StringIO import StringIO
+
+from django.apps import AppConfig
+from django.core.management import call_command
+from django.test import TestCase
+from mock import patch
+
+from openedx.core.djangoapps.performance.startup_profiler import StartupProfiler
+from openedx.core.lib import django_startup
+
+APP_NAME = 'openedx.core.djangoapps.performance'
+
+
+class StartupProfilerTest(TestCase):
+    """
+    Tests for recording the startup of each app.
+    """
+    def test_phases_recorded(self):
+        with StartupProfiler() as profiler:
+            app_config = AppConfig.create(APP_NAME)
+            app_config.import_models({})
+            app_config.ready()
+            django_startup.run_app_startup(APP_NAME)
+
+        measurement = profiler.report()[0]
+        self.assertEqual(measurement['app'], APP_NAME)
+        self.assertItemsEqual(
+            set(measurement) - {'app', 'seconds', 'max_rss_increase_kb'},
+            ['import', 'models', 'ready', 'startup'],
+        )
+        self.assertGreaterEqual(measurement['seconds'], measurement['import'])
+
+    def test_patches_removed(self):
+        original_run_app_startup = django_startup.run_app_startup
+        with StartupProfiler() as profiler:
+            pass
+        AppConfig.create(APP_NAME)
+        self.assertIs(django_startup.run_app_startup, original_run_app_startup)
+        self.assertEqual(profiler.report(), [])
+
+
+class ProfileStartupCommandTest(TestCase):
+    """
+    Tests for the profile_startup management command.
+    """
+    REPORT = {
+        'seconds': 12.5,
+        'max_rss_kb': 400000,
+        'max_rss_increase_kb': 300000,
+        'apps': [
+            {'app': 'courseware', 'seconds': 2.0, 'import': 1.5, 'models': 0.5, 'max_rss_increase_kb': 20000},
+            {'app': 'student', 'seconds': 1.0, 'import': 1.0, 'max_rss_increase_kb': 10000},
+        ],
+    }
+
+    @patch('subprocess.check_output')
+    def test_report(self, mock_check_output):
+        mock_check_output.return_value = json.dumps(self.REPORT)
+        output = StringIO()
+        call_command('profile_startup', '--startup', 'lms.startup', '--lazy', '--limit', '1', stdout=output)
+
+        command = mock_check_output.call_args[0][0]
+        self.assertEqual(command[-2:], ['lms.startup', '--lazy'])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], 'lms.startup: 12.50s, peak memory 400000 KB (+300000 KB)')
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].endswith('courseware'))
@@ -8,4 +8,5 @@ urlpatterns = patterns(
     'openedx.core.djangoapps.performance.views',
 
     url(r'^performance$', 'performance_log'),
+    url(r'^performance/profiles$', 'profiles'),
 )
@@ -5,9 +5,12 @@ import datetime
 import json
 import logging
 
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
 
+from openedx.core.djangoapps.performance.profiler import ProfileStore, to_collapsed, to_speedscope
 from track.utils import DateTimeJSONEncoder
+from util.json_request import JsonResponse
+from util.views import require_global_staff
 
 
 log = logging.getLogger("perflog")
@@ -55,3 +58,33 @@ def performance_log(request):
     log.info(json.dumps(event, cls=DateTimeJSONEncoder))
 
     return HttpResponse(status=204)
+
+
+@require_global_staff
+def profiles(request):
+    """
+    Staff-only endpoint exposing the stacks recorded by the sampling profiler.
+
+    Without a "view" argument, returns the list of profiled views along with
+    the number of stored profiles for each.  With a "view" argument, returns
+    the aggregated stacks for that view in the requested "format", either
+    "collapsed" (the default) or "speedscope".
+    """
+    store = ProfileStore()
+    view_name = _get_request_value(request, 'view')
+    if not view_name:
+        return JsonResponse({
+            name: len(store.get_profiles(name))
+            for name in store.view_names()
+        })
+
+    stacks = store.aggregate(view_name)
+    if not stacks:
+        raise Http404
+
+    output_format = _get_request_value(request, 'format', 'collapsed')
+    if output_format == 'collapsed':
+        return HttpResponse(to_collapsed(stacks), content_type='text/plain; charset=utf-8')
+    elif output_format == 'speedscope':
+        return JsonResponse(to_speedscope(view_name, stacks))
+    return HttpResponseBadRequest(u'Unsupported format: {}'.format(output_format))
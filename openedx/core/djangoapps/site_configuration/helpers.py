@@ -1,11 +1,23 @@
 """
 Helpers methods for site configuration.
 """
+from collections import namedtuple
+
+import crum
 from django.conf import settings
 
 from microsite_configuration import microsite
 from openedx.core.djangoapps.site_configuration.models import SiteConfiguration
 
+# Whether the site configuration of a request is enabled, and its values.
+# The values are shared with the SiteConfiguration and must not be modified.
+ConfigurationSnapshot = namedtuple('ConfigurationSnapshot', ['enabled', 'values'])
+
+_DISABLED_CONFIGURATION = ConfigurationSnapshot(False, {})
+
+# Name of the attribute of the request in which its configuration snapshot is stored.
+_SNAPSHOT_ATTRIBUTE = '_site_configuration_snapshot'
+
 
 def get_current_site_configuration():
     """
@@ -26,6 +38,33 @@ def get_current_site_configuration():
         return None
 
 
+def get_current_configuration_snapshot():
+    """
+    Return a snapshot of the configuration of the current site.
+
+    The snapshot is taken once per request, after the site of the request
+    is known, so that configuration values are read with dictionary lookups
+    from then on.  Outside of requests, a new snapshot is returned each time.
+
+    Returns:
+        (ConfigurationSnapshot): whether the configuration is enabled, and its values.
+    """
+    request = crum.get_current_request()
+    snapshot = getattr(request, _SNAPSHOT_ATTRIBUTE, None)
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = _DISABLED_CONFIGURATION
+    configuration = get_current_site_configuration()
+    if configuration and configuration.enabled:
+        values = configuration.values
+        snapshot = ConfigurationSnapshot(True, values if isinstance(values, dict) else {})
+
+    if hasattr(request, 'site'):
+        setattr(request, _SNAPSHOT_ATTRIBUTE, snapshot)
+    return snapshot
+
+
 def is_site_configuration_enabled():
     """
     Returns True is there is SiteConfiguration instance associated with the current site and it is enabled, otherwise
@@ -34,10 +73,7 @@ def is_site_configuration_enabled():
     Returns:
         (bool): True if SiteConfiguration is present and enabled, False otherwise
     """
-    configuration = get_current_site_configuration()
-    if configuration:
-        return configuration.enabled
-    return False
+    return get_current_configuration_snapshot().enabled
 
 
 def has_configuration_override(name):
@@ -106,13 +142,18 @@ def get_value(val_name, default=None, **kwargs):
         Configuration/Microsite value for the given key.
     """
 
-    if is_site_configuration_enabled():
+    snapshot = get_current_configuration_snapshot()
+    if snapshot.enabled:
         # Retrieve the requested field/value from the site configuration
-        configuration_value = get_configuration_value(val_name, default=default)
+        configuration_value = snapshot.values.get(val_name, default)
     else:
         # Retrieve the requested field/value from the microsite configuration
         configuration_value = microsite.get_value(val_name, default=default, **kwargs)
 
+    # Most lookups have no default, or a simple one, which cannot be merged with the value.
+    if default is None or isinstance(default, (basestring, bool, int, long, float)):
+        return configuration_value
+
     # Attempt to perform a dictionary update using the provided default
     # This will fail if either the default or the microsite value is not a dictionary
     try:
@@ -144,8 +185,11 @@ def get_dict(name, default=None):
     """
     default = default or {}
 
-    if is_site_configuration_enabled():
-        return get_configuration_dict(name, default)
+    snapshot = get_current_configuration_snapshot()
+    if snapshot.enabled:
+        output = default.copy()
+        output.update(snapshot.values.get(name) or {})
+        return output
     else:
         return microsite.get_dict(name, default)
 
@@ -161,8 +205,9 @@ def has_override_value(name):
     Returns:
         (bool): True if given key is present in the configuration.
     """
-    if is_site_configuration_enabled():
-        return has_configuration_override(name)
+    snapshot = get_current_configuration_snapshot()
+    if snapshot.enabled:
+        return name in snapshot.values
     else:
         return microsite.has_override_value(name)
 
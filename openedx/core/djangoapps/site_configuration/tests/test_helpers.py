@@ -2,7 +2,9 @@
 Tests for helper function provided by site_configuration app.
 """
 
-from django.test import TestCase
+import crum
+from django.test import RequestFactory, TestCase
+from mock import patch
 
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.djangoapps.site_configuration.tests.test_util import (
@@ -201,3 +203,39 @@ class TestHelpers(TestCase):
             list(configuration_helpers.get_current_site_orgs()),
             test_orgs
         )
+
+    def test_configuration_snapshot_reused_within_request(self):
+        """
+        Test that the site configuration is looked up once per request, once its site is known.
+        """
+        request = RequestFactory().get('/')
+        request.site = None
+        crum.set_current_request(request)
+        self.addCleanup(crum.set_current_request, None)
+
+        with with_site_configuration_context(configuration=test_config):
+            with patch.object(
+                configuration_helpers, 'get_current_site_configuration',
+                wraps=configuration_helpers.get_current_site_configuration,
+            ) as mock_get_configuration:
+                self.assertEqual(configuration_helpers.get_value('university'), test_config['university'])
+                self.assertEqual(configuration_helpers.get_value('SITE_NAME'), test_config['SITE_NAME'])
+                self.assertTrue(configuration_helpers.has_override_value('favicon_path'))
+                self.assertTrue(configuration_helpers.is_site_configuration_enabled())
+                self.assertEqual(mock_get_configuration.call_count, 1)
+
+    def test_configuration_snapshot_not_reused_without_site(self):
+        """
+        Test that the site configuration is looked up on each call until the site of the request is known.
+        """
+        crum.set_current_request(RequestFactory().get('/'))
+        self.addCleanup(crum.set_current_request, None)
+
+        with with_site_configuration_context(configuration=test_config):
+            with patch.object(
+                configuration_helpers, 'get_current_site_configuration',
+                wraps=configuration_helpers.get_current_site_configuration,
+            ) as mock_get_configuration:
+                self.assertEqual(configuration_helpers.get_value('university'), test_config['university'])
+                self.assertEqual(configuration_helpers.get_value('SITE_NAME'), test_config['SITE_NAME'])
+                self.assertEqual(mock_get_configuration.call_count, 2)
@@ -6,7 +6,8 @@ from logging import getLogger
 from django.conf import settings
 from path import Path as path
 
-from .helpers import get_themes
+from .helpers import get_theme_base_dirs, get_themes
+from .manifest import build_manifest, watch_theme_dirs
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -22,12 +23,21 @@ def enable_theming():
             "\n\tCOMPREHENSIVE_THEME_DIR setting has been deprecated in favor of COMPREHENSIVE_THEME_DIRS.\033[00m"
         )
 
-    for theme in get_themes():
+    themes = get_themes()
+    for theme in themes:
         if theme.themes_base_dir not in settings.MAKO_TEMPLATES['main']:
             settings.MAKO_TEMPLATES['main'].insert(0, theme.themes_base_dir)
 
     _add_theming_locales()
 
+    # Index the templates and static assets overridden by the themes, and keep
+    # the index current while themes are being developed.  With lazy startup,
+    # the theme directories are indexed on their first use instead.
+    if not getattr(settings, 'LAZY_STARTUP', False):
+        build_manifest(themes)
+    if settings.DEBUG:
+        watch_theme_dirs(get_theme_base_dirs())
+
 
 def _add_theming_locales():
     """
@@ -11,10 +11,15 @@ from path import Path
 
 from microsite_configuration import microsite
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from openedx.core.djangoapps.theming.manifest import theme_has_file
 from request_cache.middleware import RequestCache
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
+# Validated theme base directories, keyed by the settings they were computed from.
+_THEME_BASE_DIRS_CACHE = {}
+_NOT_SET = object()
+
 
 def get_template_path(relative_path, **kwargs):
     """
@@ -72,8 +77,7 @@ def get_template_path_with_theme(relative_path):
     template_name = re.sub(r'^/+', '', relative_path)
 
     template_path = theme.template_path / template_name
-    absolute_path = theme.path / "templates" / template_name
-    if absolute_path.exists():
+    if theme_has_file(str(theme.path / "templates"), template_name):
         return str(template_path)
     else:
         return relative_path
@@ -274,6 +278,37 @@ def get_theme_base_dirs():
     if not is_comprehensive_theming_enabled():
         return []
 
+    return list(get_configured_theme_base_dirs())
+
+
+def get_configured_theme_base_dirs():
+    """
+    Return the theme base directories configured in settings, whether or not theming
+    is enabled for the current request.
+
+    The settings are validated once for each value they take, as checking that the
+    directories exist touches the filesystem.
+
+    Raises:
+        ImproperlyConfigured - exception is raised if the settings are invalid, see get_theme_base_dirs.
+
+    Returns:
+         (tuple): Base theme directory paths
+    """
+    settings_key = (
+        repr(getattr(settings, "COMPREHENSIVE_THEME_DIR", _NOT_SET)),
+        repr(getattr(settings, "COMPREHENSIVE_THEME_DIRS", _NOT_SET)),
+    )
+    theme_base_dirs = _THEME_BASE_DIRS_CACHE.get(settings_key)
+    if theme_base_dirs is None:
+        theme_base_dirs = _THEME_BASE_DIRS_CACHE[settings_key] = tuple(_validate_theme_base_dirs())
+    return theme_base_dirs
+
+
+def _validate_theme_base_dirs():
+    """
+    Return the theme base directories configured in settings after validating them.
+    """
     theme_base_dirs = []
 
     # Legacy code for COMPREHENSIVE_THEME_DIR backward compatibility
@@ -0,0 +1,28 @@
+"""
+Management command for refreshing the theme manifest.
+"""
+
+from __future__ import unicode_literals
+
+from django.core.management import BaseCommand
+
+from openedx.core.djangoapps.theming.manifest import MANIFEST_VERSION_CHECK_INTERVAL, refresh_manifest
+
+
+class Command(BaseCommand):
+    """
+    Make running processes list the templates and static assets of themes again.
+
+    This is needed after themes are changed on disk without restarting the
+    processes serving them, e.g. after collecting themed static assets.
+    """
+
+    help = 'Make running processes rebuild their manifest of themed templates and static assets.'
+
+    def handle(self, *args, **options):
+        refresh_manifest()
+        self.stdout.write(
+            'The theme manifest will be rebuilt by running processes within {} seconds.'.format(
+                MANIFEST_VERSION_CHECK_INTERVAL
+            )
+        )
@@ -0,0 +1,196 @@
+"""
+In-memory manifest of the templates and static assets provided by each theme.
+
+Resolving a themed template or static asset means checking whether the
+current theme overrides it.  Rather than probing the filesystem on every
+render, the files under each theme directory are listed once per process
+and looked up in memory.
+
+The manifest is built when theming is enabled at startup, and directories
+that were not indexed then are indexed on first use.  The `refresh_theme_manifest`
+management command makes running processes rebuild their manifest, and in
+development a watcher rebuilds it whenever a file in a theme directory is
+added, moved or removed.
+"""
+import os
+import threading
+import time
+from logging import getLogger
+
+from django.conf import settings
+from django.core.cache import cache
+from path import Path
+
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
+MANIFEST_VERSION_CACHE_KEY = 'theming.manifest.version'
+
+# Number of seconds between two checks whether the manifest was refreshed in another process.
+MANIFEST_VERSION_CHECK_INTERVAL = 60
+
+_manifest_lock = threading.Lock()
+_manifest = {
+    # Mapping of absolute directory paths to the set of paths of the files they contain.
+    'files': {},
+    'version': None,
+    'version_checked_at': 0,
+}
+
+
+def theme_has_file(root, relative_path):
+    """
+    Returns True if the given file exists under the given theme directory.
+
+    Example:
+        >> theme_has_file('/edx/app/edxapp/themes/red-theme/lms/templates', 'header.html')
+        True
+
+    Arguments:
+        root (str): absolute path to a directory of a theme, e.g. its templates directory
+        relative_path (str): path of the file relative to `root`
+
+    Returns:
+        (bool): True if the file exists under `root`
+    """
+    _check_manifest_version()
+    files = _manifest['files'].get(root)
+    if files is None:
+        files = index_directory(root)
+    return os.path.normpath(relative_path) in files
+
+
+def index_directory(root):
+    """
+    List the files under the given directory, add them to the manifest and return them.
+
+    Arguments:
+        root (str): absolute path to the directory
+
+    Returns:
+        (frozenset): paths of the files under `root`, relative to `root`
+    """
+    files = set()
+    for dirpath, __, filenames in os.walk(root, followlinks=True):
+        relative_dir = os.path.relpath(dirpath, root)
+        for filename in filenames:
+            files.add(os.path.normpath(os.path.join(relative_dir, filename)))
+
+    files = frozenset(files)
+    with _manifest_lock:
+        _manifest['files'][root] = files
+    return files
+
+
+def build_manifest(themes):
+    """
+    Replace the manifest with one listing the templates and static assets of the given themes.
+
+    Arguments:
+        themes (list): list of Theme objects
+    """
+    with _manifest_lock:
+        _manifest['files'] = {}
+
+    for theme in themes:
+        for template_dir in theme.template_dirs:
+            index_directory(str(template_dir))
+        index_directory(get_theme_static_dir(theme.theme_dir_name, theme.themes_base_dir))
+
+    logger.info('Built the theme manifest for %d themes.', len(themes))
+
+
+def clear_manifest():
+    """
+    Empty the manifest of the current process, so that theme directories are listed again on their next use.
+    """
+    with _manifest_lock:
+        _manifest['files'] = {}
+
+
+def refresh_manifest():
+    """
+    Make every process rebuild its manifest, within MANIFEST_VERSION_CHECK_INTERVAL seconds.
+    """
+    clear_manifest()
+    version = time.time()
+    cache.set(MANIFEST_VERSION_CACHE_KEY, version, None)
+    _manifest['version'] = version
+
+
+def get_theme_static_dir(theme_dir_name, themes_base_dir, static_root=None):
+    """
+    Returns the directory from which the static assets of the given theme are served.
+
+    In debug mode, assets are served from the theme directory itself, otherwise they
+    are served from the theme's directory in the collected static files.
+
+    Arguments:
+        theme_dir_name (str): directory name of the theme, e.g. 'red-theme'
+        themes_base_dir (str): directory that contains the theme
+        static_root (str): directory of the collected static files, STATIC_ROOT by default
+
+    Returns:
+        (str): absolute path to the directory containing the theme's static assets
+    """
+    if settings.DEBUG:
+        return str(Path(themes_base_dir) / theme_dir_name / _get_project_root_name() / 'static')
+    return str(Path(static_root or settings.STATIC_ROOT) / theme_dir_name)
+
+
+def watch_theme_dirs(theme_base_dirs):
+    """
+    Start watching the given theme directories, and clear the manifest whenever
+    a file is added, moved or removed in them.
+
+    This is meant for development, where themes change while the server runs.
+
+    Arguments:
+        theme_base_dirs (list): directories that contain themes
+    """
+    # watchdog is only used in development, so avoid importing it otherwise.
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class ManifestEventHandler(FileSystemEventHandler):
+        """
+        Clears the theme manifest on changes to the set of theme files.
+        """
+        def on_created(self, event):
+            clear_manifest()
+
+        def on_deleted(self, event):
+            clear_manifest()
+
+        def on_moved(self, event):
+            clear_manifest()
+
+    observer = Observer()
+    for theme_base_dir in theme_base_dirs:
+        observer.schedule(ManifestEventHandler(), str(theme_base_dir), recursive=True)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def _check_manifest_version():
+    """
+    Empty the manifest of the current process if it was refreshed in another process.
+    """
+    now = time.time()
+    if now - _manifest['version_checked_at'] < MANIFEST_VERSION_CHECK_INTERVAL:
+        return
+
+    _manifest['version_checked_at'] = now
+    version = cache.get(MANIFEST_VERSION_CACHE_KEY)
+    if version != _manifest['version']:
+        _manifest['version'] = version
+        clear_manifest()
+
+
+def _get_project_root_name():
+    """
+    Return root name for the current project, e.g. lms or cms.
+    """
+    # Imported here as helpers imports this module.
+    from openedx.core.djangoapps.theming.helpers import get_project_root_name
+    return get_project_root_name()
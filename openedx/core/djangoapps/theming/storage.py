@@ -19,6 +19,7 @@ from openedx.core.djangoapps.theming.helpers import (
     get_themes,
     is_comprehensive_theming_enabled
 )
+from openedx.core.djangoapps.theming.manifest import get_theme_static_dir, theme_has_file
 
 
 class ThemeStorage(StaticFilesStorage):
@@ -55,18 +56,22 @@ class ThemeStorage(StaticFilesStorage):
             is provided by red-theme otherwise '/static/images/logo.png'
         """
         prefix = ''
+        is_themed = False
         theme = get_current_theme()
 
-        # get theme prefix from site address if if asset is accessed via a url
+        # get theme prefix from site address if if asset is accessed via a url, and look the asset up
+        # in the theme manifest instead of the filesystem, as assets do not change while serving requests
         if theme:
             prefix = theme.theme_dir_name
+            is_themed = self.themed_in_manifest(name, theme)
 
         # get theme prefix from storage class, if asset is accessed during collectstatic run
         elif self.prefix:
             prefix = self.prefix
+            is_themed = self.themed(name, prefix)
 
         # join theme prefix with asset name if theme is applied and themed asset exists
-        if prefix and self.themed(name, prefix):
+        if prefix and is_themed:
             name = os.path.join(prefix, name)
 
         return super(ThemeStorage, self).url(name)
@@ -104,6 +109,24 @@ class ThemeStorage(StaticFilesStorage):
         else:
             return self.exists(os.path.join(theme, name))
 
+    def themed_in_manifest(self, name, theme):
+        """
+        Returns True if given asset override is provided by the given theme, according to the theme manifest.
+
+        Args:
+            name: asset name e.g. 'images/logo.png'
+            theme: Theme object of the theme
+
+        Returns:
+            True if given asset override is provided by the given theme otherwise returns False
+        """
+        if not is_comprehensive_theming_enabled() or not name:
+            return False
+
+        name = name[1:] if name.startswith("/") else name
+        static_dir = get_theme_static_dir(theme.theme_dir_name, theme.themes_base_dir, static_root=self.location)
+        return theme_has_file(static_dir, name)
+
 
 class ThemeCachedFilesMixin(CachedFilesMixin):
     """
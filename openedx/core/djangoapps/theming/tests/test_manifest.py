@@ -0,0 +1,80 @@
+"""
+Tests for the manifest of themed templates and static assets.
+"""
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from mock import patch
+
+from openedx.core.djangoapps.theming.manifest import (
+    MANIFEST_VERSION_CACHE_KEY,
+    clear_manifest,
+    theme_has_file
+)
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+
+
+class TestThemeManifest(CacheIsolationTestCase):
+    """
+    Test the theme manifest.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestThemeManifest, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.addCleanup(clear_manifest)
+        clear_manifest()
+        self._create_file('header.html')
+        self._create_file('emails/welcome.txt')
+
+    def _create_file(self, relative_path):
+        """
+        Create an empty file in the theme directory.
+        """
+        path = os.path.join(self.root, relative_path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        open(path, 'w').close()
+
+    def test_theme_has_file(self):
+        self.assertTrue(theme_has_file(self.root, 'header.html'))
+        self.assertTrue(theme_has_file(self.root, 'emails/welcome.txt'))
+        self.assertTrue(theme_has_file(self.root, './emails//welcome.txt'))
+        self.assertFalse(theme_has_file(self.root, 'footer.html'))
+        self.assertFalse(theme_has_file(self.root, 'emails'))
+
+    def test_missing_directory(self):
+        self.assertFalse(theme_has_file(os.path.join(self.root, 'missing'), 'header.html'))
+
+    def test_filesystem_is_listed_once(self):
+        self.assertFalse(theme_has_file(self.root, 'footer.html'))
+        self._create_file('footer.html')
+        with patch('openedx.core.djangoapps.theming.manifest.os.walk') as mock_walk:
+            self.assertFalse(theme_has_file(self.root, 'footer.html'))
+        self.assertFalse(mock_walk.called)
+
+        clear_manifest()
+        self.assertTrue(theme_has_file(self.root, 'footer.html'))
+
+    def test_refresh_command(self):
+        self.assertFalse(theme_has_file(self.root, 'footer.html'))
+        self._create_file('footer.html')
+
+        call_command('refresh_theme_manifest')
+        self.assertIsNotNone(cache.get(MANIFEST_VERSION_CACHE_KEY))
+        self.assertTrue(theme_has_file(self.root, 'footer.html'))
+
+    @patch('openedx.core.djangoapps.theming.manifest.MANIFEST_VERSION_CHECK_INTERVAL', 0)
+    def test_refresh_in_other_process(self):
+        self.assertFalse(theme_has_file(self.root, 'footer.html'))
+        self._create_file('footer.html')
+        self.assertFalse(theme_has_file(self.root, 'footer.html'))
+
+        # Another process refreshed the manifest.
+        cache.set(MANIFEST_VERSION_CACHE_KEY, 'new-version')
+        self.assertTrue(theme_has_file(self.root, 'footer.html'))
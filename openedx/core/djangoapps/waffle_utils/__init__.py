@@ -44,16 +44,20 @@ To test WaffleSwitchNamespace, use the provided context managers.  For example:
     with WAFFLE_SWITCHES.override(waffle.ESTIMATE_FIRST_ATTEMPTED, active=True):
         ...
 
+Besides the request cache, switches, flags and course overrides are cached
+for the whole process, see cache.py.
+
 """
 import logging
 from abc import ABCMeta
 from contextlib import contextmanager
 from opaque_keys.edx.keys import CourseKey
 from request_cache import get_cache as get_request_cache, get_request
-from waffle import flag_is_active, switch_is_active
+from waffle import switch_is_active
 from waffle.models import Flag
 from waffle.testutils import override_switch as waffle_override_switch
 
+from .cache import get_cached_value, set_cached_value
 from .models import WaffleFlagCourseOverrideModel
 
 log = logging.getLogger(__name__)
@@ -118,7 +122,11 @@ class WaffleSwitchNamespace(WaffleNamespace):
         namespaced_switch_name = self._namespaced_name(switch_name)
         value = self._cached_switches.get(namespaced_switch_name)
         if value is None:
-            value = switch_is_active(namespaced_switch_name)
+            process_cache_key = (u'switch', namespaced_switch_name)
+            value = get_cached_value(process_cache_key)
+            if value is None:
+                value = switch_is_active(namespaced_switch_name)
+                set_cached_value(process_cache_key, value)
             self._cached_switches[namespaced_switch_name] = value
         return value
 
@@ -183,6 +191,19 @@ class WaffleFlagNamespace(WaffleNamespace):
         """
         return self._get_request_cache().setdefault('flags', {})
 
+    @staticmethod
+    def _get_flag(namespaced_flag_name):
+        """
+        Returns and caches the waffle Flag with the given name, or an unsaved
+        Flag if it is undefined.
+        """
+        process_cache_key = (u'flag', namespaced_flag_name)
+        flag = get_cached_value(process_cache_key)
+        if flag is None:
+            flag = Flag.get(namespaced_flag_name)
+            set_cached_value(process_cache_key, flag)
+        return flag
+
     def is_flag_active(self, flag_name, check_before_waffle_callback=None, flag_undefined_default=None):
         """
         Returns and caches whether the provided flag is active.
@@ -209,6 +230,7 @@ class WaffleFlagNamespace(WaffleNamespace):
         # validate arguments
         namespaced_flag_name = self._namespaced_name(flag_name)
 
+        value = None
         if check_before_waffle_callback:
             value = check_before_waffle_callback(namespaced_flag_name)
 
@@ -218,15 +240,16 @@ class WaffleFlagNamespace(WaffleNamespace):
             value = self._cached_flags.get(namespaced_flag_name)
             if value is None:
 
-                if flag_undefined_default is not None:
-                    # determine if the flag is undefined in waffle
-                    try:
-                        Flag.objects.get(name=namespaced_flag_name)
-                    except Flag.DoesNotExist:
-                        value = flag_undefined_default
+                flag = self._get_flag(namespaced_flag_name)
+
+                if flag_undefined_default is not None and flag.pk is None:
+                    # the flag is undefined in waffle
+                    value = flag_undefined_default
 
                 if value is None:
-                    value = flag_is_active(get_request(), namespaced_flag_name)
+                    # Whether the flag is active may depend on the request, so
+                    # only the flag itself is cached for the process.
+                    value = flag.is_active(get_request())
 
                 self._cached_flags[namespaced_flag_name] = value
         return value
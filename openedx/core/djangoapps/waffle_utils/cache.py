@@ -0,0 +1,65 @@
+"""
+Process-wide cache of waffle switches, flags and course overrides.
+
+Values are kept in the memory of the process for at most
+WAFFLE_UTILS_CACHE_TIMEOUT seconds, so that in steady state looking up a
+cached value takes no database or cache round trip.  They are also dropped
+when any Switch, Flag or course override is saved or deleted in the process.
+
+Other processes only see a change once their values expire: a version bumped
+when saving would be bumped before the transaction commits, so another
+process could read the old value after the bump and keep it indefinitely.
+
+Setting WAFFLE_UTILS_CACHE_TIMEOUT to 0 disables the cache.
+"""
+import time
+
+from django.conf import settings
+
+_process_cache = {
+    'values': {},
+    'expires_at': 0,
+}
+
+
+def get_cached_value(key, default=None):
+    """
+    Returns the value cached for the given key in this process, or default if there is none.
+    """
+    if not _validate():
+        return default
+    return _process_cache['values'].get(key, default)
+
+
+def set_cached_value(key, value):
+    """
+    Caches the given value in this process, if the cache is enabled.
+    """
+    if _validate():
+        _process_cache['values'][key] = value
+
+
+def invalidate():
+    """
+    Drops the cached values of this process.
+    """
+    _process_cache['values'] = {}
+    _process_cache['expires_at'] = 0
+
+
+def _validate():
+    """
+    Drops the cached values of this process once they are
+    WAFFLE_UTILS_CACHE_TIMEOUT seconds old.
+
+    Returns whether the cache is enabled.
+    """
+    timeout = getattr(settings, 'WAFFLE_UTILS_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return False
+
+    now = time.time()
+    if now >= _process_cache['expires_at']:
+        _process_cache['values'] = {}
+        _process_cache['expires_at'] = now + timeout
+    return True
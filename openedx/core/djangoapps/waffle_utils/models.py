@@ -2,13 +2,18 @@
 Models for configuring waffle utils.
 """
 from django.db.models import CharField
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from model_utils import Choices
+from waffle.models import Flag, Switch
 
 from config_models.models import ConfigurationModel
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
 from request_cache.middleware import request_cached
 
+from .cache import get_cached_value, invalidate, set_cached_value
+
 
 class WaffleFlagCourseOverrideModel(ConfigurationModel):
     """
@@ -45,10 +50,17 @@ class WaffleFlagCourseOverrideModel(ConfigurationModel):
         if not course_id or not waffle_flag:
             return cls.ALL_CHOICES.unset
 
-        effective = cls.objects.filter(waffle_flag=waffle_flag, course_id=course_id).order_by('-change_date').first()
-        if effective and effective.enabled:
-            return effective.override_choice
-        return cls.ALL_CHOICES.unset
+        process_cache_key = (u'course_override', waffle_flag, unicode(course_id))
+        value = get_cached_value(process_cache_key)
+        if value is None:
+            value = cls.ALL_CHOICES.unset
+            effective = cls.objects.filter(
+                waffle_flag=waffle_flag, course_id=course_id
+            ).order_by('-change_date').first()
+            if effective and effective.enabled:
+                value = effective.override_choice
+            set_cached_value(process_cache_key, value)
+        return value
 
     class Meta(object):
         app_label = "waffle_utils"
@@ -59,3 +71,20 @@ class WaffleFlagCourseOverrideModel(ConfigurationModel):
         enabled_label = "Enabled" if self.enabled else "Not Enabled"
         # pylint: disable=no-member
         return u"Course '{}': Persistent Grades {}".format(self.course_id.to_deprecated_string(), enabled_label)
+
+
+@receiver(post_save, sender=Switch, dispatch_uid='waffle_utils.invalidate_cache_on_switch_save')
+@receiver(post_delete, sender=Switch, dispatch_uid='waffle_utils.invalidate_cache_on_switch_delete')
+@receiver(post_save, sender=Flag, dispatch_uid='waffle_utils.invalidate_cache_on_flag_save')
+@receiver(post_delete, sender=Flag, dispatch_uid='waffle_utils.invalidate_cache_on_flag_delete')
+@receiver(
+    post_save, sender=WaffleFlagCourseOverrideModel, dispatch_uid='waffle_utils.invalidate_cache_on_override_save'
+)
+@receiver(
+    post_delete, sender=WaffleFlagCourseOverrideModel, dispatch_uid='waffle_utils.invalidate_cache_on_override_delete'
+)
+def invalidate_process_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the values cached by this process when a switch, flag or course override changes.
+    """
+    invalidate()
@@ -0,0 +1,83 @@
+"""
+Tests for the process-wide cache of waffle utils.
+"""
+import time
+
+from django.test.utils import override_settings
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+from request_cache.middleware import RequestCache
+from waffle.models import Switch
+
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+
+from .. import WaffleSwitchNamespace, cache
+from ..models import WaffleFlagCourseOverrideModel
+
+
+@override_settings(WAFFLE_UTILS_CACHE_TIMEOUT=30)
+class ProcessCacheTests(CacheIsolationTestCase):
+    """
+    Tests for caching waffle switches and course overrides in the process.
+    """
+    ENABLED_CACHES = ['default']
+
+    NAMESPACE_NAME = "test_namespace"
+    SWITCH_NAME = "test_switch"
+    TEST_COURSE_KEY = CourseKey.from_string("edX/DemoX/Demo_Course")
+
+    def setUp(self):
+        super(ProcessCacheTests, self).setUp()
+        cache.invalidate()
+        self.addCleanup(cache.invalidate)
+        self.switches = WaffleSwitchNamespace(self.NAMESPACE_NAME)
+
+    def test_switch_cached_until_saved(self):
+        switch = Switch.objects.create(name=self.NAMESPACE_NAME + '.' + self.SWITCH_NAME, active=True)
+        self.assertTrue(self.switches.is_enabled(self.SWITCH_NAME))
+
+        RequestCache.clear_request_cache()
+        with patch('openedx.core.djangoapps.waffle_utils.switch_is_active') as mock_switch_is_active:
+            self.assertTrue(self.switches.is_enabled(self.SWITCH_NAME))
+            self.assertFalse(mock_switch_is_active.called)
+
+        switch.active = False
+        switch.save()
+        RequestCache.clear_request_cache()
+        self.assertFalse(self.switches.is_enabled(self.SWITCH_NAME))
+
+    def test_course_override_cached_until_saved(self):
+        flag_name = 'test_namespace.test_flag'
+        WaffleFlagCourseOverrideModel.objects.create(
+            waffle_flag=flag_name, course_id=self.TEST_COURSE_KEY, enabled=True
+        )
+        self.assertEqual(
+            WaffleFlagCourseOverrideModel.override_value(flag_name, self.TEST_COURSE_KEY),
+            WaffleFlagCourseOverrideModel.ALL_CHOICES.on
+        )
+
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            WaffleFlagCourseOverrideModel.override_value(flag_name, self.TEST_COURSE_KEY)
+
+        WaffleFlagCourseOverrideModel.objects.create(
+            waffle_flag=flag_name, course_id=self.TEST_COURSE_KEY, enabled=False
+        )
+        RequestCache.clear_request_cache()
+        self.assertEqual(
+            WaffleFlagCourseOverrideModel.override_value(flag_name, self.TEST_COURSE_KEY),
+            WaffleFlagCourseOverrideModel.ALL_CHOICES.unset
+        )
+
+    def test_expired(self):
+        cache.set_cached_value('key', 'value')
+        self.assertEqual(cache.get_cached_value('key'), 'value')
+
+        # Changes made by other processes are seen once the values expire.
+        with patch.object(cache.time, 'time', return_value=time.time() + 60):
+            self.assertIsNone(cache.get_cached_value('key'))
+
+    @override_settings(WAFFLE_UTILS_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        cache.set_cached_value('key', 'value')
+        self.assertIsNone(cache.get_cached_value('key'))
@@ -12,12 +12,19 @@ def autostartup():
     Execute app.startup:run() for all installed django apps
     """
     for app in settings.INSTALLED_APPS:
-        # See if there's a startup module in each app.
-        try:
-            mod = import_module(app + '.startup')
-        except ImportError:
-            continue
+        run_app_startup(app)
 
-        # If the module has a run method, run it.
-        if hasattr(mod, 'run'):
-            mod.run()
+
+def run_app_startup(app):
+    """
+    Execute app.startup:run() for the given django app, if it has one
+    """
+    # See if there's a startup module in the app.
+    try:
+        mod = import_module(app + '.startup')
+    except ImportError:
+        return
+
+    # If the module has a run method, run it.
+    if hasattr(mod, 'run'):
+        mod.run()
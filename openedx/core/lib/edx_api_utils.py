@@ -2,10 +2,19 @@
 from __future__ import unicode_literals
 
 import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
 
+import requests
+from celery import task
 from django.conf import settings
+from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from edx_rest_api_client.auth import SuppliedJwtAuth
 from edx_rest_api_client.client import EdxRestApiClient
 from provider.oauth2.models import Client
 
@@ -14,6 +23,69 @@ from openedx.core.lib.token_utils import JwtBuilder
 
 log = logging.getLogger(__name__)
 
+# Cached entries are stored under "<cache key>[.<resource id>]<suffix>" as a zpickled dict with the keys:
+#   data: the API data
+#   fresh_until: timestamp after which the entry is served stale while it is refreshed
+#   etag: ETag returned by the API for the resource, if any
+CACHED_ENTRY_SUFFIX = '.swr.zpickled'
+REFRESH_LOCK_SUFFIX = '.refresh_lock'
+
+# Clients are reused until half of their JWT's lifetime has elapsed.
+API_CLIENT_POOL_SIZE = 100
+API_CLIENT_SCOPES = ('email', 'profile')
+API_CLIENT_TIMEOUT = 5
+
+_api_client_pool = OrderedDict()
+_api_client_pool_lock = threading.Lock()
+# Maps pooled clients to the (url, username) they were built for, so that a refresh task can rebuild them.
+_pooled_client_owners = weakref.WeakKeyDictionary()
+# Maps pooled clients to the requests.Session they send requests with, used for conditional requests.
+_pooled_client_sessions = weakref.WeakKeyDictionary()
+
+
+def get_api_client(url, user):
+    """Returns an EdxRestApiClient for the given API URL, authenticated as the given user.
+
+    Clients are pooled per process and per (url, username), which saves building a new JWT for
+    each call and lets requests reuse the client's HTTP connections.
+
+    Arguments:
+        url (str): Root URL of the API.
+        user (User): The user to authenticate as.
+
+    Returns:
+        EdxRestApiClient
+    """
+    expires_in = settings.OAUTH_ID_TOKEN_EXPIRATION
+    pool_key = (url, user.username)
+    now = time.time()
+
+    with _api_client_pool_lock:
+        pooled = _api_client_pool.pop(pool_key, None)
+        if pooled is not None and pooled[1] > now:
+            _api_client_pool[pool_key] = pooled
+            return pooled[0]
+
+    jwt = JwtBuilder(user).build_token(list(API_CLIENT_SCOPES), expires_in)
+    session = requests.Session()
+    session.auth = SuppliedJwtAuth(jwt)
+    client = EdxRestApiClient(url, jwt=jwt, session=session, timeout=API_CLIENT_TIMEOUT)
+
+    with _api_client_pool_lock:
+        _api_client_pool[pool_key] = (client, now + expires_in / 2)
+        _pooled_client_owners[client] = pool_key
+        _pooled_client_sessions[client] = session
+        while len(_api_client_pool) > API_CLIENT_POOL_SIZE:
+            _api_client_pool.popitem(last=False)
+
+    return client
+
+
+def clear_api_client_pool():
+    """Removes all pooled API clients."""
+    with _api_client_pool_lock:
+        _api_client_pool.clear()
+
 
 def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=None, cache_key=None, many=True,
                      traverse_pagination=True):
@@ -21,6 +93,12 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
 
     DRY utility for handling caching and pagination.
 
+    Cached data is served stale while it is refreshed: once an entry is older than the config's
+    cache_ttl, the stale value is returned and a celery task refreshes it in the background, under
+    a lock so that a single worker hits the API. Entries can be refreshed in the background when
+    the API client comes from get_api_client; otherwise they are refreshed synchronously. Single
+    resources requested with a client from get_api_client are revalidated with their ETag.
+
     Arguments:
         api_config (ConfigurationModel): The configuration model governing interaction with the API.
         resource (str): Name of the API resource being requested.
@@ -45,36 +123,161 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
         log.warning('%s configuration is disabled.', api_config.API_NAME)
         return no_data
 
+    entry = None
+    entry_key = None
     if cache_key:
-        cache_key = '{}.{}'.format(cache_key, resource_id) if resource_id is not None else cache_key
-        cache_key += '.zpickled'
+        entry_key = '{}.{}'.format(cache_key, resource_id) if resource_id is not None else cache_key
+        entry = _get_cached_entry(entry_key)
+        if entry is not None:
+            if entry['fresh_until'] > time.time():
+                return entry['data']
 
-        cached = cache.get(cache_key)
-        if cached:
-            return zunpickle(cached)
+            refresh_kwargs = dict(
+                resource_id=resource_id,
+                querystring=querystring,
+                cache_key=cache_key,
+                many=many,
+                traverse_pagination=traverse_pagination,
+            )
+            if _schedule_refresh(api_config, api, resource, entry_key, refresh_kwargs):
+                return entry['data']
 
     try:
-        endpoint = getattr(api, resource)
-        querystring = querystring if querystring else {}
-        response = endpoint(resource_id).get(**querystring)
-
-        if resource_id is not None:
-            results = response
-        elif traverse_pagination:
-            results = _traverse_pagination(response, endpoint, querystring, no_data)
-        else:
-            results = response
+        return _fetch_and_cache(
+            api_config, api, resource, resource_id=resource_id, querystring=querystring, cache_key=cache_key,
+            traverse_pagination=traverse_pagination, no_data=no_data,
+            etag=entry['etag'] if entry else None,
+        )
     except:  # pylint: disable=bare-except
         log.exception('Failed to retrieve data from the %s API.', api_config.API_NAME)
+        if entry is not None:
+            return entry['data']
         return no_data
 
+
+@task(name='openedx.core.lib.edx_api_utils.refresh_edx_api_data', ignore_result=True)
+def refresh_edx_api_data(api_config_path, api_url, username, resource, **kwargs):
+    """Refreshes a cached entry of get_edx_api_data in the background.
+
+    Arguments:
+        api_config_path (str): Dotted path of the ConfigurationModel class governing the API.
+        api_url (str): Root URL of the API.
+        username (str): Username of the user the API client authenticates as.
+        resource (str): Name of the API resource being requested.
+
+    Keyword Arguments:
+        The remaining keyword arguments of get_edx_api_data, including cache_key.
+    """
+    cache_key = kwargs['cache_key']
+    resource_id = kwargs.get('resource_id')
+    entry_key = '{}.{}'.format(cache_key, resource_id) if resource_id is not None else cache_key
+    try:
+        api_config = import_string(api_config_path).current()
+        if not api_config.enabled:
+            return
+
+        entry = _get_cached_entry(entry_key)
+        api = get_api_client(api_url, User.objects.get(username=username))
+        no_data = [] if kwargs.pop('many', True) else {}
+        _fetch_and_cache(api_config, api, resource, etag=entry['etag'] if entry else None, no_data=no_data, **kwargs)
+    except:  # pylint: disable=bare-except
+        log.exception('Failed to refresh data for %s from the %s API.', entry_key, api_url)
+    finally:
+        cache.delete(entry_key + REFRESH_LOCK_SUFFIX)
+
+
+def _schedule_refresh(api_config, api, resource, entry_key, refresh_kwargs):
+    """Schedules a background refresh of a stale cached entry.
+
+    Returns True if the stale entry can be served, i.e. if a refresh was scheduled or is already
+    in progress, and False if the entry must be refreshed synchronously because the API client
+    cannot be rebuilt by a worker.
+    """
+    owner = _get_pooled(_pooled_client_owners, api)
+    if owner is None:
+        return False
+
+    # Only the caller that acquires the lock schedules the refresh. The lock expires on its own
+    # in case the task is lost.
+    lock_timeout = max(api_config.cache_ttl, 60)
+    if cache.add(entry_key + REFRESH_LOCK_SUFFIX, True, lock_timeout):
+        api_url, username = owner
+        api_config_path = '{}.{}'.format(api_config.__class__.__module__, api_config.__class__.__name__)
+        refresh_edx_api_data.delay(api_config_path, api_url, username, resource, **refresh_kwargs)
+    return True
+
+
+def _get_pooled(pooled_clients, api):
+    """Returns what the given mapping of pooled clients holds for api, or None if it was not pooled."""
+    try:
+        return pooled_clients.get(api)
+    except TypeError:
+        # Objects that cannot be weakly referenced are never pooled.
+        return None
+
+
+def _get_cached_entry(entry_key):
+    """Returns the cached entry stored under entry_key, or None."""
+    cached = cache.get(entry_key + CACHED_ENTRY_SUFFIX)
+    return zunpickle(cached) if cached else None
+
+
+def _fetch_and_cache(api_config, api, resource, resource_id=None, querystring=None, cache_key=None,
+                     traverse_pagination=True, no_data=None, etag=None):
+    """GET data from the API and store it in the cache, if a cache_key is given.
+
+    Single resources and unpaginated requests are revalidated with their ETag, if any; when the
+    API reports that the resource is not modified, the cached entry's freshness is extended.
+    """
+    endpoint = getattr(api, resource)
+    querystring = querystring if querystring else {}
+    entry_key = None
+    if cache_key:
+        entry_key = '{}.{}'.format(cache_key, resource_id) if resource_id is not None else cache_key
+
+    if resource_id is not None or not traverse_pagination:
+        results, etag = _get_with_etag(api, endpoint(resource_id), querystring, etag if cache_key else None)
+        if results is None:
+            entry = _get_cached_entry(entry_key)
+            if entry is not None:
+                results = entry['data']
+            else:
+                # The entry was evicted since it was revalidated.
+                results, etag = _get_with_etag(api, endpoint(resource_id), querystring)
+    else:
+        results = _traverse_pagination(endpoint(resource_id).get(**querystring), endpoint, querystring, no_data)
+        etag = None
+
     if cache_key:
-        zdata = zpickle(results)
-        cache.set(cache_key, zdata, api_config.cache_ttl)
+        cache.set(
+            entry_key + CACHED_ENTRY_SUFFIX,
+            zpickle({'data': results, 'fresh_until': time.time() + api_config.cache_ttl, 'etag': etag}),
+            api_config.cache_ttl + getattr(settings, 'EDX_API_CACHE_STALE_TIMEOUT', 0)
+        )
 
     return results
 
 
+def _get_with_etag(api, resource, querystring, etag=None):
+    """GET a single resource, conditionally on its ETag if one is given.
+
+    Conditional requests are sent with the session of pooled clients; resources of other clients
+    are requested through the client, without an ETag.
+
+    Returns a (data, etag) tuple, where data is None if the resource was not modified.
+    """
+    session = _get_pooled(_pooled_client_sessions, api)
+    if session is None:
+        return resource.get(**querystring), None
+
+    headers = {'If-None-Match': etag} if etag else {}
+    response = session.get(resource.url(), params=querystring, headers=headers, timeout=API_CLIENT_TIMEOUT)
+    if etag and response.status_code == 304:
+        return None, etag
+    response.raise_for_status()
+    return response.json(), response.headers.get('ETag')
+
+
 def _traverse_pagination(response, endpoint, querystring, no_data):
     """Traverse a paginated API response.
 
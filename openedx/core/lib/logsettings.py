@@ -119,6 +119,7 @@ def get_logger_config(log_dir,
     if dev_env:
         tracking_file_loc = os.path.join(log_dir, tracking_filename)
         edx_file_loc = os.path.join(log_dir, edx_filename)
+        query_instrumentation_file_loc = os.path.join(log_dir, 'query_instrumentation.log')
         logger_config['handlers'].update({
             'local': {
                 'class': 'logging.handlers.RotatingFileHandler',
@@ -136,7 +137,20 @@ def get_logger_config(log_dir,
                 'maxBytes': 1024 * 1024 * 2,
                 'backupCount': 5,
             },
+            'query_instrumentation': {
+                'level': 'INFO',
+                'class': 'logging.handlers.RotatingFileHandler',
+                'filename': query_instrumentation_file_loc,
+                'formatter': 'raw',
+                'maxBytes': 1024 * 1024 * 2,
+                'backupCount': 5,
+            },
         })
+        logger_config['loggers']['query_instrumentation'] = {
+            'handlers': ['query_instrumentation'],
+            'level': 'INFO',
+            'propagate': False,
+        }
     else:
         # for production environments we will only
         # log INFO and up
@@ -1,6 +1,7 @@
 """Tests covering edX API utilities."""
 # pylint: disable=missing-docstring
 import json
+import time
 
 import httpretty
 import mock
@@ -17,7 +18,7 @@ from openedx.core.djangoapps.catalog.utils import create_catalog_api_client
 from openedx.core.djangoapps.credentials.models import CredentialsApiConfig
 from openedx.core.djangoapps.credentials.tests.mixins import CredentialsApiConfigMixin
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
-from openedx.core.lib.edx_api_utils import get_edx_api_data
+from openedx.core.lib.edx_api_utils import clear_api_client_pool, get_edx_api_data, refresh_edx_api_data
 from student.tests.factories import UserFactory
 
 UTILITY_MODULE = 'openedx.core.lib.edx_api_utils'
@@ -37,6 +38,7 @@ class TestGetEdxApiData(CatalogIntegrationMixin, CredentialsApiConfigMixin, Cach
         self.user = UserFactory()
 
         cache.clear()
+        clear_api_client_pool()
 
     def _mock_catalog_api(self, responses, url=None):
         self.assertTrue(httpretty.is_enabled(), msg='httpretty must be enabled to mock Catalog API calls.')
@@ -292,3 +294,70 @@ class TestGetEdxApiData(CatalogIntegrationMixin, CredentialsApiConfigMixin, Cach
         )
         self.assertTrue(mock_exception.called)
         self.assertEqual(actual, {})
+
+    def test_api_client_pool(self):
+        """Verify that API clients are reused for the same user and URL."""
+        self.create_catalog_integration()
+        api = create_catalog_api_client(self.user)
+
+        self.assertIs(create_catalog_api_client(self.user), api)
+        self.assertIsNot(create_catalog_api_client(UserFactory()), api)
+
+    def test_stale_while_revalidate(self):
+        """Verify that stale data is served while it is refreshed in the background."""
+        catalog_integration = self.create_catalog_integration(cache_ttl=5)
+        api = create_catalog_api_client(self.user)
+        cache_key = CatalogIntegration.current().CACHE_KEY
+
+        self._mock_catalog_api([
+            httpretty.Response(body=json.dumps({'next': None, 'results': ['old']}), content_type='application/json'),
+            httpretty.Response(body=json.dumps({'next': None, 'results': ['new']}), content_type='application/json'),
+        ])
+
+        self.assertEqual(get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key), ['old'])
+
+        # Once the data is stale, it is still served while the refresh task (run eagerly in tests) updates it.
+        with mock.patch(UTILITY_MODULE + '.time.time', return_value=time.time() + 10):
+            with mock.patch(UTILITY_MODULE + '.refresh_edx_api_data.delay') as mock_delay:
+                actual = get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key)
+                self.assertEqual(actual, ['old'])
+                self.assertEqual(mock_delay.call_count, 1)
+
+                # The refresh lock prevents other callers from scheduling another refresh.
+                get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key)
+                self.assertEqual(mock_delay.call_count, 1)
+
+            args, kwargs = mock_delay.call_args
+            refresh_edx_api_data(*args, **kwargs)
+            actual = get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key)
+            self.assertEqual(actual, ['new'])
+
+        self._assert_num_requests(2)
+
+    def test_etag_revalidation(self):
+        """Verify that stale single resources are revalidated with their ETag."""
+        catalog_integration = self.create_catalog_integration(cache_ttl=5)
+        api = create_catalog_api_client(self.user)
+        cache_key = CatalogIntegration.current().CACHE_KEY
+        url = '{api_root}/programs/1/'.format(api_root=CatalogIntegration.current().get_internal_api_url().strip('/'))
+        expected_resource = {'key': 'value'}
+
+        self._mock_catalog_api(
+            [
+                httpretty.Response(
+                    body=json.dumps(expected_resource), content_type='application/json', adding_headers={'ETag': '"v1"'}
+                ),
+                httpretty.Response(body='', status=304),
+            ],
+            url=url
+        )
+
+        get_edx_api_data(catalog_integration, 'programs', api=api, resource_id=1, cache_key=cache_key)
+
+        # The refresh task runs eagerly in tests.
+        with mock.patch(UTILITY_MODULE + '.time.time', return_value=time.time() + 10):
+            actual = get_edx_api_data(catalog_integration, 'programs', api=api, resource_id=1, cache_key=cache_key)
+
+        self.assertEqual(actual, expected_resource)
+        self.assertEqual(httpretty.last_request().headers['If-None-Match'], '"v1"')
+        self._assert_num_requests(2)